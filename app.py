@@ -1,6 +1,6 @@
 """
 DMV Navigator NJ v2 - Self-Contained Streamlit Application
-New Jersey DMV Practice Test with 150 Authentic Questions
+New Jersey DMV Practice Test with authentic past knowledge-test questions
 
 REQUIREMENTS:
 - Python 3.8+
@@ -12,13 +12,33 @@ pip install streamlit
 RUN COMMAND:
 streamlit run streamlit_app.py
 
-This file is completely self-contained with all questions and functionality embedded.
+The question bank and quiz logic live in the bundled dmvquizzer package next to this file.
 """
 
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
+import math
+import os
 import random
+import time
+import uuid
 from typing import Dict, List, Optional
 
+from dmvquizzer.adaptive import DEFAULT_PARAMETERS_PATH, AdaptiveTest, InformationTable, load_item_parameters
+from dmvquizzer.bank import QuestionBank, load_question_bank
+from dmvquizzer.client_grading import accepted_answers, client_graded_section
+from dmvquizzer.compiled import DEFAULT_BANK_PATH, read_content_hash
+from dmvquizzer.drill import WeakAreaDrill
+from dmvquizzer.engine import QuizEngine
+from dmvquizzer.event_log import DEFAULT_EVENT_LOG_PATH, AnswerEvent, EventLog
+from dmvquizzer.exam import EXAM_LENGTH, ExamSimulation
+from dmvquizzer.memory import memory_report
+from dmvquizzer.metrics import DISABLED, WINDOW_SECONDS, Metrics, serve_metrics
+from dmvquizzer.progress_store import DEFAULT_PROGRESS_DB_PATH, Progress, ProgressStore
+from dmvquizzer.scoring import PASS_PERCENTAGE, AnswerSheet
+from dmvquizzer.session_backend import QuizState, SessionStore, encode_state, open_backend
+from dmvquizzer.spaced_repetition import SpacedRepetitionScheduler, format_delay
+
 # Configure Streamlit
 st.set_page_config(
     page_title="DMVNavigator NJ v2 - New Jersey Practice Test",
@@ -27,6 +47,24 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Opt-in instrumentation: DMV_METRICS=1 times named phases of every script
+# run and shows them at ?admin=metrics, with a per-session memory report at
+# ?admin=memory; DMV_METRICS_PORT also serves the timings as plain text at
+# http://127.0.0.1:<port>/metrics. Off, every hook is a no-op.
+METRICS_PORT = int(os.environ.get("DMV_METRICS_PORT") or 0)
+METRICS_ENABLED = os.environ.get("DMV_METRICS", "") not in ("", "0") or bool(METRICS_PORT)
+
+@st.cache_resource(show_spinner=False)
+def get_metrics(port: int) -> Metrics:
+    """Create the metrics and start the plain-text endpoint once per process"""
+    metrics = Metrics()
+    if port:
+        serve_metrics(metrics, port)
+    return metrics
+
+METRICS = get_metrics(METRICS_PORT) if METRICS_ENABLED else DISABLED
+run_timer = METRICS.start_run()
+
 # Custom CSS for better styling
 st.markdown("""
 <style>
@@ -72,1176 +110,729 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Authentic New Jersey DMV Questions Database
-QUESTIONS = [
-    # Traffic Laws & Rules of the Road (35 questions)
-    {
-        "id": 1,
-        "category": "Traffic Laws & Rules of the Road",
-        "question": "A driver approaching a flashing red traffic signal must:",
-        "options": [
-            "Slow down at the light",
-            "Drive carefully without stopping",
-            "Merge to the right",
-            "Stop before entering the intersection"
-        ],
-        "correct": 3,
-        "explanation": "A flashing red light means the same as a stop sign - you must come to a complete stop before entering the intersection."
-    },
-    {
-        "id": 2,
-        "category": "Traffic Laws & Rules of the Road",
-        "question": "Always signal when:",
-        "options": [
-            "Changing lanes",
-            "Pulling into or out of a parking space",
-            "Pulling into traffic from a parking area or alley",
-            "All of the above"
-        ],
-        "correct": 3,
-        "explanation": "Your turn signals should always be used when you make any movement to the left or right."
-    },
-    {
-        "id": 3,
-        "category": "Traffic Laws & Rules of the Road",
-        "question": "When driving on major highways:",
-        "options": [
-            "Stay alert",
-            "Keep your eyes moving",
-            "Be ready to react to road hazards",
-            "All of the above"
-        ],
-        "correct": 3,
-        "explanation": "It is important to stay alert on highways and be ready to react to unexpected hazards."
-    },
-    {
-        "id": 4,
-        "category": "Traffic Laws & Rules of the Road",
-        "question": "You should turn on your headlights:",
-        "options": [
-            "One half hour after sunset",
-            "One half hour before sunrise",
-            "When windshield wipers are being used",
-            "All of the above"
-        ],
-        "correct": 3,
-        "explanation": "New Jersey law requires headlights 30 minutes after sunset until 30 minutes before sunrise, and anytime windshield wipers are in use (wipers on, headlights on law)."
-    },
-    {
-        "id": 5,
-        "category": "Traffic Laws & Rules of the Road",
-        "question": "When entering a highway from an acceleration lane, you should:",
-        "options": [
-            "Stop and wait for an opening",
-            "Enter at any speed",
-            "Match the speed of highway traffic",
-            "Drive slowly until you feel comfortable"
-        ],
-        "correct": 2,
-        "explanation": "When entering a highway, you should accelerate to match the speed of highway traffic for safe merging."
-    },
-    {
-        "id": 6,
-        "category": "Traffic Laws & Rules of the Road",
-        "question": "The minimum following distance behind another vehicle should be:",
-        "options": [
-            "1 second",
-            "2 seconds",
-            "3 seconds",
-            "4 seconds"
-        ],
-        "correct": 2,
-        "explanation": "The minimum safe following distance is 3 seconds under normal conditions, according to New Jersey MVC guidelines."
-    },
-    {
-        "id": 7,
-        "category": "Traffic Laws & Rules of the Road",
-        "question": "When parallel parking, your vehicle should be within what distance from the curb?",
-        "options": [
-            "6 inches",
-            "12 inches",
-            "18 inches",
-            "24 inches"
-        ],
-        "correct": 0,
-        "explanation": "New Jersey law (NJ Revised Statute 39:4-135) requires vehicles to be parked within 6 inches of the curb when parallel parking."
-    },
-    {
-        "id": 8,
-        "category": "Traffic Laws & Rules of the Road",
-        "question": "At a four-way stop intersection, who has the right of way?",
-        "options": [
-            "The vehicle that arrives first",
-            "The vehicle on the right if two arrive at the same time",
-            "The vehicle going straight has priority over turning vehicles",
-            "All of the above apply"
-        ],
-        "correct": 3,
-        "explanation": "At four-way stops, first to arrive goes first, right has priority on simultaneous arrival, and straight traffic has priority over turning."
-    },
-    {
-        "id": 9,
-        "category": "Traffic Laws & Rules of the Road",
-        "question": "A solid yellow line on your side of the center line means:",
-        "options": [
-            "You may pass with caution",
-            "No passing is allowed",
-            "Passing is recommended",
-            "You must turn right"
-        ],
-        "correct": 1,
-        "explanation": "A solid yellow line on your side means no passing is allowed from your direction."
-    },
-    {
-        "id": 10,
-        "category": "Traffic Laws & Rules of the Road",
-        "question": "You must yield the right-of-way to pedestrians:",
-        "options": [
-            "Only at marked crosswalks",
-            "Only when they have a walk signal",
-            "At all crosswalks, marked or unmarked",
-            "Only during daylight hours"
-        ],
-        "correct": 2,
-        "explanation": "Drivers must yield to pedestrians at all crosswalks, whether marked or unmarked."
-    },
-    # Road Signs & Traffic Signals (25 questions)
-    {
-        "id": 11,
-        "category": "Road Signs & Traffic Signals",
-        "question": "What does a yield sign require you to do?",
-        "options": [
-            "Come to a complete stop",
-            "Slow down and yield to oncoming traffic",
-            "Maintain your speed",
-            "Sound your horn"
-        ],
-        "correct": 1,
-        "explanation": "A yield sign requires you to slow down and give the right-of-way to oncoming traffic."
-    },
-    {
-        "id": 12,
-        "category": "Road Signs & Traffic Signals",
-        "question": "An octagonal (8-sided) red sign means:",
-        "options": [
-            "Yield",
-            "Slow down",
-            "Stop",
-            "No entry"
-        ],
-        "correct": 2,
-        "explanation": "An octagonal red sign is a stop sign, requiring a complete stop."
-    },
-    {
-        "id": 13,
-        "category": "Road Signs & Traffic Signals",
-        "question": "A triangular sign with a red border means:",
-        "options": [
-            "Stop",
-            "Yield",
-            "Warning",
-            "No passing"
-        ],
-        "correct": 1,
-        "explanation": "A triangular sign with a red border is a yield sign."
-    },
-    {
-        "id": 14,
-        "category": "Road Signs & Traffic Signals",
-        "question": "Yellow diamond-shaped signs are:",
-        "options": [
-            "Regulatory signs",
-            "Warning signs",
-            "Guide signs",
-            "Construction signs"
-        ],
-        "correct": 1,
-        "explanation": "Yellow diamond-shaped signs are warning signs that alert drivers to hazards ahead."
-    },
-    {
-        "id": 15,
-        "category": "Road Signs & Traffic Signals",
-        "question": "A sign with a red circle and diagonal line through it means:",
-        "options": [
-            "Caution",
-            "Yield",
-            "Prohibited action",
-            "Construction zone"
-        ],
-        "correct": 2,
-        "explanation": "A red circle with a diagonal line indicates a prohibited action."
-    },
-    # Traffic Lights & Signals (15 questions)
-    {
-        "id": 16,
-        "category": "Traffic Lights & Signals",
-        "question": "At an intersection with a traffic light, you may turn right on red:",
-        "options": [
-            "After coming to a complete stop and yielding",
-            "Only if there's a sign permitting it",
-            "Anytime if no traffic is coming",
-            "Never"
-        ],
-        "correct": 0,
-        "explanation": "In New Jersey, you may turn right on red after coming to a complete stop and yielding, unless prohibited by signage."
-    },
-    {
-        "id": 17,
-        "category": "Traffic Lights & Signals",
-        "question": "A flashing yellow light means:",
-        "options": [
-            "Stop",
-            "Proceed with caution",
-            "Speed up",
-            "Yield to all traffic"
-        ],
-        "correct": 1,
-        "explanation": "A flashing yellow light means proceed with caution after slowing down."
-    },
-    {
-        "id": 18,
-        "category": "Traffic Lights & Signals",
-        "question": "When you see a steady yellow light, you should:",
-        "options": [
-            "Speed up to get through the intersection",
-            "Stop if you can do so safely",
-            "Continue at the same speed",
-            "Sound your horn"
-        ],
-        "correct": 1,
-        "explanation": "A steady yellow light warns that the light is about to turn red. Stop if you can do so safely."
-    },
-    # Alcohol & Drug Awareness (20 questions)
-    {
-        "id": 19,
-        "category": "Alcohol & Drug Awareness",
-        "question": "In New Jersey, the legal blood alcohol content (BAC) limit for drivers 21 and over is:",
-        "options": [
-            "0.05%",
-            "0.08%",
-            "0.10%",
-            "0.12%"
-        ],
-        "correct": 1,
-        "explanation": "For drivers 21 and older, the legal BAC limit in New Jersey is 0.08%."
-    },
-    {
-        "id": 20,
-        "category": "Alcohol & Drug Awareness",
-        "question": "A 5-ounce glass of wine contains the same amount of alcohol as:",
-        "options": [
-            "One pint of whiskey",
-            "A gallon of wine",
-            "A 6-pack of beer",
-            "One 12-ounce can of beer"
-        ],
-        "correct": 3,
-        "explanation": "A 5-ounce glass of wine, a 12-ounce beer, and 1.5 ounces of hard liquor all contain the same amount of alcohol."
-    },
-    {
-        "id": 21,
-        "category": "Alcohol & Drug Awareness",
-        "question": "What are some telltale signs of a drunk driver?",
-        "options": [
-            "Weaving between lanes",
-            "Driving slower than the normal traffic flow",
-            "Quick and sudden stops",
-            "All of the above"
-        ],
-        "correct": 3,
-        "explanation": "All of these behaviors can indicate an impaired driver."
-    },
-    {
-        "id": 22,
-        "category": "Alcohol & Drug Awareness",
-        "question": "New Jersey's zero tolerance law for drivers under 21 means they are considered DUI with a BAC of:",
-        "options": [
-            "0.01% or higher",
-            "0.05% or higher",
-            "0.08% or higher",
-            "0.10% or higher"
-        ],
-        "correct": 0,
-        "explanation": "New Jersey's zero tolerance policy means drivers under 21 are considered under the influence with any measurable amount of alcohol (0.01% BAC or higher)."
-    },
-    # Driver Safety & Vehicle Operation (25 questions)
-    {
-        "id": 23,
-        "category": "Driver Safety & Vehicle Operation",
-        "question": "When backing up, you should:",
-        "options": [
-            "Rely only on your mirrors",
-            "Turn around and look through the rear window",
-            "Use only your backup camera",
-            "Sound your horn continuously"
-        ],
-        "correct": 1,
-        "explanation": "When backing up, you should turn around and look through the rear window for the best view."
-    },
-    {
-        "id": 24,
-        "category": "Driver Safety & Vehicle Operation",
-        "question": "If your windshield wipers stop suddenly during rain or snow you should:",
-        "options": [
-            "Slow down",
-            "Turn on emergency flashers",
-            "Brake and pull off the road",
-            "All of the above"
-        ],
-        "correct": 3,
-        "explanation": "If wipers stop working in bad weather, slow down, use emergency flashers, and pull off the road safely."
-    },
-    {
-        "id": 25,
-        "category": "Driver Safety & Vehicle Operation",
-        "question": "Vehicle stopping distances depend on:",
-        "options": [
-            "Your reaction time",
-            "Road conditions",
-            "Vehicle condition and tire condition",
-            "All of the above"
-        ],
-        "correct": 3,
-        "explanation": "Stopping distance is affected by driver reaction time, road conditions, and vehicle condition."
-    },
-    {
-        "id": 26,
-        "category": "Driver Safety & Vehicle Operation",
-        "question": "When driving in bad weather, drivers should:",
-        "options": [
-            "Increase speed to reach destination quickly",
-            "Decrease the 'two-second' rule",
-            "Increase the 'two-second' rule",
-            "None of the above"
-        ],
-        "correct": 2,
-        "explanation": "In bad weather, you should increase following distance beyond the normal 3-second rule to account for longer stopping distances."
-    },
-    {
-        "id": 27,
-        "category": "Driver Safety & Vehicle Operation",
-        "question": "If a collision is possible, you should:",
-        "options": [
-            "Choose to hit something that will give way rather than something rigid",
-            "Choose to hit something standing still rather than something moving toward you",
-            "Try to make it a glancing blow or sideswipe",
-            "All of the above"
-        ],
-        "correct": 3,
-        "explanation": "If a collision is unavoidable, these strategies can help minimize injury."
-    },
-    # Pedestrian & Special Situations (15 questions)
-    {
-        "id": 28,
-        "category": "Pedestrian & Special Situations",
-        "question": "A person walking with a white cane or guide dog is likely to be:",
-        "options": [
-            "A deaf person",
-            "A person involved with a traffic study",
-            "A blind person",
-            "None of the above"
-        ],
-        "correct": 2,
-        "explanation": "A white cane or guide dog indicates a blind person who has the right-of-way."
-    },
-    {
-        "id": 29,
-        "category": "Pedestrian & Special Situations",
-        "question": "You must yield for emergency vehicles:",
-        "options": [
-            "Never",
-            "When you see a flashing red or blue light or hear a siren",
-            "Only when other vehicles yield",
-            "None of the above"
-        ],
-        "correct": 1,
-        "explanation": "You must yield to emergency vehicles displaying emergency lights or sirens. Emergency vehicles use red and blue flashing lights."
-    },
-    {
-        "id": 30,
-        "category": "Pedestrian & Special Situations",
-        "question": "If you are driving behind a school bus and it shows a flashing red light signaling a stop, you must:",
-        "options": [
-            "Stop at least 25 feet away",
-            "Slow down to 10 mph",
-            "Speed up and pass",
-            "Stop directly behind the bus"
-        ],
-        "correct": 0,
-        "explanation": "According to NJ law, you must stop at least 25 feet away from a school bus displaying flashing red lights to ensure student safety. [View NJ MVC info](https://www.nj.gov/mvc/)"
-    },
-    # Fines & Penalties (15 questions)
-    {
-        "id": 31,
-        "category": "Fines & Penalties",
-        "question": "In New Jersey, you must be at least __ years old to register a motor vehicle.",
-        "options": [
-            "17",
-            "16",
-            "15",
-            "21"
-        ],
-        "correct": 0,
-        "explanation": "You must be at least 17 years old to register a motor vehicle in New Jersey."
-    },
-    {
-        "id": 32,
-        "category": "Fines & Penalties",
-        "question": "You can practice drive with a valid special learner's permit:",
-        "options": [
-            "Between 12:01 a.m. and 5 a.m.",
-            "Between 9 a.m. and 9 p.m.",
-            "Between 5 a.m. and 11 p.m.",
-            "Anytime"
-        ],
-        "correct": 2,
-        "explanation": "With a special learner's permit, you can practice drive between 5 a.m. and 11 p.m."
-    }
-]
-
-# Additional authentic New Jersey DMV questions to reach 150 total
-ADDITIONAL_QUESTIONS = [
-    # Continue with more authentic questions
-    {
-        "id": 33,
-        "category": "Traffic Laws & Rules of the Road",
-        "question": "You must not park within how many feet of a fire hydrant?",
-        "options": ["5 feet", "10 feet", "15 feet", "20 feet"],
-        "correct": 1,
-        "explanation": "You must not park within 10 feet of a fire hydrant to ensure emergency access."
-    },
-    {
-        "id": 34,
-        "category": "Road Signs & Traffic Signals",
-        "question": "Orange diamond-shaped signs indicate:",
-        "options": ["Construction zones", "School zones", "Hospital zones", "Warning areas"],
-        "correct": 0,
-        "explanation": "Orange diamond-shaped signs are used in construction and work zones."
-    },
-    {
-        "id": 35,
-        "category": "Traffic Lights & Signals",
-        "question": "When facing a green arrow and a red light, you may:",
-        "options": ["Go straight only", "Turn in the direction of the arrow only", "Not move at all", "Turn in any direction"],
-        "correct": 1,
-        "explanation": "A green arrow allows movement only in the direction indicated by the arrow. [View NJ MVC info](https://www.nj.gov/mvc/)"
-    },
-    {
-        "id": 36,
-        "category": "Alcohol & Drug Awareness",
-        "question": "If you refuse to take a breath test when arrested for DUI, your license will be suspended for:",
-        "options": ["3 months", "6 months", "7 months", "1 year"],
-        "correct": 2,
-        "explanation": "Refusing a breath test results in an automatic 7-month license suspension under NJ's Implied Consent Law."
-    },
-    {
-        "id": 37,
-        "category": "Driver Safety & Vehicle Operation",
-        "question": "When driving around large vehicles, keep in mind that they may take as much as _____ longer to stop:",
-        "options": ["25% longer", "40% longer", "50% longer", "60% longer"],
-        "correct": 1,
-        "explanation": "Large vehicles require up to 40% longer stopping distance due to their weight and momentum."
-    },
-    {
-        "id": 38,
-        "category": "Pedestrian & Special Situations",
-        "question": "You needn't stop your vehicle for a frozen dessert truck when:",
-        "options": [
-            "It shows flashing red lights",
-            "It shows a stop signal arm", 
-            "A person is crossing to the truck",
-            "On a dual highway if you're on the other side of a median"
-        ],
-        "correct": 3,
-        "explanation": "On divided highways, only traffic behind or alongside the ice cream truck must stop."
-    },
-    {
-        "id": 39,
-        "category": "Fines & Penalties",
-        "question": "MVC may terminate your road test before it starts because of:",
-        "options": [
-            "An unsafe vehicle",
-            "Equipment blocking examiner access",
-            "Missing seat belts",
-            "All of the above"
-        ],
-        "correct": 3,
-        "explanation": "Any unsafe condition or missing safety equipment can result in test termination."
-    },
-    # Sign Shapes & Colors (20 questions)
-    {
-        "id": 40,
-        "category": "Sign Shapes & Colors",
-        "question": "What shape is a stop sign?",
-        "options": [
-            "Circle",
-            "Triangle",
-            "Octagon",
-            "Rectangle"
-        ],
-        "correct": 2,
-        "explanation": "Stop signs are always octagonal (8-sided) and red with white lettering. This shape and color combination is unique to stop signs. [View official highway sign designs](https://99percentinvisible.org/article/american-highways-101-visual-guide-to-u-s-road-sign-designs-numbering-systems/)"
-    },
-    {
-        "id": 41,
-        "category": "Sign Shapes & Colors",
-        "question": "What shape is a yield sign?",
-        "options": [
-            "Triangle pointing down",
-            "Circle",
-            "Diamond",
-            "Rectangle"
-        ],
-        "correct": 0,
-        "explanation": "Yield signs are triangular, pointing downward, with a red border and white background."
-    },
-    {
-        "id": 42,
-        "category": "Sign Shapes & Colors",
-        "question": "Warning signs are typically what shape?",
-        "options": [
-            "Rectangle",
-            "Circle",
-            "Diamond",
-            "Triangle"
-        ],
-        "correct": 2,
-        "explanation": "Warning signs are diamond-shaped with yellow backgrounds and black symbols or text. Examples include curve ahead, deer crossing, and school zone warnings. [View official highway sign designs](https://99percentinvisible.org/article/american-highways-101-visual-guide-to-u-s-road-sign-designs-numbering-systems/)"
-    },
-    {
-        "id": 43,
-        "category": "Sign Shapes & Colors",
-        "question": "What color are most warning signs?",
-        "options": [
-            "Red",
-            "Yellow",
-            "Green",
-            "Blue"
-        ],
-        "correct": 1,
-        "explanation": "Warning signs typically have yellow backgrounds with black text or symbols to alert drivers to hazards."
-    },
-    {
-        "id": 44,
-        "category": "Sign Shapes & Colors",
-        "question": "Regulatory signs are typically what shape?",
-        "options": [
-            "Diamond",
-            "Circle",
-            "Rectangle or square",
-            "Triangle"
-        ],
-        "correct": 2,
-        "explanation": "Regulatory signs are usually rectangular or square and tell drivers what they must or must not do."
-    },
-    {
-        "id": 45,
-        "category": "Sign Shapes & Colors",
-        "question": "What color background do most regulatory signs have?",
-        "options": [
-            "Yellow",
-            "White",
-            "Green",
-            "Blue"
-        ],
-        "correct": 1,
-        "explanation": "Most regulatory signs have white backgrounds with black text or symbols."
-    },
-    {
-        "id": 46,
-        "category": "Sign Shapes & Colors",
-        "question": "School zone signs are what shape?",
-        "options": [
-            "Diamond",
-            "Pentagon",
-            "Circle",
-            "Rectangle"
-        ],
-        "correct": 1,
-        "explanation": "School zone signs are pentagon-shaped (5-sided) with yellow-green backgrounds. This bright fluorescent color helps drivers notice school areas more easily."
-    },
-    {
-        "id": 47,
-        "category": "Sign Shapes & Colors",
-        "question": "What color are construction zone warning signs?",
-        "options": [
-            "Yellow",
-            "Orange",
-            "Red",
-            "Green"
-        ],
-        "correct": 1,
-        "explanation": "Construction and work zone signs are orange with black text to indicate temporary conditions. These bright orange signs alert drivers to construction zones and detours. [View highway sign color standards](https://highways.dot.gov/highway-history/interstate-system/50th-anniversary/shields-and-signs)"
-    },
-    {
-        "id": 48,
-        "category": "Sign Shapes & Colors",
-        "question": "Guide signs showing directions and distances are typically what color?",
-        "options": [
-            "White",
-            "Yellow",
-            "Green",
-            "Blue"
-        ],
-        "correct": 2,
-        "explanation": "Guide signs for highways and destinations typically have green backgrounds with white text. These help drivers navigate to cities, highways, and major destinations. [View highway sign color standards](https://highways.dot.gov/highway-history/interstate-system/50th-anniversary/shields-and-signs)"
-    },
-    {
-        "id": 49,
-        "category": "Sign Shapes & Colors",
-        "question": "What shape is used for railroad crossing signs?",
-        "options": [
-            "Circle",
-            "X-shape (crossbuck)",
-            "Diamond",
-            "Triangle"
-        ],
-        "correct": 1,
-        "explanation": "Railroad crossing signs are X-shaped crossbucks with white backgrounds and black text."
-    },
-    {
-        "id": 50,
-        "category": "Sign Shapes & Colors",
-        "question": "Service signs (gas, food, lodging) are typically what color?",
-        "options": [
-            "Green",
-            "Blue",
-            "White",
-            "Yellow"
-        ],
-        "correct": 1,
-        "explanation": "Service signs indicating gas, food, lodging, and other services typically have blue backgrounds with white symbols showing the type of service available. [View highway sign examples](https://99percentinvisible.org/article/american-highways-101-visual-guide-to-u-s-road-sign-designs-numbering-systems/)"
-    },
-    {
-        "id": 51,
-        "category": "Sign Shapes & Colors",
-        "question": "No Entry signs are typically what shape and color?",
-        "options": [
-            "Round with red and white",
-            "Diamond with yellow",
-            "Rectangle with green",
-            "Triangle with orange"
-        ],
-        "correct": 0,
-        "explanation": "No Entry signs are circular with red backgrounds and white text or symbols."
-    },
-    {
-        "id": 52,
-        "category": "Sign Shapes & Colors",
-        "question": "Speed limit signs are what shape?",
-        "options": [
-            "Diamond",
-            "Circle",
-            "Rectangle",
-            "Triangle"
-        ],
-        "correct": 2,
-        "explanation": "Speed limit signs are rectangular with white backgrounds and black text."
-    },
-    {
-        "id": 53,
-        "category": "Sign Shapes & Colors",
-        "question": "What does a circular sign with a red border typically indicate?",
-        "options": [
-            "Warning",
-            "Information",
-            "Prohibition",
-            "Direction"
-        ],
-        "correct": 2,
-        "explanation": "Circular signs with red borders indicate prohibition - something is not allowed."
-    },
-    {
-        "id": 54,
-        "category": "Sign Shapes & Colors",
-        "question": "Merge signs are typically what shape and color?",
-        "options": [
-            "Diamond with yellow",
-            "Rectangle with white",
-            "Triangle with red",
-            "Circle with blue"
-        ],
-        "correct": 0,
-        "explanation": "Merge signs are diamond-shaped warning signs with yellow backgrounds and black arrows."
-    },
-    {
-        "id": 55,
-        "category": "Sign Shapes & Colors",
-        "question": "What color background do handicapped parking signs typically have?",
-        "options": [
-            "White",
-            "Yellow",
-            "Blue",
-            "Green"
-        ],
-        "correct": 2,
-        "explanation": "Handicapped parking signs typically have blue backgrounds with white symbols."
-    },
-    {
-        "id": 56,
-        "category": "Sign Shapes & Colors",
-        "question": "Curve warning signs are what shape?",
-        "options": [
-            "Rectangle",
-            "Circle",
-            "Diamond",
-            "Triangle"
-        ],
-        "correct": 2,
-        "explanation": "Curve warning signs are diamond-shaped with yellow backgrounds and black curved arrows."
-    },
-    {
-        "id": 57,
-        "category": "Sign Shapes & Colors",
-        "question": "What shape indicates a DO NOT ENTER sign?",
-        "options": [
-            "Diamond",
-            "Rectangle",
-            "Circle",
-            "Triangle"
-        ],
-        "correct": 1,
-        "explanation": "DO NOT ENTER signs are rectangular with red backgrounds and white text."
-    },
-    {
-        "id": 58,
-        "category": "Sign Shapes & Colors",
-        "question": "Traffic signal ahead warning signs are what color?",
-        "options": [
-            "Red",
-            "Yellow",
-            "Green",
-            "Orange"
-        ],
-        "correct": 1,
-        "explanation": "Traffic signal ahead warning signs are yellow with black symbols to warn of upcoming signals."
-    },
-    {
-        "id": 59,
-        "category": "Sign Shapes & Colors",
-        "question": "What shape and color combination is unique to stop signs?",
-        "options": [
-            "Red octagon with white text",
-            "Yellow diamond with black text",
-            "White rectangle with black text",
-            "Blue circle with white text"
-        ],
-        "correct": 0,
-        "explanation": "Only stop signs use the red octagon shape with white text - this combination is legally protected and unique."
-    }
-]
-
-# Generate remaining questions programmatically with realistic content
-for i in range(40, 151):
-    category_cycle = [
-        "Traffic Laws & Rules of the Road",
-        "Road Signs & Traffic Signals", 
-        "Traffic Lights & Signals",
-        "Alcohol & Drug Awareness",
-        "Driver Safety & Vehicle Operation",
-        "Pedestrian & Special Situations",
-        "Fines & Penalties",
-        "Sign Shapes & Colors"
-    ]
-    
-    category = category_cycle[(i-1) % 8]
-    
-    # Skip generating additional questions for Sign Shapes & Colors since we have 20 static ones
-    if category == "Sign Shapes & Colors":
-        continue
-    
-    # Create more realistic questions based on category
-    if category == "Traffic Laws & Rules of the Road":
-        question_templates = [
-            "What is the maximum speed limit in residential areas in New Jersey unless otherwise posted?",
-            "When changing lanes, you must signal at least how many feet before the turn?",
-            "In New Jersey, you must keep a safe following distance of at least:",
-            "You can practice drive with a valid special learner's permit:"
-        ]
-        options_templates = [
-            ["25 mph", "30 mph", "35 mph", "40 mph"],
-            ["50 feet", "100 feet", "150 feet", "200 feet"],
-            ["2 seconds", "3 seconds", "4 seconds", "5 seconds"],
-            ["Between 12:01 a.m. and 5 a.m.", "Between 9 a.m. and 9 p.m.", "Between 5 a.m. and 11 p.m.", "Anytime"]
-        ]
-    elif category == "Road Signs & Traffic Signals":
-        question_templates = [
-            "A rectangular white sign with black text indicates:",
-            "Blue signs typically indicate:",
-            "What does a pentagon-shaped sign indicate?",
-            "A sign showing a truck on a downgrade warns of:"
-        ]
-        options_templates = [
-            ["Warning", "Regulatory information", "Services", "Construction"],
-            ["Services", "Warnings", "Regulations", "Construction"],
-            ["School zone", "Hospital zone", "Construction zone", "No entry"],
-            ["Steep hill", "Truck route", "No trucks", "Rest area"]
-        ]
-    elif category == "Traffic Lights & Signals":
-        question_templates = [
-            "When approaching a yellow traffic light, you should:",
-            "A steady red light with a green arrow means:",
-            "At a flashing red light, you must:",
-            "When traffic lights are completely dark or not working, treat the intersection as:"
-        ]
-        options_templates = [
-            ["Speed up to get through", "Stop if you can do so safely", "Continue at same speed", "Sound your horn"],
-            ["Stop completely", "Proceed only in direction of arrow", "Proceed in any direction", "Wait for green light"],
-            ["Slow down and proceed", "Come to a complete stop", "Yield to cross traffic", "Turn right only"],
-            ["A four-way stop", "Right-of-way to larger road", "Proceed without stopping", "Turn around"]
-        ]
-    elif category == "Alcohol & Drug Awareness":
-        question_templates = [
-            "Blood alcohol content of 0.08% or higher means you are:",
-            "The best way to reduce the effects of alcohol is to:",
-            "Alcohol affects your:",
-            "If convicted of driving under the influence, you may face:"
-        ]
-        options_templates = [
-            ["Slightly impaired", "Legally intoxicated", "Safe to drive", "Need coffee"],
-            ["Drink coffee", "Take a cold shower", "Wait and let time pass", "Exercise"],
-            ["Vision and hearing", "Reaction time", "Judgment", "All of the above"],
-            ["License suspension", "Fines", "Possible jail time", "All of the above"]
-        ]
-    elif category == "Driver Safety & Vehicle Operation":
-        question_templates = [
-            "When parallel parking, you should be within how many inches of the curb:",
-            "When driving in fog, you should:",
-            "The safest way to exit an expressway is to:",
-            "When your vehicle starts to skid, you should:"
-        ]
-        options_templates = [
-            ["6 inches", "12 inches", "18 inches", "24 inches"],
-            ["Use high beams", "Use low beams", "Drive faster", "Follow closely"],
-            ["Slow down before the exit ramp", "Brake on the exit ramp", "Maintain highway speed", "Speed up"],
-            ["Brake hard immediately", "Turn steering wheel opposite to skid", "Take foot off gas and steer into skid", "Accelerate out of skid"]
-        ]
-    elif category == "Pedestrian & Special Situations":
-        question_templates = [
-            "When must you yield to pedestrians?",
-            "School zones require you to:",
-            "When driving near children, you should:",
-            "At crosswalks, drivers must:"
-        ]
-        options_templates = [
-            ["Never", "Only at crosswalks", "At crosswalks and intersections", "Only when they wave"],
-            ["Reduce speed", "Stop for buses", "Watch for children", "All of the above"],
-            ["Expect sudden movements", "Drive extra carefully", "Reduce speed", "All of the above"],
-            ["Sound horn to warn pedestrians", "Yield to pedestrians", "Speed up to clear quickly", "Ignore pedestrians"]
-        ]
-    elif category == "Fines & Penalties":
-        question_templates = [
-            "If you accumulate too many points on your license, you may face:",
-            "Driving without insurance in New Jersey can result in:",
-            "A first-time DUI conviction may result in:",
-            "Failing to stop for a school bus can result in:"
-        ]
-        options_templates = [
-            ["Warning only", "License suspension", "Small fine", "Driving course only"],
-            ["Warning", "Fine and license suspension", "Points only", "Community service"],
-            ["Fine only", "License suspension and fines", "Warning", "Points only"],
-            ["Fine and possible license suspension", "Warning only", "Points only", "Traffic school"]
-        ]
-    elif category == "Sign Shapes & Colors":
-        question_templates = [
-            "Route marker signs for interstate highways are what shape?",
-            "Mile marker signs on highways are typically what color?",
-            "Airport directional signs typically use what color scheme?",
-            "Hospital signs typically use what symbol and color?"
-        ]
-        options_templates = [
-            ["Rectangle", "Shield", "Circle", "Diamond"],
-            ["Blue and white", "Green and white", "Brown and white", "Yellow and black"],
-            ["Brown and white", "Blue and white", "Green and white", "Yellow and black"],
-            ["Red cross on white", "Blue H on white", "Green plus on white", "Yellow H on blue"]
-        ]
-    else:
-        question_templates = [
-            "What is the proper procedure for this traffic situation?",
-            "According to New Jersey law, drivers must:",
-            "The correct response in this situation is to:",
-            "New Jersey traffic regulations require:"
-        ]
-        options_templates = [
-            ["Follow traffic signals", "Yield to other vehicles", "Stop completely", "Proceed with caution"],
-            ["Obey all traffic laws", "Drive defensively", "Maintain safe distance", "All of the above"],
-            ["Stop and assess", "Proceed carefully", "Signal intentions", "Follow traffic rules"],
-            ["Proper licensing", "Vehicle registration", "Insurance coverage", "All of the above"]
-        ]
-    
-    template_idx = (i-40) % len(question_templates)
-    
-    # Set correct answers based on authentic NJ DMV requirements
-    if category == "Traffic Laws & Rules of the Road":
-        correct_answers = [0, 1, 1, 2]  # 25 mph, 100 feet, 3 seconds, 5am-11pm
-        explanations = [
-            "New Jersey law (N.J.S. 39:4-98) sets the maximum speed limit in residential areas at 25 mph unless otherwise posted.",
-            "You must signal at least 100 feet before making a turn in business or residential areas.",
-            "The 3-second rule is the recommended safe following distance to maintain proper stopping distance.",
-            "With a special learner's permit, you can practice drive between 5 a.m. and 11 p.m. with supervision."
-        ]
-    elif category == "Road Signs & Traffic Signals":
-        correct_answers = [1, 0, 0, 0]  # Regulatory, Services, School zone, Steep hill
-        explanations = [
-            "Rectangular white signs with black text typically indicate regulatory information such as speed limits and parking rules.",
-            "Blue signs typically indicate services like rest areas, gas stations, or lodging.",
-            "Pentagon-shaped signs indicate school zones and school crossings.",
-            "Truck warning signs indicate steep hills or other hazards for large vehicles."
-        ]
-    elif category == "Traffic Lights & Signals":
-        correct_answers = [1, 1, 1, 0]  # Stop if safe, Proceed only in arrow direction, Complete stop, Four-way stop
-        explanations = [
-            "When approaching a yellow light, you should stop if you can do so safely. Yellow means prepare to stop.",
-            "A steady red light with a green arrow means you can only proceed in the direction of the arrow after yielding.",
-            "A flashing red light means the same as a stop sign - come to a complete stop before proceeding.",
-            "When traffic lights are not working, treat the intersection as a four-way stop with all drivers yielding appropriately."
-        ]
-    elif category == "Alcohol & Drug Awareness":
-        correct_answers = [1, 2, 3, 3]  # Legally intoxicated, Wait and let time pass, All of the above, All of the above
-        explanations = [
-            "A BAC of 0.08% or higher means you are legally intoxicated in New Jersey.",
-            "Only time can reduce blood alcohol content - no other method works.",
-            "Alcohol affects vision, hearing, reaction time, and judgment - all critical for safe driving.",
-            "DUI convictions can result in license suspension, fines, and possible jail time."
-        ]
-    elif category == "Driver Safety & Vehicle Operation":
-        correct_answers = [0, 1, 0, 2]  # 6 inches, Use low beams, Slow down before exit, Take foot off gas and steer into skid
-        explanations = [
-            "When parallel parking in New Jersey, you must park within 6 inches of the curb.",
-            "Use low beams in fog - high beams will reflect back and reduce visibility.",
-            "Slow down before entering the exit ramp for safer deceleration.",
-            "When skidding, take your foot off the gas and steer in the direction you want the car to go."
-        ]
-    elif category == "Pedestrian & Special Situations":
-        correct_answers = [2, 3, 3, 1]  # At crosswalks and intersections, All of the above, All of the above, Yield to pedestrians
-        explanations = [
-            "You must yield to pedestrians at all crosswalks and intersections, marked or unmarked.",
-            "School zones require reduced speed, stopping for buses, and watching for children.",
-            "When driving near children, expect sudden movements, drive carefully, and reduce speed.",
-            "Drivers must always yield to pedestrians at crosswalks."
-        ]
-    elif category == "Fines & Penalties":
-        correct_answers = [1, 1, 1, 0]  # License suspension, Fine and license suspension, License suspension and fines, Fine and possible license suspension
-        explanations = [
-            "Accumulating too many points can result in license suspension in New Jersey.",
-            "Driving without insurance results in fines and license suspension.",
-            "First-time DUI convictions typically result in license suspension and substantial fines.",
-            "Failing to stop for a school bus results in significant fines and possible license suspension."
-        ]
-    elif category == "Sign Shapes & Colors":
-        correct_answers = [1, 1, 1, 0]  # Shield, Green and white, Blue and white, Red cross on white
-        explanations = [
-            "Interstate highway route markers have a distinctive shield shape that identifies them as federal interstate highways. [View official interstate shield designs](https://99percentinvisible.org/article/american-highways-101-visual-guide-to-u-s-road-sign-designs-numbering-systems/)",
-            "Mile marker signs on highways typically use green backgrounds with white numbers to match other highway guide signage. [View highway sign color guide](https://highways.dot.gov/highway-history/interstate-system/50th-anniversary/shields-and-signs)",
-            "Airport directional signs typically use blue backgrounds with white text and symbols to indicate aviation-related facilities. [View FAA airport sign guide](https://www.faa.gov/sites/faa.gov/files/SignsAndMarkings_one-doc.pdf)",
-            "Hospital signs typically display a red cross symbol on a white background, following international medical emergency standards. Note: The red cross symbol is legally protected and restricted to Red Cross organizations only."
-        ]
-    else:
-        correct_answers = [3, 3, 1, 3]
-        explanations = [
-            "Proper traffic procedures require following all traffic signals and rules.",
-            "New Jersey law requires drivers to obey all traffic laws, drive defensively, and maintain safe distances.",
-            "The correct response is usually to proceed carefully while following traffic rules.",
-            "New Jersey requires proper licensing, vehicle registration, and insurance coverage."
-        ]
-    
-    correct_idx = correct_answers[template_idx] if template_idx < len(correct_answers) else 0
-    explanation = explanations[template_idx] if template_idx < len(explanations) else f"This question tests knowledge of {category.lower()} regulations in New Jersey."
-    
-    ADDITIONAL_QUESTIONS.append({
-        "id": i,
-        "category": category,
-        "question": question_templates[template_idx],
-        "options": options_templates[template_idx] if template_idx < len(options_templates) else options_templates[0],
-        "correct": correct_idx,
-        "explanation": explanation
-    })
-
-QUESTIONS.extend(ADDITIONAL_QUESTIONS)
-
-# Deployment and usage instructions
-DEPLOYMENT_INFO = """
-## 🚀 DEPLOYMENT INSTRUCTIONS
-
-### Quick Start (Minimum Requirements):
-1. Install Python 3.8+ and pip
-2. Run: `pip install streamlit`
-3. Run: `streamlit run streamlit_app.py`
-4. Open browser to: http://localhost:8501
-
-### Alternative Installation Methods:
-- **Conda**: `conda install streamlit`
-- **Poetry**: `poetry add streamlit`
-- **Pipenv**: `pipenv install streamlit`
-
-### Cloud Deployment:
-- **Streamlit Cloud**: Just upload this file and requirements
-- **Heroku**: Add Procfile with: `web: streamlit run streamlit_app.py --server.port=$PORT`
-- **Railway/Render**: Set start command to: `streamlit run streamlit_app.py --server.port $PORT`
-
-### Configuration:
-The app includes built-in configuration for optimal performance and appearance.
-No additional config files needed - everything is self-contained!
-
-### Features:
-✅ 170 Authentic NJ DMV Questions
-✅ Real-time Progress Tracking
-✅ Instant Feedback & Explanations
-✅ Category Performance Analysis
-✅ Mobile-Responsive Design
-✅ Session State Management
-"""
+# A compiled bank (python -m dmvquizzer.compile_bank) is memory-mapped from
+# DMV_QUESTION_BANK, or from DEFAULT_BANK_PATH if it exists; otherwise the bank
+# is built from the sources embedded in dmvquizzer.question_data
+QUESTION_BANK_PATH = os.environ.get("DMV_QUESTION_BANK") or (
+    DEFAULT_BANK_PATH if os.path.exists(DEFAULT_BANK_PATH) else None
+)
+
+@st.cache_resource(max_entries=1)
+def get_question_bank(path: Optional[str], content_hash: Optional[str]) -> QuestionBank:
+    """Build the question bank once per process and share it across sessions"""
+    # content_hash is only here as part of the cache key, so that replacing
+    # the compiled file with a new build loads the new bank; max_entries=1
+    # then drops the old bank and its memory map
+    return load_question_bank(path)
+
+with METRICS.phase("bank"):
+    QUESTIONS = get_question_bank(
+        QUESTION_BANK_PATH,
+        read_content_hash(QUESTION_BANK_PATH) if QUESTION_BANK_PATH else None
+    )
+
+# Item parameters for adaptive tests, calibrated offline with
+# python -m dmvquizzer.adaptive; uncalibrated questions get neutral defaults,
+# and with none calibrated adaptive tests draw questions at random
+ITEM_PARAMETERS_PATH = os.environ.get("DMV_ITEM_PARAMETERS", DEFAULT_PARAMETERS_PATH)
+
+@st.cache_resource(max_entries=1)
+def get_information_table(bank_hash: Optional[str], path: str, modified: Optional[float]) -> InformationTable:
+    """Precompute the adaptive item-information table once per process"""
+    # bank_hash and modified are cache keys: a new bank or recalibration rebuilds
+    # the table, and only the current one is kept
+    return InformationTable(QUESTIONS, load_item_parameters(QUESTIONS, path))
+
+# Every submitted answer is appended to this log by a background thread;
+# set DMV_EVENT_LOG to an empty string to turn logging off
+EVENT_LOG_PATH = os.environ.get("DMV_EVENT_LOG", DEFAULT_EVENT_LOG_PATH)
+
+@st.cache_resource
+def get_event_log(path: str) -> EventLog:
+    """Open the answer log and start its writer thread once per process"""
+    return EventLog(path)
+
+EVENT_LOG = get_event_log(EVENT_LOG_PATH) if EVENT_LOG_PATH else None
+
+# Tests in progress are saved here under a resume token kept in the URL;
+# set DMV_PROGRESS_DB to an empty string to turn resuming off
+PROGRESS_DB_PATH = os.environ.get("DMV_PROGRESS_DB", DEFAULT_PROGRESS_DB_PATH)
+
+@st.cache_resource
+def get_progress_store(path: str) -> ProgressStore:
+    """Open the progress database and start its writer thread once per process"""
+    return ProgressStore(path)
+
+PROGRESS_STORE = get_progress_store(PROGRESS_DB_PATH) if PROGRESS_DB_PATH else None
+
+# With DMV_SESSION_BACKEND set (sqlite:///path or redis://host:port/db) the
+# quiz state also lives in that store under ?session=<key>, so any worker
+# process can serve any rerun without sticky sessions
+SESSION_BACKEND_URL = os.environ.get("DMV_SESSION_BACKEND", "")
+
+@st.cache_resource
+def get_session_store(url: str) -> SessionStore:
+    """Connect to the shared session backend once per process"""
+    return SessionStore(open_backend(url))
+
+SESSION_STORE = get_session_store(SESSION_BACKEND_URL) if SESSION_BACKEND_URL else None
+run_timer.lap("setup")
+
+# How a session remembers its shuffled question order, "seed" or
+# "permutation" (see dmvquizzer.engine.SHUFFLE_STATES)
+SHUFFLE_STATE = os.environ.get("DMV_SHUFFLE_STATE", "seed")
 
 # Initialize session state
-if 'current_question' not in st.session_state:
-    st.session_state.current_question = 0
-if 'user_answers' not in st.session_state:
-    st.session_state.user_answers = {}
-if 'test_started' not in st.session_state:
-    st.session_state.test_started = False
-if 'show_results' not in st.session_state:
-    st.session_state.show_results = False
-if 'current_category' not in st.session_state:
-    st.session_state.current_category = 0
-if 'category_questions' not in st.session_state:
-    st.session_state.category_questions = {}
-if 'selected_section' not in st.session_state:
-    st.session_state.selected_section = None
+# The quiz itself (order, position, answers, scoring) lives in a headless
+# QuizEngine; session state only adds what the Streamlit view needs.
+# Setting shuffle_seed before the first run (e.g. to the seed logged with a
+# reported session's answers) replays that session's question order.
+if 'engine' not in st.session_state:
+    st.session_state.engine = QuizEngine(QUESTIONS, SHUFFLE_STATE, seed=st.session_state.get('shuffle_seed'))
 if 'section_selection_mode' not in st.session_state:
     st.session_state.section_selection_mode = True
-if 'questions_by_category' not in st.session_state:
-    # Organize questions by category
-    categories = {}
-    for idx, q in enumerate(QUESTIONS):
-        category = q['category']
-        if category not in categories:
-            categories[category] = []
-        categories[category].append((idx, q))
-    
-    # Randomize within each category
-    for category in categories:
-        random.shuffle(categories[category])
-    
-    st.session_state.questions_by_category = categories
-    st.session_state.category_list = list(categories.keys())
+if 'answer_mode' not in st.session_state:
+    st.session_state.answer_mode = "standard"
+if 'client_sync_seq' not in st.session_state:
+    st.session_state.client_sync_seq = {}
+if 'practice_mode' not in st.session_state:
+    st.session_state.practice_mode = None
+if 'last_feedback' not in st.session_state:
+    st.session_state.last_feedback = None
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+if 'question_shown' not in st.session_state:
+    # (bank index, time) of the question on screen, for answer latency
+    st.session_state.question_shown = None
+
+engine: QuizEngine = st.session_state.engine
+
+if 'progress_token' not in st.session_state:
+    # First run of this session: pick up a saved test from ?resume=<token>
+    st.session_state.progress_token = None
+    resume_token = st.query_params.get("resume")
+    saved = PROGRESS_STORE.load(resume_token) if PROGRESS_STORE and resume_token else None
+    if saved is not None and len(saved.answers.choices) == len(QUESTIONS):
+        st.session_state.progress_token = resume_token
+        engine.restore(saved.answers, saved.current_category, saved.current_question,
+                       saved.selected_section, saved.shuffle_seed)
+        st.session_state.section_selection_mode = False
+
+if 'review_token' not in st.session_state:
+    # A learner's spaced-repetition schedule is kept under ?review=<token>,
+    # so reviews due days later pick up where the last visit left off
+    st.session_state.review_token = st.query_params.get("review")
+
+def current_quiz_state() -> QuizState:
+    """The session's quiz state as stored in the shared session backend"""
+    return QuizState(
+        engine.answers,
+        engine.current_category,
+        engine.current_question,
+        engine.selected_section,
+        engine.shuffle_seed,
+        engine.test_started,
+        engine.show_results
+    )
+
+def load_shared_state():
+    """Bring this worker's copy of the quiz state up to date with the backend"""
+    key = st.query_params.get("session")
+    if key is None:
+        key = uuid.uuid4().hex
+        st.query_params["session"] = key
+    st.session_state.shared_key = key
+    version, state = SESSION_STORE.load(key)
+    if version == st.session_state.get('shared_version'):
+        return
+    st.session_state.shared_version = version
+    if state is None or st.session_state.practice_mode or len(state.answers.choices) != len(QUESTIONS):
+        return
+    # Another worker moved this learner on; adopt its state
+    engine.restore(AnswerSheet.from_bytes(state.answers.to_bytes()), state.current_category,
+                   state.current_question, state.selected_section, state.shuffle_seed,
+                   state.test_started, state.show_results)
+    st.session_state.section_selection_mode = not state.test_started
+    st.session_state.shared_saved = encode_state(state)
+
+def save_shared_state():
+    """Write the quiz state to the shared backend if it changed"""
+    if SESSION_STORE is None or st.session_state.practice_mode:
+        return
+    state = current_quiz_state()
+    if encode_state(state) == st.session_state.get('shared_saved'):
+        return
+    version, stored = SESSION_STORE.save(st.session_state.shared_key, st.session_state.shared_version, state)
+    if stored.answers.answered != state.answers.answered:
+        # Merged with answers given through another worker meanwhile
+        engine.answers = AnswerSheet.from_bytes(stored.answers.to_bytes())
+    st.session_state.shared_version = version
+    st.session_state.shared_saved = encode_state(stored)
+
+@METRICS.timed("save_progress")
+def save_progress():
+    """Queue a snapshot of the test in progress for the progress store"""
+    if st.session_state.practice_mode:
+        return
+    save_shared_state()
+    if PROGRESS_STORE is None:
+        return
+    if st.session_state.progress_token is None:
+        st.session_state.progress_token = uuid.uuid4().hex
+        st.query_params["resume"] = st.session_state.progress_token
+    PROGRESS_STORE.save(st.session_state.progress_token, Progress(
+        engine.answers,
+        engine.current_category,
+        engine.current_question,
+        engine.selected_section,
+        engine.shuffle_seed
+    ))
+
+if SESSION_STORE is not None:
+    load_shared_state()
+METRICS.count_rerun(st.session_state.session_id)
+run_timer.lap("session")
 
 def reset_test():
     """Reset the test state"""
-    st.session_state.current_question = 0
-    st.session_state.user_answers = {}
-    st.session_state.test_started = False
-    st.session_state.show_results = False
-    st.session_state.current_category = 0
-    st.session_state.selected_section = None
+    engine.reset()
     st.session_state.section_selection_mode = True
+    st.session_state.last_feedback = None
+    st.session_state.client_sync_seq = {}
+    st.session_state.practice_mode = None
+    st.session_state.practice = None
+    if st.session_state.progress_token is not None:
+        PROGRESS_STORE.delete(st.session_state.progress_token)
+        st.session_state.progress_token = None
+        st.query_params.pop("resume", None)
+    save_shared_state()
+
+def mark_question_shown(q_idx: int):
+    """Start the answer clock for a question, unless it is already running"""
+    shown = st.session_state.question_shown
+    if shown is None or shown[0] != q_idx:
+        st.session_state.question_shown = (q_idx, time.time())
+
+def submit_answer(q_idx: int, answer: Optional[int]):
+    """Record an answer with the engine and log it"""
+    # Only the first answer to a question counts towards the score, but every
+    # attempt is logged, including the repeats review and drill modes ask
+    engine.answer(q_idx, answer)
+    if EVENT_LOG is None:
+        return
+    is_correct = answer == QUESTIONS.correct[q_idx]
+    now = time.time()
+    shown = st.session_state.question_shown
+    latency_ms = round(1000 * (now - shown[1])) if shown and shown[0] == q_idx else None
+    EVENT_LOG.emit(AnswerEvent(now, st.session_state.session_id, QUESTIONS.ids[q_idx],
+                               answer, is_correct, latency_ms, engine.shuffle_seed))
+
+def answer_and_advance(q_idx: int):
+    """Fast mode: submit the selected answer and move to the next question"""
+    # Runs as a form callback, before the script, so the single rerun that
+    # follows already renders the next question with this one's feedback
+    submit_answer(q_idx, st.session_state.get(f"question_{q_idx}"))
+    st.session_state.last_feedback = q_idx
+    engine.advance()
+
+def current_scope():
+    """The exam or adaptive test in progress, if any; scores then cover only its questions"""
+    practice = st.session_state.get('practice')
+    return practice if isinstance(practice, (ExamSimulation, AdaptiveTest)) else None
+
+# Question panel
+# Moving between questions of the same section only changes what this panel
+# shows, so when fragments are available it reruns on its own and the sidebar
+# is left alone. Anything that changes sidebar data (submitting an answer,
+# changing section, showing results) still reruns the whole script.
+if hasattr(st, "fragment"):
+    question_panel_fragment = st.fragment
+else:
+    # Streamlit < 1.37: render the panel as part of every full script run
+    def question_panel_fragment(func):
+        return func
+
+def rerun_question_panel():
+    """Rerun just the question panel, or the whole script without fragments"""
+    if hasattr(st, "fragment"):
+        try:
+            st.rerun(scope="fragment")
+        except StreamlitAPIException:
+            # The panel was drawn by a full script run, not a fragment rerun
+            pass
+    st.rerun()
+
+@METRICS.timed("question_panel")
+def render_question_panel():
+    """Test Interface - Category-based navigation"""
+    save_progress()
+    current_question_data = engine.current()
     
-    # Reorganize questions by category and randomize within each category
-    categories = {}
-    for idx, q in enumerate(QUESTIONS):
-        category = q['category']
-        if category not in categories:
-            categories[category] = []
-        categories[category].append((idx, q))
+    if current_question_data is None:
+        # End of current section
+        if engine.selected_section:
+            # Section-specific mode - show completion
+            st.success(f"🎉 You've completed the {engine.selected_section} section!")
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("📊 View Section Results", type="primary"):
+                    engine.finish()
+                    st.rerun()
+            with col2:
+                if st.button("📚 Choose Another Section"):
+                    reset_test()
+                    st.rerun()
+        else:
+            # Full test mode - move to next section or show completion
+            if engine.current_category < len(QUESTIONS.categories) - 1:
+                st.success(f"✅ You've completed {engine.section}!")
+                if st.button("Continue to Next Section", type="primary"):
+                    engine.next_section()
+                    st.rerun()
+            else:
+                st.success("🎉 You've completed all sections! Ready to view your results?")
+                if st.button("View Final Results", type="primary"):
+                    engine.finish()
+                    st.rerun()
+    else:
+        # Show current question
+        current_q_idx, question = current_question_data
+        current_category = engine.section
+        category_questions = engine.section_order()
+
+        # Question Header
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.header(f"Section: {current_category}")
+            st.subheader(f"Question {engine.current_question + 1} of {len(category_questions)}")
+        with col2:
+            section_completion = ((engine.current_question + 1) / len(category_questions)) * 100
+            st.metric("Section Progress", f"{section_completion:.0f}%")
+        
+        # Fast mode - feedback for the question answered on the last submit
+        previous_idx = st.session_state.last_feedback
+        if st.session_state.answer_mode == "fast" and previous_idx is not None and previous_idx != current_q_idx:
+            previous = QUESTIONS[previous_idx]
+            if engine.answers.get(previous_idx) == previous['correct']:
+                st.success("✅ Previous question: Correct!")
+            else:
+                st.error(f"❌ Previous question: Incorrect. The correct answer was {chr(65+previous['correct'])}. {previous['options'][previous['correct']]}")
+            st.caption(f"💡 {previous['explanation']}")
+        
+        # Question Text
+        st.markdown(f"### {question['question']}")
+        mark_question_shown(current_q_idx)
+        
+        # Fast mode - submit and advance in one round trip
+        if st.session_state.answer_mode == "fast" and current_q_idx not in engine.answers:
+            with st.form(key=f"fast_{current_q_idx}"):
+                st.radio(
+                    "Select your answer:",
+                    options=range(len(question['options'])),
+                    format_func=lambda x: f"{chr(65+x)}. {question['options'][x]}",
+                    index=None,
+                    key=f"question_{current_q_idx}"
+                )
+                st.form_submit_button(
+                    "Submit & Next ➡️", type="primary",
+                    on_click=answer_and_advance, args=(current_q_idx,)
+                )
+        else:
+            # Answer Options
+            selected_answer = st.radio(
+                "Select your answer:",
+                options=range(len(question['options'])),
+                format_func=lambda x: f"{chr(65+x)}. {question['options'][x]}",
+                index=engine.answers.get(current_q_idx, None),
+                key=f"question_{current_q_idx}"
+            )
+        
+            # Answer submission - show submit button if not answered, or continue button if answered
+            if current_q_idx not in engine.answers:
+                if st.button("Submit Answer", type="primary"):
+                    submit_answer(current_q_idx, selected_answer)
+                    st.rerun()
+            else:
+                # Show feedback for answered question
+                user_answer = engine.answers[current_q_idx]
+                if user_answer == question['correct']:
+                    st.success("✅ Correct!")
+                else:
+                    st.error(f"❌ Incorrect. The correct answer is {chr(65+question['correct'])}.")
+            
+                st.info(f"💡 **Explanation:** {question['explanation']}")
+            
+                # Single continue button that advances to next question
+                if st.button("Continue to Next Question ➡️", type="primary"):
+                    if engine.advance():
+                        rerun_question_panel()
+                    st.rerun()
+        
+        # Optional navigation (Previous button only)
+        if engine.current_question > 0:
+            if st.button("⬅️ Previous Question", use_container_width=False):
+                engine.back()
+                st.session_state.last_feedback = None
+                rerun_question_panel()
+
+question_panel = question_panel_fragment(render_question_panel)
+
+@METRICS.timed("client_graded_panel")
+def render_client_graded_panel():
+    """Browser mode: the whole section is graded client-side and synced in batches"""
+    save_progress()
+    current_category = engine.section
+    category_questions = engine.section_order()
     
-    for category in categories:
-        random.shuffle(categories[category])
+    st.header(f"Section: {current_category}")
+    key = f"client_{engine.shuffle_seed}_{current_category}"
+    synced_seq = st.session_state.client_sync_seq.get(key, 0)
+    batch = client_graded_section(QUESTIONS, category_questions, engine.answers, synced_seq, key=key)
     
-    st.session_state.questions_by_category = categories
-    st.session_state.category_list = list(categories.keys())
+    if batch and batch.get('seq', 0) > synced_seq:
+        st.session_state.client_sync_seq[key] = batch['seq']
+        for q_idx, choice in accepted_answers(QUESTIONS, category_questions, batch):
+            submit_answer(q_idx, choice)
+        if batch.get('done'):
+            engine.current_question = len(category_questions) - 1
+            engine.advance()
+        # The sidebar was drawn before this batch arrived
+        st.rerun()
+
+# Practice modes pick questions one at a time instead of walking a section.
+# Each mode object provides next_question(now) -> bank index or None,
+# record(q_idx, correct, now), status(now) -> sidebar summary line and a
+# done_message shown once next_question has nothing left to ask.
+PRACTICE_MODES = {
+    "review": "🧠 Spaced Repetition Review",
+    "adaptive": "🎯 Adaptive Practice Test",
+    "drill": "🏋️ Drill My Weak Spots",
+    "exam": "📝 Exam Simulation"
+}
+
+def current_information_table() -> InformationTable:
+    """The shared adaptive item-information table for the current parameters file"""
+    modified = os.path.getmtime(ITEM_PARAMETERS_PATH) if os.path.exists(ITEM_PARAMETERS_PATH) else None
+    return get_information_table(QUESTIONS.content_hash, ITEM_PARAMETERS_PATH, modified)
+
+def load_review_schedule(now: float) -> SpacedRepetitionScheduler:
+    """The learner's saved review schedule, or a new one"""
+    token = st.session_state.review_token
+    saved = PROGRESS_STORE.load_schedule(token) if PROGRESS_STORE and token else None
+    if saved is not None:
+        seed, data = saved
+        new_order = random.Random(seed).sample(range(len(QUESTIONS)), len(QUESTIONS))
+        try:
+            scheduler = SpacedRepetitionScheduler.from_bytes(data, range(len(QUESTIONS)), new_order)
+        except ValueError:
+            # Saved against a different question bank; start over
+            pass
+        else:
+            st.session_state.review_seed = seed
+            return scheduler
+    # Introduce new questions in a per-learner shuffled order
+    st.session_state.review_seed = engine.shuffle_seed
+    new_order = random.Random(engine.shuffle_seed).sample(range(len(QUESTIONS)), len(QUESTIONS))
+    return SpacedRepetitionScheduler(range(len(QUESTIONS)), new_order, now)
+
+def save_review_schedule(scheduler: SpacedRepetitionScheduler):
+    """Queue the review schedule for the progress store under the learner's token"""
+    if PROGRESS_STORE is None:
+        return
+    if st.session_state.review_token is None:
+        st.session_state.review_token = uuid.uuid4().hex
+        st.query_params["review"] = st.session_state.review_token
+    PROGRESS_STORE.save_schedule(st.session_state.review_token, st.session_state.review_seed,
+                                 scheduler.to_bytes())
+
+def build_practice(mode: str):
+    """Create the question picker for a practice mode"""
+    now = time.time()
+    if mode == "review":
+        return load_review_schedule(now)
+    if mode == "adaptive":
+        return AdaptiveTest(current_information_table(), engine.shuffle_seed)
+    if mode == "drill":
+        # Answers already given this session seed the error rates
+        history = [(q_idx, answer == QUESTIONS.correct[q_idx]) for q_idx, answer in engine.answers.items()]
+        return WeakAreaDrill(QUESTIONS, engine.shuffle_seed, history)
+    if mode == "exam":
+        return ExamSimulation(QUESTIONS, engine.shuffle_seed)
+    raise ValueError(f"unknown practice mode {mode!r}")
 
-def get_current_question():
-    """Get the current question based on category and position"""
-    if not st.session_state.test_started:
-        return None
+def start_practice(mode: str):
+    """Start a practice mode session"""
+    st.session_state.practice_mode = mode
+    st.session_state.practice = build_practice(mode)
+    st.session_state.practice_current = None
+    st.session_state.practice_submitted = False
+    st.session_state.practice_round = 0
+    engine.start()
+    st.session_state.section_selection_mode = False
+
+@METRICS.timed("practice_panel")
+def render_practice_panel():
+    """Practice mode: ask whichever question the mode picks next"""
+    practice = st.session_state.practice
+    if st.session_state.practice_current is None:
+        st.session_state.practice_current = practice.next_question(time.time())
+    
+    q_idx = st.session_state.practice_current
+    if q_idx is None:
+        st.success(practice.done_message)
+        st.info(practice.status(time.time()))
+        if st.button("🏁 View Results", type="primary", key="practice_results"):
+            engine.finish()
+            st.rerun()
+        return
+    
+    question = QUESTIONS[q_idx]
+    st.header(PRACTICE_MODES[st.session_state.practice_mode])
+    st.subheader(f"Section: {question['category']}")
+    st.markdown(f"### {question['question']}")
+    mark_question_shown(q_idx)
     
-    # If practicing a specific section
-    if st.session_state.selected_section:
-        category_questions = st.session_state.questions_by_category[st.session_state.selected_section]
-        if st.session_state.current_question < len(category_questions):
-            return category_questions[st.session_state.current_question]
-        return None
+    if not st.session_state.practice_submitted:
+        selected_answer = st.radio(
+            "Select your answer:",
+            options=range(len(question['options'])),
+            format_func=lambda x: f"{chr(65+x)}. {question['options'][x]}",
+            index=None,
+            key=f"practice_{st.session_state.practice_round}"
+        )
+        if st.button("Submit Answer", type="primary"):
+            practice.record(q_idx, selected_answer == QUESTIONS.correct[q_idx], time.time())
+            if st.session_state.practice_mode == "review":
+                save_review_schedule(practice)
+            # Only the first attempt at a question counts towards the score
+            submit_answer(q_idx, selected_answer)
+            st.session_state.practice_answer = selected_answer
+            st.session_state.practice_submitted = True
+            st.rerun()
     else:
-        # Full test mode - cycle through all categories
-        category_name = st.session_state.category_list[st.session_state.current_category]
-        category_questions = st.session_state.questions_by_category[category_name]
+        if st.session_state.practice_answer == question['correct']:
+            st.success("✅ Correct!")
+        else:
+            st.error(f"❌ Incorrect. The correct answer is {chr(65+question['correct'])}.")
+        st.info(f"💡 **Explanation:** {question['explanation']}")
         
-        if st.session_state.current_question < len(category_questions):
-            return category_questions[st.session_state.current_question]
-        return None
-
-def calculate_score():
-    """Calculate test score and statistics"""
-    total_questions = len(QUESTIONS)
-    correct_answers = 0
+        if st.button("Next Question ➡️", type="primary"):
+            st.session_state.practice_current = None
+            st.session_state.practice_submitted = False
+            st.session_state.practice_round += 1
+            st.rerun()
+
+def render_review_results():
+    """Results of a review session: this session's reviews and the schedule ahead"""
+    scheduler = st.session_state.practice
+    reviews, correct = scheduler.session_reviews, scheduler.session_correct
+    due = scheduler.next_due_time()
+    now = time.time()
     
-    for q_idx, answer in st.session_state.user_answers.items():
-        if answer == QUESTIONS[q_idx]['correct']:
-            correct_answers += 1
+    st.header("🧠 Review Summary")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Reviews", reviews)
+    with col2:
+        st.metric("Accuracy", f"{correct / reviews * 100:.0f}%" if reviews else "–")
+    with col3:
+        st.metric("Learned", f"{scheduler.learned()}/{len(QUESTIONS)}")
+    with col4:
+        st.metric("Next Due", "now" if due is None or due <= now else f"in {format_delay(due - now)}")
+    st.caption(f"{scheduler.reviews} reviews in total on this schedule. Missed questions come back "
+               "within minutes, questions you know after days.")
+    if st.session_state.review_token is not None:
+        st.info("🔖 Bookmark this page to come back to your review schedule.")
     
-    score_percentage = (correct_answers / total_questions) * 100 if total_questions > 0 else 0
-    return {
-        'total': total_questions,
-        'correct': correct_answers,
-        'incorrect': len(st.session_state.user_answers) - correct_answers,
-        'unanswered': total_questions - len(st.session_state.user_answers),
-        'percentage': score_percentage,
-        'passed': score_percentage >= 80
-    }
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("🧠 Keep Reviewing", use_container_width=True):
+            engine.show_results = False
+            st.rerun()
+    with col2:
+        if st.button("🏠 Home", use_container_width=True):
+            reset_test()
+            st.rerun()
 
-def get_category_stats():
-    """Get performance statistics by category"""
-    category_stats = {}
+def render_drill_results():
+    """Results of a drill: accuracy per category over the questions drilled"""
+    drill = st.session_state.practice
+    drilled, correct = sum(drill.drilled), sum(drill.drilled_correct)
     
-    for category_name, questions in st.session_state.questions_by_category.items():
-        stats = {'total': len(questions), 'correct': 0, 'answered': 0}
-        
-        for q_idx, question in questions:
-            if q_idx in st.session_state.user_answers:
-                stats['answered'] += 1
-                if st.session_state.user_answers[q_idx] == question['correct']:
-                    stats['correct'] += 1
-        
-        stats['percentage'] = int((stats['correct'] / stats['total']) * 100) if stats['total'] > 0 else 0
-        category_stats[category_name] = stats
+    st.header("🏋️ Drill Summary")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Questions Drilled", drilled)
+    with col2:
+        st.metric("Correct", correct)
+    with col3:
+        st.metric("Accuracy", f"{correct / drilled * 100:.0f}%" if drilled else "–")
+    st.caption(drill.status(time.time()))
     
-    return category_stats
+    st.subheader("📊 Accuracy by Category")
+    for code, category in enumerate(QUESTIONS.categories):
+        if drill.drilled[code]:
+            percentage = drill.drilled_correct[code] / drill.drilled[code] * 100
+            st.write(f"**{category}**")
+            st.progress(percentage / 100)
+            st.caption(f"{drill.drilled_correct[code]}/{drill.drilled[code]} correct ({percentage:.1f}%)")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("🏋️ Keep Drilling", use_container_width=True):
+            engine.show_results = False
+            st.rerun()
+    with col2:
+        if st.button("🏠 Home", use_container_width=True):
+            reset_test()
+            st.rerun()
+
+def render_metrics_page():
+    """Admin page: rerun counts and phase timings of this server process"""
+    def ms(seconds: Optional[float]) -> str:
+        return f"{seconds * 1000:.2f}" if seconds is not None else "–"
+
+    st.title("⏱️ Rerun Metrics")
+    st.caption(
+        f"This server process only. Percentiles cover the last {WINDOW_SECONDS // 60} minutes; "
+        "calls and means cover everything since startup. setup, session, header, sidebar, main "
+        "and footer follow each other through a run and add up to script; the rest are parts of them."
+    )
+    if METRICS_PORT:
+        st.caption(f"Plain text for scraping: http://127.0.0.1:{METRICS_PORT}/metrics")
+
+    session_reruns = METRICS.session_reruns()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Script Runs", METRICS.runs_started)
+    with col2:
+        st.metric("Ran to Completion", METRICS.runs_completed)
+    with col3:
+        st.metric("Sessions", len(session_reruns))
+
+    st.subheader("Phases")
+    st.table([
+        {
+            "Phase": row['phase'],
+            "Calls": row['count'],
+            "Mean ms": ms(row['mean']),
+            "Recent calls": row['window_count'],
+            "p50 ms": ms(row['p50']),
+            "p95 ms": ms(row['p95']),
+            "p99 ms": ms(row['p99']),
+        }
+        for row in METRICS.phases()
+    ])
+
+    st.subheader("Busiest Sessions")
+    st.table([{"Session": session_id[:8], "Reruns": reruns} for session_id, reruns in session_reruns[:10]])
+
+    with st.expander("Plain-text metrics"):
+        st.code(METRICS.render_text(), language=None)
+    st.button("🔄 Refresh")
+
+def render_memory_page():
+    """Admin page: memory each live session keeps, broken down by state key"""
+    def kib(size: float) -> str:
+        return f"{size / 1024:,.1f}"
+
+    st.title("🧮 Session Memory")
+    st.caption(
+        "Sizes come from walking each session's state in this server process. The question bank "
+        "and other per-process caches are counted once as shared; keys differing only by numbers "
+        "are grouped, and (streamlit) is Streamlit's own widget bookkeeping."
+    )
+    with st.spinner("Measuring sessions..."):
+        report = memory_report([QUESTIONS, current_information_table()])
+    sessions = report.sessions
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Live Sessions", len(sessions))
+    with col2:
+        st.metric("Per Session (mean KiB)", kib(report.unique_total / len(sessions)) if sessions else "–")
+    with col3:
+        st.metric("Shared (KiB)", kib(report.shared))
+    with col4:
+        st.metric("Total (KiB)", kib(report.shared + report.unique_total))
+    if report.skipped:
+        st.caption(f"{report.skipped} session(s) changed while being measured and were left out.")
+
+    st.subheader("By State Key")
+    totals = sorted(report.totals().items(), key=lambda item: -item[1]['bytes'])
+    st.table([
+        {
+            "Key": group,
+            "Sessions": int(row['sessions']),
+            "Keys": int(row['keys']),
+            "Total KiB": kib(row['bytes']),
+            "Mean KiB": kib(row['mean']),
+            "Max KiB": kib(row['max']),
+        }
+        for group, row in totals
+    ])
+
+    st.subheader("Largest Sessions")
+    st.table([
+        {
+            "Session": session.session[:8],
+            "Total KiB": kib(session.total),
+            "Largest Key": max(session.groups.items(), key=lambda item: item[1][1])[0],
+        }
+        for session in sessions[:20]
+    ])
+    st.button("🔄 Refresh")
 
 # Main App Layout
+# Admin pages, only available with DMV_METRICS on
+ADMIN_PAGES = {"metrics": render_metrics_page, "memory": render_memory_page}
+if METRICS.enabled and st.query_params.get("admin") in ADMIN_PAGES:
+    ADMIN_PAGES[st.query_params["admin"]]()
+    st.stop()
+
 st.title("🚗 DMVNavigator NJ v2")
 st.subheader("New Jersey DMV Practice Test - Category-Based Testing")
 
+run_timer.lap("header")
+
 # Sidebar
 with st.sidebar:
     st.header("Test Progress")
     
-    if st.session_state.test_started:
+    if engine.test_started and st.session_state.practice_mode:
+        st.markdown(f"**{PRACTICE_MODES[st.session_state.practice_mode]}**")
+        st.caption(st.session_state.practice.status(time.time()))
+    elif engine.test_started:
         # Current category info
-        if st.session_state.selected_section:
+        current_category = engine.section
+        category_questions = engine.section_order()
+        if engine.selected_section:
             # Section-specific mode
-            current_category = st.session_state.selected_section
-            category_questions = st.session_state.questions_by_category[current_category]
             st.markdown(f"**Section Practice:** {current_category}")
         else:
             # Full test mode
-            current_category = st.session_state.category_list[st.session_state.current_category]
-            category_questions = st.session_state.questions_by_category[current_category]
             st.markdown(f"**Current Section:** {current_category}")
         
-        st.markdown(f"**Question {st.session_state.current_question + 1} of {len(category_questions)}**")
-        
         # Category progress
-        category_answered = sum(1 for q_idx, _ in category_questions if q_idx in st.session_state.user_answers)
+        category_answered = engine.answers.count_answered(QUESTIONS.category_masks[current_category])
         category_progress = (category_answered / len(category_questions)) * 100
         st.progress(category_progress / 100, text=f"Section Progress: {category_answered}/{len(category_questions)}")
-        
+    
+    if engine.test_started:
         # Overall progress
-        total_questions = len(QUESTIONS)
-        total_answered = len(st.session_state.user_answers)
-        overall_progress = (total_answered / total_questions) * 100
-        st.progress(overall_progress / 100, text=f"Overall Progress: {total_answered}/{total_questions}")
+        with METRICS.phase("score"):
+            score_data = engine.score(current_scope())
+        total_questions = score_data['total']
+        total_answered = total_questions - score_data['unanswered']
+        if st.session_state.practice_mode != "adaptive":
+            # An adaptive test has no fixed length; its status line shows how far it got
+            overall_progress = (total_answered / total_questions) * 100
+            st.progress(overall_progress / 100, text=f"Overall Progress: {total_answered}/{total_questions}")
         
         # Category performance breakdown
         st.markdown("### 📊 Category Performance")
-        category_stats = get_category_stats()
+        with METRICS.phase("category_stats"):
+            category_stats = engine.category_stats(current_scope())
         
         for cat_name, stats in category_stats.items():
             if stats['answered'] > 0:
@@ -1250,25 +841,23 @@ with st.sidebar:
         
         # Overall score
         if total_answered > 0:
-            overall_correct = sum(1 for q_idx, answer in st.session_state.user_answers.items() 
-                                if answer == QUESTIONS[q_idx]['correct'])
+            overall_correct = score_data['correct']
             overall_percentage = (overall_correct / total_answered) * 100
             st.markdown(f"### 🎯 Overall Score: {overall_correct}/{total_answered} ({overall_percentage:.1f}%)")
         
         # Category navigation (only show in full test mode)
-        if not st.session_state.selected_section:
+        if not engine.selected_section and not st.session_state.practice_mode:
             st.markdown("### 📂 Category Navigation")
-            for i, cat_name in enumerate(st.session_state.category_list):
-                cat_questions = st.session_state.questions_by_category[cat_name]
-                cat_answered = sum(1 for q_idx, _ in cat_questions if q_idx in st.session_state.user_answers)
+            for i, cat_name in enumerate(QUESTIONS.categories):
+                cat_questions = QUESTIONS.category_index[cat_name]
+                cat_answered = engine.answers.count_answered(QUESTIONS.category_masks[cat_name])
                 
-                prefix = "🔷" if i == st.session_state.current_category else "◻️"
+                prefix = "🔷" if i == engine.current_category else "◻️"
                 if st.button(f"{prefix} {cat_name} ({cat_answered}/{len(cat_questions)})", key=f"cat_{i}"):
-                    st.session_state.current_category = i
-                    st.session_state.current_question = 0
+                    engine.jump_to_category(i)
                     st.rerun()
         else:
-            # Section-specific mode - show back to selection option
+            # Section-specific or practice mode - show back to selection option
             st.markdown("### 🔄 Navigation")
             if st.button("📚 Back to Section Selection", use_container_width=True):
                 reset_test()
@@ -1277,33 +866,50 @@ with st.sidebar:
         st.markdown("---")
         
         if st.button("🏁 View Results", type="primary"):
-            st.session_state.show_results = True
+            engine.finish()
             st.rerun()
         
         if st.button("🔄 Restart Test"):
             reset_test()
             st.rerun()
 
+run_timer.lap("sidebar")
+
 # Main Content Area
-if not st.session_state.test_started:
+if not engine.test_started:
     if st.session_state.section_selection_mode:
         # Section Selection Screen
-        st.markdown("""
+        st.markdown(f"""
         ### Welcome to the New Jersey DMV Practice Test v2
         
-        Master your New Jersey driver's license test with **170 authentic questions** from real past NJ MVC knowledge tests.
+        Master your New Jersey driver's license test with **{len(QUESTIONS)} authentic questions** from real past NJ MVC knowledge tests.
         
         #### 🎯 Choose Your Test Mode:
         """)
         
+        answer_modes = {
+            "standard": "Standard",
+            "fast": "⚡ Fast: submit and go to the next question in one click",
+            "browser": "🖥️ Browser: grade in the browser, sync answers in batches"
+        }
+        st.session_state.answer_mode = st.radio(
+            "Answer mode:",
+            options=list(answer_modes),
+            format_func=answer_modes.get,
+            index=list(answer_modes).index(st.session_state.answer_mode),
+            help="Fast mode shows each answer's feedback above the following question. "
+                 "Browser mode syncs answers every few questions and at the end of each section."
+        )
+        
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown("#### 📚 Practice by Section")
             st.markdown("Select a specific category to focus your study:")
             
-            category_stats = get_category_stats()
-            categories = list(st.session_state.questions_by_category.keys())
+            with METRICS.phase("category_stats"):
+                category_stats = engine.category_stats()
+            categories = QUESTIONS.categories
             
             # Category icons
             category_icons = {
@@ -1329,63 +935,107 @@ if not st.session_state.test_started:
                 
                 if st.button(f"{icon} {category}{progress_text}", 
                            key=f"section_{i}", use_container_width=True):
-                    st.session_state.selected_section = category
-                    st.session_state.current_category = i
-                    st.session_state.current_question = 0
-                    st.session_state.test_started = True
+                    engine.start(category)
                     st.session_state.section_selection_mode = False
                     st.rerun()
         
         with col2:
             st.markdown("#### 🏆 Full Practice Test")
-            st.markdown("Take the complete 170-question test covering all categories:")
+            st.markdown(f"Take the complete {len(QUESTIONS)}-question test covering all categories:")
             
-            st.markdown("""
+            pass_count = math.ceil(len(QUESTIONS) * PASS_PERCENTAGE / 100)
+            st.markdown(f"""
             **Test Features:**
-            - ✅ 170 Official Questions from real NJ DMV tests
-            - ✅ All 8 categories included
+            - ✅ {len(QUESTIONS)} Official Questions from real NJ DMV tests
+            - ✅ All {len(QUESTIONS.categories)} categories included
             - ✅ Real-time progress tracking
             - ✅ Instant feedback with explanations
             - ✅ Performance breakdown by category
             
             **Pass Requirements:**
-            You need **80% (120 out of 150)** correct answers to pass.
+            You need **{PASS_PERCENTAGE}% ({pass_count} out of {len(QUESTIONS)})** correct answers to pass.
             """)
             
             if st.button("🚀 Start Full Practice Test", type="primary", use_container_width=True):
-                st.session_state.selected_section = None  # Full test
-                st.session_state.test_started = True
+                engine.start()  # Full test
                 st.session_state.section_selection_mode = False
                 st.rerun()
+            
+            st.markdown("#### 📝 Exam Simulation")
+            exam_pass_count = math.ceil(EXAM_LENGTH * PASS_PERCENTAGE / 100)
+            st.markdown(f"Like the real knowledge test: {EXAM_LENGTH} questions drawn from every category in proportion to its size. You need {exam_pass_count} correct to pass.")
+            if st.button(PRACTICE_MODES["exam"], use_container_width=True):
+                start_practice("exam")
+                st.rerun()
+            
+            st.markdown("#### 🧠 Spaced Repetition")
+            st.markdown("Review questions on a schedule: missed ones come back within minutes, known ones after days.")
+            if st.button(PRACTICE_MODES["review"], use_container_width=True):
+                start_practice("review")
+                st.rerun()
+            
+            st.markdown("#### 🎯 Adaptive Test")
+            st.markdown("Each question is picked to match your estimated ability, so the test stops as soon as your score is pinned down.")
+            if st.button(PRACTICE_MODES["adaptive"], use_container_width=True):
+                start_practice("adaptive")
+                st.rerun()
+            
+            st.markdown("#### 🏋️ Weak-Spot Drill")
+            st.markdown("Questions are drawn more often from the categories and questions you miss most.")
+            if st.button(PRACTICE_MODES["drill"], use_container_width=True):
+                start_practice("drill")
+                st.rerun()
     else:
         # This shouldn't happen, but just in case
         st.session_state.section_selection_mode = True
         st.rerun()
 
-elif st.session_state.show_results:
+elif engine.show_results and st.session_state.practice_mode == "review":
+    render_review_results()
+elif engine.show_results and st.session_state.practice_mode == "drill":
+    render_drill_results()
+elif engine.show_results:
     # Results Screen
-    score_data = calculate_score()
-    category_stats = get_category_stats()
+    save_shared_state()
+    with METRICS.phase("score"):
+        score_data = engine.score(current_scope())
+    with METRICS.phase("category_stats"):
+        category_stats = engine.category_stats(current_scope())
     
     st.header("🏆 Test Results")
     
+    # An adaptive test with calibrated items reports the score its ability
+    # estimate predicts over the whole bank, not just the questions it asked
+    adaptive = st.session_state.practice if st.session_state.practice_mode == "adaptive" else None
+    estimated = adaptive is not None and adaptive.table.calibrated
+    percentage = adaptive.estimated_percentage() if estimated else score_data['percentage']
+    
     # Overall Score
-    if score_data['passed']:
-        st.success(f"🎉 Congratulations! You passed with {score_data['percentage']:.1f}%")
+    if percentage >= PASS_PERCENTAGE:
+        st.success(f"🎉 Congratulations! You {'would pass' if estimated else 'passed'} with {percentage:.1f}%")
         st.balloons()
     else:
-        st.error(f"📚 Keep studying! You scored {score_data['percentage']:.1f}% - You need 80% to pass")
+        st.error(f"📚 Keep studying! You {'would score' if estimated else 'scored'} {percentage:.1f}% - You need {PASS_PERCENTAGE}% to pass")
+    if adaptive is not None:
+        st.caption(f"Based on {len(adaptive)} adaptively chosen questions" + (
+            f"; estimated from your ability ({adaptive.theta:+.2f} ± {adaptive.standard_error:.2f})."
+            if estimated else
+            ". The questions are not calibrated yet, so this is your score on the questions asked."
+        ))
     
     # Score Breakdown
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Final Score", f"{score_data['percentage']:.1f}%")
+        st.metric("Estimated Score" if estimated else "Final Score", f"{percentage:.1f}%")
     with col2:
         st.metric("Correct", score_data['correct'])
     with col3:
         st.metric("Incorrect", score_data['incorrect'])
     with col4:
-        st.metric("Unanswered", score_data['unanswered'])
+        if adaptive is not None:
+            st.metric("Questions Asked", len(adaptive))
+        else:
+            st.metric("Unanswered", score_data['unanswered'])
     
     # Category Performance
     st.subheader("📊 Performance by Category")
@@ -1411,8 +1061,8 @@ elif st.session_state.show_results:
     col1, col2, col3 = st.columns(3)
     with col1:
         if st.button("📝 Review Questions", use_container_width=True):
-            st.session_state.show_results = False
-            st.session_state.current_question = 0
+            engine.show_results = False
+            engine.current_question = 0
             st.rerun()
     with col2:
         if st.button("🔄 Retake Test", use_container_width=True):
@@ -1422,105 +1072,23 @@ elif st.session_state.show_results:
         if st.button("🏠 Home", use_container_width=True):
             reset_test()
             st.rerun()
+    
+    if len(engine.answers) and st.button(f"{PRACTICE_MODES['drill']} from these results", use_container_width=True):
+        # Keep the answers so the drill starts from this attempt's mistakes
+        start_practice("drill")
+        st.rerun()
 
+elif st.session_state.practice_mode:
+    render_practice_panel()
+elif st.session_state.answer_mode == "browser":
+    render_client_graded_panel()
+elif st.session_state.answer_mode == "fast":
+    # Form submits must rerun the full script so their callback's changes
+    # reach the sidebar in the same round trip
+    render_question_panel()
 else:
-    # Test Interface - Category-based navigation
-    current_question_data = get_current_question()
-    
-    if current_question_data is None:
-        # End of current section
-        if st.session_state.selected_section:
-            # Section-specific mode - show completion
-            st.success(f"🎉 You've completed the {st.session_state.selected_section} section!")
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("📊 View Section Results", type="primary"):
-                    st.session_state.show_results = True
-                    st.rerun()
-            with col2:
-                if st.button("📚 Choose Another Section"):
-                    reset_test()
-                    st.rerun()
-        else:
-            # Full test mode - move to next section or show completion
-            if st.session_state.current_category < len(st.session_state.category_list) - 1:
-                st.success(f"✅ You've completed {st.session_state.category_list[st.session_state.current_category]}!")
-                if st.button("Continue to Next Section", type="primary"):
-                    st.session_state.current_category += 1
-                    st.session_state.current_question = 0
-                    st.rerun()
-            else:
-                st.success("🎉 You've completed all sections! Ready to view your results?")
-                if st.button("View Final Results", type="primary"):
-                    st.session_state.show_results = True
-                    st.rerun()
-    else:
-        # Show current question
-        current_q_idx, question = current_question_data
-        
-        if st.session_state.selected_section:
-            current_category = st.session_state.selected_section
-            category_questions = st.session_state.questions_by_category[current_category]
-        else:
-            current_category = st.session_state.category_list[st.session_state.current_category]
-            category_questions = st.session_state.questions_by_category[current_category]
-        
-        # Question Header
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            st.header(f"Section: {current_category}")
-            st.subheader(f"Question {st.session_state.current_question + 1} of {len(category_questions)}")
-        with col2:
-            section_completion = ((st.session_state.current_question + 1) / len(category_questions)) * 100
-            st.metric("Section Progress", f"{section_completion:.0f}%")
-        
-        # Question Text
-        st.markdown(f"### {question['question']}")
-        
-        # Answer Options
-        selected_answer = st.radio(
-            "Select your answer:",
-            options=range(len(question['options'])),
-            format_func=lambda x: f"{chr(65+x)}. {question['options'][x]}",
-            index=st.session_state.user_answers.get(current_q_idx, None),
-            key=f"question_{current_q_idx}"
-        )
-        
-        # Answer submission - show submit button if not answered, or continue button if answered
-        if current_q_idx not in st.session_state.user_answers:
-            if st.button("Submit Answer", type="primary"):
-                st.session_state.user_answers[current_q_idx] = selected_answer
-                st.rerun()
-        else:
-            # Show feedback for answered question
-            user_answer = st.session_state.user_answers[current_q_idx]
-            if user_answer == question['correct']:
-                st.success("✅ Correct!")
-            else:
-                st.error(f"❌ Incorrect. The correct answer is {chr(65+question['correct'])}.")
-            
-            st.info(f"💡 **Explanation:** {question['explanation']}")
-            
-            # Single continue button that advances to next question
-            if st.button("Continue to Next Question ➡️", type="primary"):
-                # Auto-advance logic
-                if st.session_state.current_question < len(category_questions) - 1:
-                    st.session_state.current_question += 1
-                elif st.session_state.selected_section:
-                    # Section-specific mode - end of section
-                    st.session_state.show_results = True
-                elif st.session_state.current_category < len(st.session_state.category_list) - 1:
-                    st.session_state.current_category += 1
-                    st.session_state.current_question = 0
-                else:
-                    st.session_state.show_results = True
-                st.rerun()
-        
-        # Optional navigation (Previous button only)
-        if st.session_state.current_question > 0:
-            if st.button("⬅️ Previous Question", use_container_width=False):
-                st.session_state.current_question -= 1
-                st.rerun()
+    question_panel()
+run_timer.lap("main")
 
 # Footer with deployment information
 st.markdown("---")
@@ -1528,7 +1096,7 @@ st.markdown("🚗 **DMVNavigator NJ v2** - Practice with authentic New Jersey DM
 
 # Deployment instructions in expander
 with st.expander("📋 Deployment Instructions"):
-    st.markdown("""
+    st.markdown(f"""
     ### 🚀 How to Run This App
     
     **Requirements:** Only Python 3.8+ and Streamlit
@@ -1549,15 +1117,17 @@ with st.expander("📋 Deployment Instructions"):
     - **Railway/Render:** Set start command: `streamlit run streamlit_app.py --server.port $PORT`
     
     **Features:**
-    - ✅ 150 Authentic NJ DMV questions from real past tests
-    - ✅ All 7 test categories with proper distribution  
+    - ✅ {len(QUESTIONS)} Authentic NJ DMV questions from real past tests
+    - ✅ All {len(QUESTIONS.categories)} test categories with proper distribution
     - ✅ Real-time progress tracking and scoring
     - ✅ Instant feedback with detailed explanations
     - ✅ Category-based performance analysis
     - ✅ Mobile-responsive design
-    - ✅ 80% pass threshold (120/150 questions)
+    - ✅ {PASS_PERCENTAGE}% pass threshold ({math.ceil(len(QUESTIONS) * PASS_PERCENTAGE / 100)}/{len(QUESTIONS)} questions)
     
-    **Self-Contained:** This file includes everything needed - no additional files required!
+    **Self-Contained:** This file and the bundled `dmvquizzer` package include everything needed!
     """)
 
-st.markdown("*This application is completely self-contained. Only this single file is needed to run the full DMV practice test.*")
\ No newline at end of file
+st.markdown("*This application is self-contained. Only this file and the bundled dmvquizzer package are needed to run the full DMV practice test.*")
+run_timer.lap("footer")
+run_timer.finish()
@@ -0,0 +1,6 @@
+"""
+DMV Navigator NJ v2 support package
+
+Holds the question bank and quiz logic that app.py builds on, kept outside the
+Streamlit script so it is loaded once per process rather than on every rerun.
+"""
@@ -0,0 +1,352 @@
+"""
+Computer-adaptive testing over the question bank
+
+Items follow a two-parameter logistic model: the chance of answering item
+``j`` correctly at ability ``theta`` is ``1 / (1 + exp(-a_j (theta - b_j)))``.
+Parameters are calibrated offline from answer logs (``calibrate_rasch``, or
+``python -m dmvquizzer.adaptive``) and stored by question id in a JSON file.
+Questions without parameters default to ``a = 1, b = 0``.
+
+InformationTable precomputes, for every ability on a fixed grid, each
+category's questions ranked by Fisher information at that ability. Picking the
+next item is then a walk down one precomputed ranking that only skips already
+administered items, never a scan of the bank. Ability is estimated by EAP over
+the same grid, so each answer costs O(grid size) regardless of bank size.
+
+Two constraints keep the test from asking every learner the same handful of
+items. Content balancing asks next from the category furthest below its share
+of the bank, and randomesque selection draws the item at random from the
+RANDOMESQUE_CANDIDATES most informative ones left in that category. Without a
+calibration file every item has the same parameters and information ranks
+nothing, so items are then drawn at random within the balanced category.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+from array import array
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .bank import QuestionBank
+
+# Where the calibration CLI writes by default and app.py looks for parameters
+DEFAULT_PARAMETERS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                       'item_parameters.json')
+
+# Abilities the information table and the EAP posterior are evaluated at
+THETA_GRID = tuple(-4.0 + 0.25 * k for k in range(33))
+
+# Stop once the ability estimate is this precise, or after MAX_ITEMS
+TARGET_STANDARD_ERROR = 0.4
+MIN_ITEMS = 10
+MAX_ITEMS = 40
+
+# The next item is drawn at random from this many most informative candidates
+RANDOMESQUE_CANDIDATES = 5
+
+# Abilities and difficulties are kept within this range during calibration
+_LOGIT_LIMIT = 5.0
+
+
+def _probability(theta: float, a: float, b: float) -> float:
+    return 1.0 / (1.0 + math.exp(-a * (theta - b)))
+
+
+class ItemParameters:
+    """Discrimination ``a`` and difficulty ``b`` per bank index
+
+    ``calibrated`` counts the items whose parameters came from a calibration
+    file rather than the defaults.
+    """
+
+    __slots__ = ('a', 'b', 'calibrated')
+
+    def __init__(self, a: array, b: array, calibrated: int = 0):
+        self.a = a
+        self.b = b
+        self.calibrated = calibrated
+
+    @classmethod
+    def default(cls, size: int) -> 'ItemParameters':
+        return cls(array('f', [1.0]) * size, array('f', [0.0]) * size)
+
+
+def load_item_parameters(bank: QuestionBank, path: Optional[str]) -> ItemParameters:
+    """Read parameters keyed by question id and align them with the bank"""
+    parameters = ItemParameters.default(len(bank))
+    if not path or not os.path.exists(path):
+        return parameters
+    with open(path, encoding='utf-8') as f:
+        items = json.load(f)['items']
+    for idx, question_id in enumerate(bank.ids):
+        values = items.get(str(question_id))
+        if values is not None:
+            parameters.a[idx], parameters.b[idx] = values
+            parameters.calibrated += 1
+    return parameters
+
+
+class InformationTable:
+    """Each category's items ranked by information at each ability on THETA_GRID
+
+    Built once per process and shared by every adaptive session.
+    ``ranked[g][c]`` holds the bank indices of category ``c`` from most to
+    least informative at ``THETA_GRID[g]``; equally informative items are in a
+    fixed random order rather than bank order. ``expected_percentages[g]``
+    is the expected percentage correct over the whole bank at
+    ``THETA_GRID[g]``.
+    """
+
+    __slots__ = ('bank', 'parameters', 'ranked', 'shares', 'expected_percentages')
+
+    def __init__(self, bank: QuestionBank, parameters: ItemParameters):
+        self.bank = bank
+        self.parameters = parameters
+        a, b = parameters.a, parameters.b
+        codes = bank.category_codes
+        size = len(bank)
+        # Fraction of the bank in each category, the content-balancing target
+        self.shares = [len(bank.category_index[category]) / size if size else 0.0
+                       for category in bank.categories]
+
+        # Sorting is stable, so shuffling first breaks ties randomly
+        items = list(range(size))
+        random.Random(0).shuffle(items)
+        self.ranked: List[List[array]] = []
+        self.expected_percentages = array('d')
+        for theta in THETA_GRID:
+            information = []
+            expected = 0.0
+            for j in range(size):
+                p = _probability(theta, a[j], b[j])
+                information.append(a[j] * a[j] * p * (1.0 - p))
+                expected += p
+            self.expected_percentages.append(100.0 * expected / size if size else 0.0)
+            by_category = [array('I') for _ in bank.categories]
+            for j in sorted(items, key=information.__getitem__, reverse=True):
+                by_category[codes[j]].append(j)
+            self.ranked.append(by_category)
+
+    @property
+    def calibrated(self) -> bool:
+        return self.parameters.calibrated > 0
+
+    def expected_percentage(self, theta: float) -> float:
+        """Expected percentage correct over the bank, interpolated between grid points"""
+        step = THETA_GRID[1] - THETA_GRID[0]
+        position = min(len(THETA_GRID) - 1.0, max(0.0, (theta - THETA_GRID[0]) / step))
+        g = min(len(THETA_GRID) - 2, int(position))
+        low, high = self.expected_percentages[g], self.expected_percentages[g + 1]
+        return low + (high - low) * (position - g)
+
+    def pick_item(self, theta: float, category: int, administered: int, rng: random.Random) -> Optional[int]:
+        """An item of ``category`` not in ``administered``, for a learner at ``theta``
+
+        Calibrated: one of the RANDOMESQUE_CANDIDATES most informative at
+        ``theta``. Uncalibrated: any, uniformly at random.
+        """
+        if not self.calibrated:
+            indices = self.bank.category_index[self.bank.categories[category]]
+            start = rng.randrange(len(indices)) if len(indices) else 0
+            for offset in range(len(indices)):
+                j = indices[(start + offset) % len(indices)]
+                if not administered >> j & 1:
+                    return j
+            return None
+
+        step = THETA_GRID[1] - THETA_GRID[0]
+        g = min(len(THETA_GRID) - 1, max(0, round((theta - THETA_GRID[0]) / step)))
+        candidates = []
+        for j in self.ranked[g][category]:
+            if not administered >> j & 1:
+                candidates.append(j)
+                if len(candidates) == RANDOMESQUE_CANDIDATES:
+                    break
+        return rng.choice(candidates) if candidates else None
+
+
+class AdaptiveTest:
+    """One learner's adaptive test: administered items and ability posterior
+
+    Implements the app's practice-mode interface (next_question, record,
+    status). Like an ExamSimulation it can scope a score: ``mask`` and
+    ``seats`` cover the items administered so far.
+    """
+
+    __slots__ = ('table', 'rng', 'administered', 'count', 'category_counts', 'log_posterior', 'theta',
+                 'standard_error', '_pending')
+
+    done_message = "🎉 Adaptive test complete!"
+
+    def __init__(self, table: InformationTable, seed: Optional[int] = None):
+        self.table = table
+        self.rng = random.Random(seed)
+        self.administered = 0
+        self.count = 0
+        self.category_counts = [0] * len(table.shares)
+        # Standard normal prior over the grid
+        self.log_posterior = array('d', [-0.5 * theta * theta for theta in THETA_GRID])
+        self.theta = 0.0
+        self.standard_error = 1.0
+        self._pending: Optional[int] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def mask(self) -> int:
+        return self.administered
+
+    @property
+    def seats(self) -> Dict[str, int]:
+        return dict(zip(self.table.bank.categories, self.category_counts))
+
+    @property
+    def finished(self) -> bool:
+        if self.count >= MAX_ITEMS:
+            return True
+        return self.count >= MIN_ITEMS and self.standard_error <= TARGET_STANDARD_ERROR
+
+    def next_question(self, now: float) -> Optional[int]:
+        """An unseen item from the category furthest below its share"""
+        if self.finished:
+            return None
+        if self._pending is None:
+            deficits = sorted(
+                range(len(self.table.shares)),
+                key=lambda c: (self.category_counts[c] - self.table.shares[c] * (self.count + 1), self.rng.random())
+            )
+            for category in deficits:
+                self._pending = self.table.pick_item(self.theta, category, self.administered, self.rng)
+                if self._pending is not None:
+                    break
+        return self._pending
+
+    def record(self, q_idx: int, correct: bool, now: float):
+        """Update the ability posterior with one response"""
+        if self.administered >> q_idx & 1:
+            return
+        self.administered |= 1 << q_idx
+        self.count += 1
+        self.category_counts[self.table.bank.category_codes[q_idx]] += 1
+        self._pending = None
+
+        a, b = self.table.parameters.a[q_idx], self.table.parameters.b[q_idx]
+        log_posterior = self.log_posterior
+        for g, theta in enumerate(THETA_GRID):
+            p = _probability(theta, a, b)
+            log_posterior[g] += math.log(p if correct else 1.0 - p)
+
+        peak = max(log_posterior)
+        weights = [math.exp(value - peak) for value in log_posterior]
+        total = sum(weights)
+        mean = sum(w * theta for w, theta in zip(weights, THETA_GRID)) / total
+        variance = sum(w * (theta - mean) ** 2 for w, theta in zip(weights, THETA_GRID)) / total
+        self.theta = mean
+        self.standard_error = math.sqrt(variance)
+
+    def estimated_percentage(self) -> float:
+        """Expected percentage correct over the whole bank at the current ability"""
+        return self.table.expected_percentage(self.theta)
+
+    def status(self, now: float) -> str:
+        """One-line summary for the sidebar"""
+        if not self.table.calibrated:
+            # With every item at the defaults the estimate says little about the bank
+            return f"{self.count} questions, ability {self.theta:+.2f} ± {self.standard_error:.2f}"
+        return (f"{self.count} questions, ability {self.theta:+.2f} ± {self.standard_error:.2f}, "
+                f"estimated score {self.estimated_percentage():.0f}%")
+
+
+def calibrate_rasch(responses: Iterable[Tuple[str, int, bool]], iterations: int = 50) -> Dict[int, float]:
+    """Estimate Rasch difficulties from ``(learner, question id, correct)`` responses
+
+    Joint maximum likelihood with Newton steps, difficulties centred on zero.
+    Only a learner's first answer to a question is used; repeats come after
+    its feedback. Returns question id -> difficulty.
+    """
+    by_learner: Dict[str, List[Tuple[int, bool]]] = defaultdict(list)
+    asked: Dict[str, set] = defaultdict(set)
+    for learner, question_id, correct in responses:
+        if question_id not in asked[learner]:
+            asked[learner].add(question_id)
+            by_learner[learner].append((question_id, bool(correct)))
+
+    def logit(p: float) -> float:
+        p = min(max(p, 0.02), 0.98)
+        return math.log(p / (1.0 - p))
+
+    item_totals: Dict[int, List[int]] = defaultdict(lambda: [0, 0])
+    for answers in by_learner.values():
+        for question_id, correct in answers:
+            item_totals[question_id][0] += correct
+            item_totals[question_id][1] += 1
+    difficulty = {q: -logit(right / seen) for q, (right, seen) in item_totals.items()}
+    ability = {
+        learner: logit(sum(c for _, c in answers) / len(answers))
+        for learner, answers in by_learner.items()
+    }
+
+    for _ in range(iterations):
+        for learner, answers in by_learner.items():
+            gradient = curvature = 0.0
+            for question_id, correct in answers:
+                p = _probability(ability[learner], 1.0, difficulty[question_id])
+                gradient += correct - p
+                curvature += p * (1.0 - p)
+            if curvature > 0:
+                ability[learner] = min(_LOGIT_LIMIT, max(-_LOGIT_LIMIT, ability[learner] + gradient / curvature))
+
+        gradient_by_item: Dict[int, float] = defaultdict(float)
+        curvature_by_item: Dict[int, float] = defaultdict(float)
+        for learner, answers in by_learner.items():
+            for question_id, correct in answers:
+                p = _probability(ability[learner], 1.0, difficulty[question_id])
+                gradient_by_item[question_id] += p - correct
+                curvature_by_item[question_id] += p * (1.0 - p)
+        for question_id, curvature in curvature_by_item.items():
+            if curvature > 0:
+                step = gradient_by_item[question_id] / curvature
+                difficulty[question_id] = min(_LOGIT_LIMIT, max(-_LOGIT_LIMIT, difficulty[question_id] + step))
+
+        if difficulty:
+            centre = sum(difficulty.values()) / len(difficulty)
+            for question_id in difficulty:
+                difficulty[question_id] -= centre
+    return difficulty
+
+
+def read_responses(paths: Sequence[str]) -> Iterable[Tuple[str, int, bool]]:
+    """Yield responses from JSON-lines logs with session, question_id and correct"""
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    event = json.loads(line)
+                    yield str(event['session']), int(event['question_id']), bool(event['correct'])
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Calibrate item difficulties for adaptive tests")
+    parser.add_argument('logs', nargs='+', help="JSON-lines answer logs")
+    parser.add_argument('-o', '--output', default=DEFAULT_PARAMETERS_PATH,
+                        help=f"parameter file to write (default: {DEFAULT_PARAMETERS_PATH})")
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    difficulty = calibrate_rasch(read_responses(args.logs), args.iterations)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'model': 'rasch',
+            'items': {str(q): [1.0, round(b, 4)] for q, b in sorted(difficulty.items())}
+        }, f, indent=1)
+    print(f"calibrated {len(difficulty)} items -> {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
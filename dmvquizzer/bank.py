@@ -0,0 +1,219 @@
+"""
+Immutable question bank shared by every session in the process
+"""
+
+import random
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping as MappingABC
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+# Upper bound on bank indices held by the memoized (category, seed) orders of
+# one bank. An order is a tuple sharing its int objects with category_index,
+# so this caps the cache near 8 bytes per index, about 16 MB, whatever the
+# bank size; how many sessions' orders fit depends on the section sizes.
+SHUFFLE_CACHE_INDICES = 2 * 1024 * 1024
+
+# Columns that hold fixed-width integers and can be viewed as NumPy arrays
+NUMERIC_COLUMNS = ('ids', 'category_codes', 'correct')
+
+
+class _OrderCache:
+    """Thread-safe LRU cache of shuffled orders, bounded by the indices they hold"""
+
+    __slots__ = ('limit', 'size', '_orders', '_lock')
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.size = 0
+        self._orders: 'OrderedDict[Tuple[str, int], Tuple[int, ...]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, int]) -> Optional[Tuple[int, ...]]:
+        with self._lock:
+            order = self._orders.get(key)
+            if order is not None:
+                self._orders.move_to_end(key)
+            return order
+
+    def put(self, key: Tuple[str, int], order: Tuple[int, ...]):
+        if len(order) > self.limit:
+            return
+        with self._lock:
+            if key in self._orders:
+                return
+            self._orders[key] = order
+            self.size += len(order)
+            while self.size > self.limit:
+                _, evicted = self._orders.popitem(last=False)
+                self.size -= len(evicted)
+
+
+class QuestionView(MappingABC):
+    """Read-only, dict-like view of one row of a QuestionBank
+
+    Has the same keys as the source question dicts, so rendering code can
+    keep using ``question['options']`` and friends.
+    """
+
+    __slots__ = ('_bank', 'index')
+
+    KEYS = ('id', 'category', 'question', 'options', 'correct', 'explanation')
+
+    def __init__(self, bank: 'QuestionBank', index: int):
+        self._bank = bank
+        self.index = index
+
+    def __getitem__(self, key: str) -> Any:
+        bank, idx = self._bank, self.index
+        if key == 'question':
+            return bank.question_texts[idx]
+        if key == 'options':
+            return bank.options[idx]
+        if key == 'correct':
+            return bank.correct[idx]
+        if key == 'explanation':
+            return bank.explanations[idx]
+        if key == 'category':
+            return bank.categories[bank.category_codes[idx]]
+        if key == 'id':
+            return bank.ids[idx]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+
+class QuestionBank:
+    """Read-only, column-oriented question bank
+
+    Each field is stored as its own column: ``ids``, ``category_codes`` and
+    ``correct`` are compact integer arrays, categories are interned as codes
+    into ``categories``, and the text fields live in parallel tuples. Indexing
+    the bank returns a QuestionView, so ``bank[idx]['correct']`` keeps working
+    while scoring and sampling code can read the dense columns directly.
+
+    Columns only need to be sequences; a bank opened from a compiled file
+    (see ``dmvquizzer.compiled``) backs them with memory-mapped buffers and
+    decodes text lazily. ``content_hash`` identifies such a bank's contents.
+    """
+
+    __slots__ = (
+        'ids', 'categories', 'category_codes', 'correct',
+        'question_texts', 'options', 'explanations',
+        'content_hash', 'category_index', 'category_masks', '_order_cache'
+    )
+
+    def __init__(self, ids: array, categories: Sequence[str], category_codes: array,
+                 correct: array, question_texts: Sequence[str],
+                 options: Sequence[Tuple[str, ...]], explanations: Sequence[str],
+                 content_hash: Optional[str] = None):
+        self.ids = ids
+        self.categories: Tuple[str, ...] = tuple(categories)
+        self.category_codes = category_codes
+        self.correct = correct
+        self.question_texts = question_texts
+        self.options = options
+        self.explanations = explanations
+        self.content_hash = content_hash
+
+        # Category name -> bank indices, in bank order. Computed once here so
+        # sessions only need to hold their own shuffled permutation of it.
+        index = [[] for _ in self.categories]
+        for idx, code in enumerate(category_codes):
+            index[code].append(idx)
+        self.category_index: Mapping[str, Tuple[int, ...]] = MappingProxyType(
+            {category: tuple(indices) for category, indices in zip(self.categories, index)}
+        )
+        # Category name -> bitmask of its bank indices, for popcount scoring
+        masks: Dict[str, int] = {}
+        for category, indices in zip(self.categories, index):
+            mask = 0
+            for idx in indices:
+                mask |= 1 << idx
+            masks[category] = mask
+        self.category_masks: Mapping[str, int] = MappingProxyType(masks)
+        self._order_cache = _OrderCache(SHUFFLE_CACHE_INDICES)
+
+    @classmethod
+    def from_records(cls, questions: Iterable[Dict]) -> 'QuestionBank':
+        """Build a bank from question dicts in the source format"""
+        ids = array('I')
+        category_codes = array('H')
+        correct = array('B')
+        question_texts, options, explanations = [], [], []
+        codes: Dict[str, int] = {}
+        # Templated questions repeat the same option lists; keep one copy each
+        option_pool: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+        for question in questions:
+            ids.append(question['id'])
+            category_codes.append(codes.setdefault(question['category'], len(codes)))
+            correct.append(question['correct'])
+            question_texts.append(question['question'])
+            question_options = tuple(question['options'])
+            options.append(option_pool.setdefault(question_options, question_options))
+            explanations.append(question['explanation'])
+
+        return cls(ids, tuple(codes), category_codes, correct,
+                   tuple(question_texts), tuple(options), tuple(explanations))
+
+    def __len__(self) -> int:
+        return len(self.correct)
+
+    def __getitem__(self, idx: int) -> QuestionView:
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("question index out of range")
+        return QuestionView(self, idx)
+
+    def __iter__(self) -> Iterator[QuestionView]:
+        return (QuestionView(self, idx) for idx in range(len(self)))
+
+    def as_numpy(self, column: str):
+        """Return a read-only, zero-copy NumPy view of a numeric column"""
+        if np is None:
+            raise ImportError("NumPy is required for QuestionBank.as_numpy()")
+        if column not in NUMERIC_COLUMNS:
+            raise ValueError(f"{column!r} is not one of {NUMERIC_COLUMNS}")
+        values = getattr(self, column)
+        typecode = values.typecode if isinstance(values, array) else values.format
+        view = np.frombuffer(values, dtype=typecode)
+        view.flags.writeable = False
+        return view
+
+    def shuffled_order(self, category: str, seed: int) -> Tuple[int, ...]:
+        """Return the category's bank indices shuffled deterministically by seed
+
+        Orders are kept in an LRU cache bounded by SHUFFLE_CACHE_INDICES, so
+        a session that only stores its seed pays for the shuffle once, not on
+        every rerun, as long as the orders of recently active sessions fit.
+        """
+        key = (category, seed)
+        order = self._order_cache.get(key)
+        if order is None:
+            shuffled = list(self.category_index[category])
+            random.Random(f"{seed}:{category}").shuffle(shuffled)
+            order = tuple(shuffled)
+            self._order_cache.put(key, order)
+        return order
+
+
+def load_question_bank(path: Optional[str] = None) -> QuestionBank:
+    """Open a compiled bank file, or build the bank from the embedded sources"""
+    if path:
+        from .compiled import open_compiled_bank
+        return open_compiled_bank(path)
+    from .question_data import build_question_sources
+    return QuestionBank.from_records(build_question_sources())
@@ -0,0 +1,327 @@
+"""
+Rerun latency benchmark for app.py
+
+Usage:
+    python -m dmvquizzer.benchmark [--sizes embedded,1000,10000,100000]
+                                   [-o results.json] [--compare baseline.json]
+
+Every size is benchmarked in a fresh Python process driving app.py through
+Streamlit's AppTest harness, so bank caches and peak memory never carry over
+from one size to the next. Sizes other than ``embedded`` are synthetic banks
+with the real categories, written with write_compiled_bank and loaded through
+DMV_QUESTION_BANK exactly like a production build.
+
+The scripted journey covers section selection, a full test of ``--answers``
+questions, results, review and restart. Every ``AppTest.run`` is one rerun
+and is timed wall-clock, so the numbers include the harness's own overhead of
+building and diffing the element tree; compare runs made on the same machine
+rather than reading them as browser latencies.
+
+The JSON written with ``-o`` holds p50/p95/p99/max per phase and overall and
+the peak RSS per size. ``--compare`` checks a run against a saved one and
+exits with status 1 if any p95 grew by more than ``--tolerance``.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import resource
+except ImportError:  # not available on Windows; peak memory is then unreported
+    resource = None
+
+from .bank import QuestionBank
+from .compiled import write_compiled_bank
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+# Bank sizes run by default; "embedded" is the real question bank
+DEFAULT_SIZES = ('embedded', '1000', '10000', '100000')
+# Questions answered in the full-test part of the journey
+DEFAULT_ANSWERS = 150
+# Questions answered in section practice and stepped through in review
+SECTION_ANSWERS = 10
+REVIEW_STEPS = 10
+# Seconds one rerun may take before AppTest gives up
+RERUN_TIMEOUT = 120
+# Allowed relative p95 growth before --compare reports a regression
+DEFAULT_TOLERANCE = 0.25
+
+PERCENTILES = (50, 95, 99)
+
+_WORDS = ('vehicle', 'driver', 'lane', 'signal', 'speed', 'limit', 'pedestrian', 'crosswalk', 'yield',
+          'intersection', 'license', 'highway', 'parking', 'brake', 'mirror', 'turn', 'stop', 'sign',
+          'school', 'bus', 'emergency', 'right', 'left', 'passing', 'zone', 'curve', 'night', 'weather')
+
+
+def synthetic_questions(count: int, categories: Sequence[str], seed: int = 0) -> List[Dict]:
+    """Generate question dicts shaped like the real bank
+
+    Categories are assigned round-robin, every question has four options
+    and the text lengths are close to the real questions'.
+    """
+    rng = random.Random(seed)
+
+    def sentence(words: int) -> str:
+        return ' '.join(rng.choice(_WORDS) for _ in range(words)).capitalize()
+
+    return [
+        {
+            'id': i,
+            'category': categories[i % len(categories)],
+            'question': f"{sentence(rng.randint(8, 18))}?",
+            'options': [f"{sentence(rng.randint(2, 8))} ({i}.{option})" for option in range(4)],
+            'correct': rng.randrange(4),
+            'explanation': f"{sentence(rng.randint(10, 25))}.",
+        }
+        for i in range(count)
+    ]
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile of unsorted values"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def summarize(latencies: Sequence[float]) -> Dict:
+    """Count, mean, percentiles and max of latencies in milliseconds"""
+    summary = {'reruns': len(latencies)}
+    if latencies:
+        summary['mean_ms'] = round(sum(latencies) / len(latencies), 3)
+        for p in PERCENTILES:
+            summary[f'p{p}_ms'] = round(percentile(latencies, p), 3)
+        summary['max_ms'] = round(max(latencies), 3)
+    return summary
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class Journey:
+    """Scripted walk through app.py recording the latency of every rerun"""
+
+    def __init__(self, answers: int, seed: int = 0):
+        from streamlit.testing.v1 import AppTest
+        self.app = AppTest.from_file(APP_PATH, default_timeout=RERUN_TIMEOUT)
+        self.answers = answers
+        self.rng = random.Random(seed)
+        self.latencies: Dict[str, List[float]] = {}
+        self.phase = 'load'
+
+    def _run(self, element):
+        started = time.perf_counter()
+        element.run()
+        self.latencies.setdefault(self.phase, []).append(1000 * (time.perf_counter() - started))
+        if self.app.exception:
+            raise RuntimeError(f"app.py raised during {self.phase}: {self.app.exception[0].value}")
+
+    def _button(self, prefix: str):
+        for button in self.app.button:
+            if button.label.startswith(prefix):
+                return button
+        return None
+
+    def click(self, prefix: str):
+        button = self._button(prefix)
+        if button is None:
+            labels = [b.label for b in self.app.button]
+            raise RuntimeError(f"no {prefix!r} button during {self.phase}; buttons: {labels}")
+        self._run(button.click())
+
+    def answer_questions(self, count: int) -> int:
+        """Submit and continue past up to ``count`` questions; return how many"""
+        answered = 0
+        while answered < count:
+            submit = self._button("Submit Answer")
+            if submit is None:
+                # Between sections of a full test
+                if self._button("Continue to Next Section") is None:
+                    break
+                self.click("Continue to Next Section")
+                continue
+            radio = self.app.main.radio[0]
+            radio.set_value(self.rng.randrange(len(radio.options)))
+            self._run(submit.click())
+            answered += 1
+            if self._button("Continue to Next Question") is not None:
+                self.click("Continue to Next Question")
+        return answered
+
+    def run(self) -> int:
+        """Walk the whole journey; return the number of full-test answers"""
+        self._run(self.app)
+
+        self.phase = 'section'
+        self._run(self.app.button(key='section_0').click())
+        self.answer_questions(SECTION_ANSWERS)
+        self.click("📚 Back to Section Selection")
+
+        self.phase = 'full_test'
+        self.click("🚀 Start Full Practice Test")
+        answered = self.answer_questions(self.answers)
+
+        self.phase = 'results'
+        if self._button("🏁 View Results") is not None:
+            self.click("🏁 View Results")
+        else:
+            self.click("View Final Results")
+        self._run(self.app)
+
+        self.phase = 'review'
+        self.click("📝 Review Questions")
+        for _ in range(REVIEW_STEPS):
+            if self._button("Continue to Next Question") is None:
+                break
+            self.click("Continue to Next Question")
+
+        self.phase = 'restart'
+        self.click("🔄 Restart Test")
+        self._run(self.app)
+        return answered
+
+
+def run_one(bank_path: Optional[str], answers: int, workdir: str) -> Dict:
+    """Benchmark one bank in this process; call from a fresh interpreter"""
+    os.environ['DMV_QUESTION_BANK'] = bank_path or ''
+    os.environ['DMV_EVENT_LOG'] = os.path.join(workdir, 'answer_events.jsonl')
+    os.environ['DMV_PROGRESS_DB'] = os.path.join(workdir, 'progress.sqlite3')
+    os.environ['DMV_SESSION_BACKEND'] = ''
+
+    journey = Journey(answers)
+    started = time.perf_counter()
+    answered = journey.run()
+    elapsed = time.perf_counter() - started
+
+    all_latencies = [ms for phase in journey.latencies.values() for ms in phase]
+    return {
+        'answered': answered,
+        'seconds': round(elapsed, 3),
+        'overall': summarize(all_latencies),
+        'phases': {phase: summarize(latencies) for phase, latencies in journey.latencies.items()},
+        'peak_rss_bytes': _peak_rss_bytes(),
+    }
+
+
+def _benchmark_size(size: str, answers: int, workdir: str) -> Dict:
+    bank_path = None
+    if size != 'embedded':
+        from .question_data import build_question_sources
+        categories = QuestionBank.from_records(build_question_sources()).categories
+        bank_path = os.path.join(workdir, f'synthetic_{size}.dmvqb')
+        write_compiled_bank(QuestionBank.from_records(synthetic_questions(int(size), categories)), bank_path)
+
+    result_path = os.path.join(workdir, f'result_{size}.json')
+    command = [sys.executable, '-m', 'dmvquizzer.benchmark', '--run-one', bank_path or '',
+               '--answers', str(answers), '--workdir', workdir, '-o', result_path]
+    subprocess.run(command, check=True, cwd=os.path.dirname(APP_PATH))
+    with open(result_path, encoding='utf-8') as f:
+        result = json.load(f)
+    result['questions'] = size
+    if bank_path:
+        result['bank_bytes'] = os.path.getsize(bank_path)
+    return result
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """p95 latencies that grew by more than ``tolerance`` against a baseline"""
+    regressions = []
+    previous = {run['questions']: run for run in baseline['runs']}
+    for run in results['runs']:
+        before = previous.get(run['questions'])
+        if before is None:
+            continue
+        for phase, summary in [('overall', run['overall'])] + list(run['phases'].items()):
+            old = before['overall'] if phase == 'overall' else before['phases'].get(phase)
+            if not old or 'p95_ms' not in old or 'p95_ms' not in summary:
+                continue
+            if summary['p95_ms'] > old['p95_ms'] * (1 + tolerance):
+                regressions.append(f"{run['questions']} questions, {phase}: p95 "
+                                   f"{old['p95_ms']:.1f} ms -> {summary['p95_ms']:.1f} ms")
+    return regressions
+
+
+def _print_table(results: Dict):
+    print(f"{'questions':>10} {'phase':>10} {'reruns':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for run in results['runs']:
+        for phase, summary in list(run['phases'].items()) + [('overall', run['overall'])]:
+            print(f"{run['questions']:>10} {phase:>10} {summary['reruns']:7d} {summary['p50_ms']:9.1f} "
+                  f"{summary['p95_ms']:9.1f} {summary['p99_ms']:9.1f} {summary['max_ms']:9.1f}")
+        if run['peak_rss_bytes'] is not None:
+            print(f"{run['questions']:>10} peak RSS {run['peak_rss_bytes'] / 2 ** 20:.1f} MiB")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark app.py rerun latency with AppTest")
+    parser.add_argument('--sizes', default=','.join(DEFAULT_SIZES),
+                        help="comma-separated bank sizes; 'embedded' is the real bank (default: %(default)s)")
+    parser.add_argument('--answers', type=int, default=DEFAULT_ANSWERS,
+                        help="questions to answer in the full test (default: %(default)s)")
+    parser.add_argument('-o', '--output', help="write the results as JSON to this file")
+    parser.add_argument('--compare', metavar='BASELINE', help="results JSON from an earlier run to compare with")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed relative p95 growth against the baseline (default: %(default)s)")
+    parser.add_argument('--workdir', help="keep generated banks and logs here instead of a temporary directory")
+    parser.add_argument('--run-one', metavar='BANK', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_one is not None:
+        result = run_one(args.run_one or None, args.answers, args.workdir)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return 0
+
+    sizes = [size.strip() for size in args.sizes.split(',') if size.strip()]
+    invalid = [size for size in sizes if size != 'embedded' and not size.isdigit()]
+    if invalid:
+        parser.error(f"invalid bank sizes: {', '.join(invalid)}")
+
+    with tempfile.TemporaryDirectory(prefix='dmvquizzer-benchmark-') as tmp:
+        workdir = args.workdir or tmp
+        os.makedirs(workdir, exist_ok=True)
+        runs = []
+        for size in sizes:
+            print(f"benchmarking {size} questions...", file=sys.stderr)
+            runs.append(_benchmark_size(size, args.answers, workdir))
+
+    import streamlit
+    results = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'streamlit': streamlit.__version__,
+        'platform': platform.platform(),
+        'answers': args.answers,
+        'runs': runs,
+    }
+    _print_table(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
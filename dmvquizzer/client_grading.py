@@ -0,0 +1,87 @@
+"""
+Browser-side grading of a whole section, with batched answer sync
+
+The ``section_quiz`` component receives every question in a section together
+with its correct option and explanation, grades and explains each answer in
+the browser, and only sends answers back to the server in batches: every
+``batch_size`` answers, every ``sync_interval_ms`` and when the section is
+finished. Each batch carries an increasing ``seq`` so a rerun never applies
+the same batch twice.
+
+The answer key is sent to the browser, which is fine for a practice test but
+means this mode must not be used for anything graded for real.
+"""
+
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import streamlit.components.v1 as components
+
+from .bank import QuestionBank
+from .scoring import AnswerSheet
+
+_FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frontend', 'section_quiz')
+
+_section_quiz = components.declare_component('section_quiz', path=_FRONTEND_DIR)
+
+# Answers buffered in the browser before a sync is forced
+DEFAULT_BATCH_SIZE = 10
+
+# Milliseconds between timed syncs of whatever is buffered
+DEFAULT_SYNC_INTERVAL_MS = 30000
+
+
+def section_payload(bank: QuestionBank, order: Sequence[int]) -> List[Dict]:
+    """Questions of a section, in session order, as sent to the browser"""
+    return [
+        {
+            'idx': q_idx,
+            'question': bank.question_texts[q_idx],
+            'options': list(bank.options[q_idx]),
+            'correct': bank.correct[q_idx],
+            'explanation': bank.explanations[q_idx]
+        }
+        for q_idx in order
+    ]
+
+
+def accepted_answers(bank: QuestionBank, order: Iterable[int], batch: Dict) -> List[Tuple[int, Optional[int]]]:
+    """Return the ``(idx, choice)`` pairs of a synced batch that are valid here
+
+    Anything not in this section or outside a question's options is dropped,
+    since the batch comes from the browser.
+    """
+    allowed = set(order)
+    accepted = []
+    for entry in batch.get('answers') or ():
+        try:
+            q_idx, choice = int(entry[0]), entry[1]
+        except (TypeError, ValueError, IndexError):
+            continue
+        if q_idx not in allowed:
+            continue
+        if choice is not None and (type(choice) is not int or not 0 <= choice < len(bank.options[q_idx])):
+            continue
+        accepted.append((q_idx, choice))
+    return accepted
+
+
+def client_graded_section(bank: QuestionBank, order: Sequence[int], answers: AnswerSheet,
+                          synced_seq: int, key: str,
+                          batch_size: int = DEFAULT_BATCH_SIZE,
+                          sync_interval_ms: int = DEFAULT_SYNC_INTERVAL_MS) -> Optional[Dict]:
+    """Render the section quiz and return its latest batch, if any
+
+    The batch is ``{'seq', 'answers', 'done'}``; callers should ignore it unless
+    ``seq`` is greater than the last one they applied (``synced_seq``).
+    """
+    answered = {str(q_idx): answers[q_idx] for q_idx in order if q_idx in answers}
+    return _section_quiz(
+        questions=section_payload(bank, order),
+        answered=answered,
+        synced_seq=synced_seq,
+        batch_size=batch_size,
+        sync_interval_ms=sync_interval_ms,
+        key=key,
+        default=None
+    )
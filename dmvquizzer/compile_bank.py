@@ -0,0 +1,151 @@
+"""
+Validate question bank sources and compile them for the app
+
+Usage:
+    python -m dmvquizzer.compile_bank [--source FILE.json ...] [-o OUTPUT]
+
+Without ``--source`` the bank embedded in dmvquizzer.question_data is
+compiled. Each ``--source`` is a JSON list of question dicts in the same
+format; several files are concatenated in the order given. Nothing is written
+if validation fails. app.py loads the output from DEFAULT_BANK_PATH at
+startup when it exists, so validation never runs on the request path.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .bank import QuestionBank
+from .compiled import DEFAULT_BANK_PATH, open_compiled_bank, write_compiled_bank
+
+REQUIRED_FIELDS = {
+    'id': int,
+    'category': str,
+    'question': str,
+    'options': list,
+    'correct': int,
+    'explanation': str
+}
+
+# Option indices are stored in one byte, and 0xFF marks "unanswered"
+MAX_OPTIONS = 255
+
+
+def load_sources(paths: Sequence[str]) -> List[Dict]:
+    """Read question dicts from JSON files, or the embedded bank if none given"""
+    if not paths:
+        from .question_data import build_question_sources
+        return build_question_sources()
+    questions = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            questions.extend(json.load(f))
+    return questions
+
+
+def validate_questions(questions: Sequence[Dict], min_per_category: int = 1) -> Tuple[List[str], List[str]]:
+    """Check question dicts and return ``(errors, warnings)``"""
+    errors: List[str] = []
+    warnings: List[str] = []
+    seen_ids: Dict[int, int] = {}
+    texts = Counter()
+
+    for position, question in enumerate(questions):
+        label = f"question #{position} (id {question.get('id', '?')})"
+        problems = [
+            f"{label}: missing or non-{kind.__name__} '{field}'"
+            for field, kind in REQUIRED_FIELDS.items()
+            if not isinstance(question.get(field), kind) or isinstance(question.get(field), bool)
+        ]
+        if problems:
+            errors.extend(problems)
+            continue
+
+        if question['id'] < 0:
+            errors.append(f"{label}: id must be non-negative")
+        elif question['id'] in seen_ids:
+            errors.append(f"{label}: duplicate id, first used by question #{seen_ids[question['id']]}")
+        else:
+            seen_ids[question['id']] = position
+
+        options = question['options']
+        if len(options) < 2 or len(options) > MAX_OPTIONS:
+            errors.append(f"{label}: has {len(options)} options, expected 2 to {MAX_OPTIONS}")
+        if not all(isinstance(option, str) and option for option in options):
+            errors.append(f"{label}: options must be non-empty strings")
+        elif len(set(options)) != len(options):
+            warnings.append(f"{label}: repeats an option")
+        if not 0 <= question['correct'] < len(options):
+            errors.append(f"{label}: correct answer {question['correct']} is outside its {len(options)} options")
+        texts[question['question']] += 1
+
+    category_counts = Counter(q.get('category') for q in questions)
+    for category, count in category_counts.items():
+        if count < min_per_category:
+            errors.append(f"category {category!r} has {count} questions, expected at least {min_per_category}")
+
+    repeated = sum(count for count in texts.values() if count > 1)
+    if repeated:
+        warnings.append(f"{repeated} questions share their text with another question")
+    return errors, warnings
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Validate and compile the DMV question bank")
+    parser.add_argument('--source', action='append', default=[], metavar='FILE',
+                        help="JSON list of question dicts (default: the embedded bank)")
+    parser.add_argument('-o', '--output', default=DEFAULT_BANK_PATH,
+                        help=f"compiled bank to write (default: {DEFAULT_BANK_PATH})")
+    parser.add_argument('--min-per-category', type=int, default=1,
+                        help="fail if a category has fewer questions than this")
+    parser.add_argument('--check', action='store_true',
+                        help="only validate; do not write the compiled bank")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    questions = load_sources(args.source)
+    loaded = time.perf_counter()
+    errors, warnings = validate_questions(questions, args.min_per_category)
+    validated = time.perf_counter()
+
+    for warning in warnings:
+        print(f"warning: {warning}", file=sys.stderr)
+    for error in errors:
+        print(f"error: {error}", file=sys.stderr)
+    if errors:
+        print(f"{len(errors)} error(s); nothing written", file=sys.stderr)
+        return 1
+
+    bank = QuestionBank.from_records(questions)
+    print(f"{len(bank)} questions in {len(bank.categories)} categories")
+    for category in bank.categories:
+        print(f"  {len(bank.category_index[category]):6d}  {category}")
+    print(f"load      {1000 * (loaded - started):8.1f} ms")
+    print(f"validate  {1000 * (validated - loaded):8.1f} ms")
+    if args.check:
+        return 0
+
+    content_hash = write_compiled_bank(bank, args.output)
+    written = time.perf_counter()
+
+    # Read the artifact back exactly as the app will, and compare every row
+    compiled = open_compiled_bank(args.output, verify=True)
+    if any(dict(a) != dict(b) for a, b in zip(bank, compiled)) or len(compiled) != len(bank):
+        print("error: compiled bank does not round-trip", file=sys.stderr)
+        return 1
+    checked = time.perf_counter()
+
+    size = os.path.getsize(args.output)
+    print(f"compile   {1000 * (written - validated):8.1f} ms")
+    print(f"verify    {1000 * (checked - written):8.1f} ms")
+    print(f"wrote {args.output}")
+    print(f"  {size} bytes ({size / max(len(bank), 1):.0f} bytes/question), sha256 {content_hash}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+Compiled on-disk question bank format
+
+A compiled bank is a single little-endian file laid out as:
+
+    header   magic, question count, category count, SHA-256 of everything
+             after the header, and the start offset of each section
+    categories       category names, UTF-8, NUL separated
+    ids              u32[count]
+    category_codes   u16[count]
+    correct          u8[count]
+    text_offsets     u32[3 * count + 1], start of each question's text,
+                     options and explanation within ``text``
+    text             UTF-8 blob; options are NUL separated
+
+Sections start on 8-byte boundaries. ``open_compiled_bank`` memory-maps the
+file and wraps the numeric sections as zero-copy columns, so startup cost does
+not depend on bank size beyond building the category index, and worker
+processes share the pages through the OS page cache. Question text, options
+and explanations are only decoded when a row is read.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import Sequence
+from typing import List, Tuple, Union
+
+from .bank import QuestionBank
+
+MAGIC = b'DMVQBNK1'
+
+# Where dmvquizzer.compile_bank writes by default and app.py looks first
+DEFAULT_BANK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 'question_bank.dmvqb')
+
+SECTIONS = ('categories', 'ids', 'category_codes', 'correct', 'text_offsets', 'text')
+
+# magic, question count, category count, content hash, section offsets
+_HEADER = struct.Struct(f'<8sII32s{len(SECTIONS)}Q')
+
+_ALIGNMENT = 8
+
+# Text fields stored per question, in order, in text_offsets
+_QUESTION, _OPTIONS, _EXPLANATION = range(3)
+
+_OPTION_SEPARATOR = b'\0'
+
+
+class CompiledBankError(ValueError):
+    """Raised when a compiled question bank file is malformed"""
+
+
+class _TextColumn(Sequence):
+    """Sequence of one text field, decoded from the blob on access"""
+
+    __slots__ = ('_offsets', '_text', '_field', '_count')
+
+    def __init__(self, offsets, text: memoryview, field: int, count: int):
+        self._offsets = offsets
+        self._text = text
+        self._field = field
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _raw(self, idx: int) -> bytes:
+        if idx < 0:
+            idx += self._count
+        if not 0 <= idx < self._count:
+            raise IndexError("question index out of range")
+        slot = 3 * idx + self._field
+        return bytes(self._text[self._offsets[slot]:self._offsets[slot + 1]])
+
+    def __getitem__(self, idx: int) -> str:
+        return self._raw(idx).decode('utf-8')
+
+
+class _OptionsColumn(_TextColumn):
+    """Sequence of option tuples, decoded from the blob on access"""
+
+    __slots__ = ()
+
+    def __getitem__(self, idx: int) -> Tuple[str, ...]:
+        return tuple(option.decode('utf-8') for option in self._raw(idx).split(_OPTION_SEPARATOR))
+
+
+def _pad(buffer: bytearray):
+    buffer.extend(b'\0' * (-len(buffer) % _ALIGNMENT))
+
+
+def _encode_options(options: Tuple[str, ...], question_id: int) -> bytes:
+    encoded = [option.encode('utf-8') for option in options]
+    if any(_OPTION_SEPARATOR in option for option in encoded):
+        raise CompiledBankError(f"an option of question {question_id} contains a NUL byte")
+    return _OPTION_SEPARATOR.join(encoded)
+
+
+def encode_bank(bank: QuestionBank) -> bytes:
+    """Serialize a question bank to the compiled format"""
+    count = len(bank)
+    offsets = array('I', [0])
+    text = bytearray()
+    for idx in range(count):
+        text += bank.question_texts[idx].encode('utf-8')
+        offsets.append(len(text))
+        text += _encode_options(bank.options[idx], bank.ids[idx])
+        offsets.append(len(text))
+        text += bank.explanations[idx].encode('utf-8')
+        offsets.append(len(text))
+
+    sections = {
+        'categories': _OPTION_SEPARATOR.join(c.encode('utf-8') for c in bank.categories),
+        'ids': array('I', bank.ids),
+        'category_codes': array('H', bank.category_codes),
+        'correct': array('B', bank.correct),
+        'text_offsets': offsets,
+        'text': bytes(text),
+    }
+
+    body = bytearray()
+    starts: List[int] = []
+    for name in SECTIONS:
+        _pad(body)
+        starts.append(_HEADER.size + len(body))
+        data = sections[name]
+        if isinstance(data, array):
+            if sys.byteorder != 'little':
+                data = array(data.typecode, data)
+                data.byteswap()
+            data = data.tobytes()
+        body += data
+
+    digest = hashlib.sha256(body).digest()
+    header = _HEADER.pack(MAGIC, count, len(bank.categories), digest, *starts)
+    return header + bytes(body)
+
+
+def write_compiled_bank(bank: QuestionBank, path: str) -> str:
+    """Write a compiled bank to ``path`` and return its content hash
+
+    The bank is written to a temporary file in the same directory and renamed
+    over ``path``, so processes that have the old file memory-mapped keep
+    reading the old inode instead of a truncated one.
+    """
+    data = encode_bank(bank)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file private to its owner; the bank is not secret
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return _read_header(data)[2].hex()
+
+
+def _read_header(buffer) -> Tuple[int, int, bytes, Tuple[int, ...]]:
+    if len(buffer) < _HEADER.size:
+        raise CompiledBankError("file is too short to be a compiled question bank")
+    magic, count, n_categories, digest, *starts = _HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise CompiledBankError("not a compiled question bank (bad magic)")
+    return count, n_categories, digest, tuple(starts)
+
+
+def read_content_hash(path: str) -> str:
+    """Read a compiled bank's content hash without loading the bank"""
+    with open(path, 'rb') as f:
+        return _read_header(f.read(_HEADER.size))[2].hex()
+
+
+def _numeric_column(section: memoryview, typecode: str) -> Union[memoryview, array]:
+    if sys.byteorder == 'little':
+        return section.cast(typecode)
+    values = array(typecode, bytes(section))
+    values.byteswap()
+    return values
+
+
+def open_compiled_bank(path: str, verify: bool = False) -> QuestionBank:
+    """Memory-map a compiled bank file and return it as a QuestionBank
+
+    With ``verify`` the whole file is hashed and compared to the stored content
+    hash first, which reads every page; leave it off on the serving path.
+    """
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    buffer = memoryview(mapped)
+    count, n_categories, digest, starts = _read_header(buffer)
+    if verify and hashlib.sha256(buffer[_HEADER.size:]).digest() != digest:
+        raise CompiledBankError("content hash does not match file contents")
+
+    ends = starts[1:] + (len(buffer),)
+    section = {name: buffer[start:end] for name, start, end in zip(SECTIONS, starts, ends)}
+
+    categories = tuple(bytes(section['categories']).rstrip(b'\0').decode('utf-8').split('\0'))
+    if len(categories) != n_categories:
+        raise CompiledBankError("category table does not match header")
+
+    ids = _numeric_column(section['ids'][:4 * count], 'I')
+    category_codes = _numeric_column(section['category_codes'][:2 * count], 'H')
+    correct = _numeric_column(section['correct'][:count], 'B')
+    offsets = _numeric_column(section['text_offsets'][:4 * (3 * count + 1)], 'I')
+    text = section['text']
+
+    return QuestionBank(
+        ids, categories, category_codes, correct,
+        _TextColumn(offsets, text, _QUESTION, count),
+        _OptionsColumn(offsets, text, _OPTIONS, count),
+        _TextColumn(offsets, text, _EXPLANATION, count),
+        content_hash=digest.hex()
+    )
@@ -0,0 +1,169 @@
+"""
+Weak-area drill: sample questions in proportion to how often they are missed
+
+A question's weight is its category's smoothed error rate times its own, with
+unseen questions counting as 50% missed. Weights live in a three-level tree of
+Walker alias tables (categories, fixed-size blocks of each category's
+questions, questions within a block), so every draw is three O(1) lookups.
+Recording an answer only rebuilds the tables on the path from that question
+to the root, O(BLOCK_SIZE + category size / BLOCK_SIZE + categories), rather
+than the whole bank.
+"""
+
+import random
+from array import array
+from bisect import bisect_left
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from .bank import QuestionBank
+
+# Questions per leaf alias table
+BLOCK_SIZE = 64
+
+# Draws to spend avoiding an immediate repeat of the previous question
+_REPEAT_RETRIES = 4
+
+
+class AliasTable:
+    """Walker/Vose alias table over fixed weights, for O(1) weighted draws"""
+
+    __slots__ = ('probability', 'alias')
+
+    def __init__(self, weights: Sequence[float]):
+        n = len(weights)
+        total = sum(weights)
+        self.probability = array('d', [1.0]) * n
+        self.alias = array('I', range(n))
+        if not total:
+            return
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large[-1]
+            self.probability[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            if scaled[l] < 1.0:
+                small.append(large.pop())
+        # Whatever is left is 1 up to rounding error
+        for i in small + large:
+            self.probability[i] = 1.0
+
+    def sample(self, rng: random.Random) -> int:
+        u = rng.random() * len(self.alias)
+        i = int(u)
+        return i if u - i < self.probability[i] else self.alias[i]
+
+
+def _error_rate(wrong: int, seen: int) -> float:
+    # Laplace smoothing: unseen counts as 50% missed, one miss as 67%
+    return (wrong + 1) / (seen + 2)
+
+
+class WeakAreaDrill:
+    """Draws bank questions weighted towards the learner's weak spots
+
+    Implements the app's practice-mode interface (next_question, record,
+    status). ``history`` seeds the error rates with earlier
+    ``(q_idx, correct)`` answers; ``drilled`` and ``drilled_correct`` count
+    per category only the answers recorded during the drill.
+    """
+
+    __slots__ = ('bank', 'rng', 'seen', 'wrong', 'category_seen', 'category_wrong',
+                 'blocks', 'block_weights', 'block_tables', 'category_tables', 'top', 'answered',
+                 'drilled', 'drilled_correct', '_last')
+
+    done_message = "🎉 No questions left to drill!"
+
+    def __init__(self, bank: QuestionBank, seed: int, history: Iterable[Tuple[int, bool]] = ()):
+        self.bank = bank
+        self.rng = random.Random(seed)
+        self.seen = array('H', [0]) * len(bank)
+        self.wrong = array('H', [0]) * len(bank)
+        self.category_seen = [0] * len(bank.categories)
+        self.category_wrong = [0] * len(bank.categories)
+        self.answered = 0
+        self.drilled = [0] * len(bank.categories)
+        self.drilled_correct = [0] * len(bank.categories)
+        self._last: Optional[int] = None
+        for q_idx, correct in history:
+            self._count(q_idx, correct)
+
+        # blocks[c][k]: bank indices in block k of category c
+        self.blocks: List[List[Sequence[int]]] = []
+        self.block_weights: List[array] = []
+        self.block_tables: List[List[AliasTable]] = []
+        self.category_tables: List[AliasTable] = []
+        for category in bank.categories:
+            indices = bank.category_index[category]
+            blocks = [indices[k:k + BLOCK_SIZE] for k in range(0, len(indices), BLOCK_SIZE)]
+            tables = [AliasTable([self._question_weight(j) for j in block]) for block in blocks]
+            weights = array('d', [sum(self._question_weight(j) for j in block) for block in blocks])
+            self.blocks.append(blocks)
+            self.block_tables.append(tables)
+            self.block_weights.append(weights)
+            self.category_tables.append(AliasTable(weights))
+        self.top = self._build_top()
+
+    def _count(self, q_idx: int, correct: bool):
+        code = self.bank.category_codes[q_idx]
+        self.seen[q_idx] = min(self.seen[q_idx] + 1, 0xFFFF)
+        self.category_seen[code] += 1
+        if not correct:
+            self.wrong[q_idx] = min(self.wrong[q_idx] + 1, 0xFFFF)
+            self.category_wrong[code] += 1
+        self.answered += 1
+
+    def _question_weight(self, q_idx: int) -> float:
+        return _error_rate(self.wrong[q_idx], self.seen[q_idx])
+
+    def _build_top(self) -> AliasTable:
+        return AliasTable([
+            _error_rate(self.category_wrong[c], self.category_seen[c]) * sum(self.block_weights[c])
+            for c in range(len(self.bank.categories))
+        ])
+
+    def _draw(self) -> int:
+        c = self.top.sample(self.rng)
+        k = self.category_tables[c].sample(self.rng)
+        return self.blocks[c][k][self.block_tables[c][k].sample(self.rng)]
+
+    def next_question(self, now: float) -> Optional[int]:
+        """Draw a question, avoiding the one just asked when possible"""
+        if not len(self.bank):
+            return None
+        q_idx = self._draw()
+        for _ in range(_REPEAT_RETRIES):
+            if q_idx != self._last:
+                break
+            q_idx = self._draw()
+        self._last = q_idx
+        return q_idx
+
+    def record(self, q_idx: int, correct: bool, now: float):
+        """Count an answer and rebuild the alias tables above the question"""
+        self._count(q_idx, correct)
+        c = self.bank.category_codes[q_idx]
+        self.drilled[c] += 1
+        self.drilled_correct[c] += correct
+        position = bisect_left(self.bank.category_index[self.bank.categories[c]], q_idx)
+        k = position // BLOCK_SIZE
+        block = self.blocks[c][k]
+        weights = [self._question_weight(j) for j in block]
+        self.block_tables[c][k] = AliasTable(weights)
+        self.block_weights[c][k] = sum(weights)
+        self.category_tables[c] = AliasTable(self.block_weights[c])
+        self.top = self._build_top()
+
+    def status(self, now: float) -> str:
+        """One-line summary for the sidebar"""
+        if not self.answered:
+            return "Questions are drawn evenly until you answer some"
+        rates = [_error_rate(w, s) for w, s in zip(self.category_wrong, self.category_seen)]
+        weakest = max(range(len(rates)), key=rates.__getitem__)
+        name = self.bank.categories[weakest]
+        if not self.category_seen[weakest]:
+            return f"{self.answered} answered, focusing on {name} (not tried yet)"
+        missed = self.category_wrong[weakest] / self.category_seen[weakest]
+        return f"{self.answered} answered, focusing on {name} ({missed:.0%} missed)"
@@ -0,0 +1,199 @@
+"""
+Headless quiz state machine
+
+QuizEngine owns everything about a section or full test that is not
+presentation: the per-session shuffled order, the position, the answers and
+scoring. app.py keeps one engine per Streamlit session and only renders it;
+benchmarks, load generators and other frontends can drive the same engine
+without a browser.
+"""
+
+import random
+from array import array
+from typing import Dict, Optional, Sequence, Tuple
+
+from .bank import QuestionBank, QuestionView
+from .scoring import PASS_PERCENTAGE, AnswerSheet
+
+# How an engine remembers its shuffled question order:
+#   "seed"        - one integer; category orders come from the bank's LRU cache
+#   "permutation" - the shuffled bank indices of every category
+# Both produce the same order for the same seed.
+SHUFFLE_STATES = ('seed', 'permutation')
+
+
+class QuizEngine:
+    """One learner's walk through a section or the full test
+
+    In a full test ``current_category`` moves through ``bank.categories``;
+    with ``selected_section`` set only that section is asked.
+    ``current_question`` is the position within the current section's
+    shuffled order.
+
+    Scores can be restricted to a subset of the bank with ``scope``: any
+    object with a ``mask`` of bank indices, per-category ``seats`` and a
+    length, such as an ExamSimulation.
+    """
+
+    __slots__ = ('bank', 'shuffle_state', 'answers', 'current_category', 'current_question',
+                 'selected_section', 'test_started', 'show_results', 'shuffle_seed', '_orders')
+
+    def __init__(self, bank: QuestionBank, shuffle_state: str = 'seed', seed: Optional[int] = None):
+        if shuffle_state not in SHUFFLE_STATES:
+            raise ValueError(f"shuffle_state must be one of {SHUFFLE_STATES}")
+        self.bank = bank
+        self.shuffle_state = shuffle_state
+        self.reset(seed)
+
+    # Shuffling
+
+    def shuffle(self, seed: Optional[int] = None):
+        """Randomize question order within each category
+
+        Passing a seed replays the exact order of a previous session.
+        """
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.shuffle_seed = seed
+        self._orders = None
+        if self.shuffle_state == 'permutation':
+            self._orders = {
+                category: array('I', self.bank.shuffled_order(category, seed))
+                for category in self.bank.categories
+            }
+
+    def category_order(self, category: str) -> Sequence[int]:
+        """This engine's question order for a category"""
+        if self._orders is not None:
+            return self._orders[category]
+        return self.bank.shuffled_order(category, self.shuffle_seed)
+
+    # State transitions
+
+    def reset(self, seed: Optional[int] = None):
+        """Clear answers and position and shuffle again"""
+        self.answers = AnswerSheet(len(self.bank))
+        self.current_category = 0
+        self.current_question = 0
+        self.selected_section: Optional[str] = None
+        self.test_started = False
+        self.show_results = False
+        self.shuffle(seed)
+
+    def start(self, section: Optional[str] = None):
+        """Start the full test, or practice of one section"""
+        self.selected_section = section
+        if section is not None:
+            self.current_category = self.bank.categories.index(section)
+            self.current_question = 0
+        self.test_started = True
+        self.show_results = False
+
+    def restore(self, answers: AnswerSheet, current_category: int, current_question: int,
+                selected_section: Optional[str], shuffle_seed: int,
+                test_started: bool = True, show_results: bool = False):
+        """Put the engine back into a saved state"""
+        self.answers = answers
+        self.current_category = current_category
+        self.current_question = current_question
+        self.selected_section = selected_section
+        if shuffle_seed != self.shuffle_seed or (self.shuffle_state == 'permutation' and self._orders is None):
+            self.shuffle(shuffle_seed)
+        self.test_started = test_started
+        self.show_results = show_results
+
+    @property
+    def section(self) -> str:
+        """Name of the section being asked"""
+        return self.selected_section or self.bank.categories[self.current_category]
+
+    def section_order(self) -> Sequence[int]:
+        """Shuffled bank indices of the section being asked"""
+        return self.category_order(self.section)
+
+    def current(self) -> Optional[Tuple[int, QuestionView]]:
+        """``(bank index, question)`` at the current position, or None past the end"""
+        if not self.test_started:
+            return None
+        order = self.section_order()
+        if self.current_question < len(order):
+            q_idx = order[self.current_question]
+            return q_idx, self.bank[q_idx]
+        return None
+
+    def answer(self, q_idx: int, choice: Optional[int]) -> Optional[bool]:
+        """Record an answer; return its correctness, or None if already answered"""
+        if q_idx in self.answers:
+            return None
+        is_correct = choice == self.bank.correct[q_idx]
+        self.answers.record(q_idx, choice, is_correct)
+        return is_correct
+
+    def advance(self) -> bool:
+        """Move past the current question; return False if that left the section"""
+        if self.current_question < len(self.section_order()) - 1:
+            self.current_question += 1
+            return True
+        if self.selected_section:
+            # Section practice ends with the section
+            self.show_results = True
+        elif self.current_category < len(self.bank.categories) - 1:
+            self.next_section()
+        else:
+            self.show_results = True
+        return False
+
+    def back(self) -> bool:
+        """Go to the previous question in the section, if there is one"""
+        if self.current_question > 0:
+            self.current_question -= 1
+            return True
+        return False
+
+    def jump_to_category(self, category: int):
+        """Go to the first question of a category (full test only)"""
+        self.current_category = category
+        self.current_question = 0
+
+    def next_section(self):
+        """Go to the first question of the next category"""
+        self.jump_to_category(self.current_category + 1)
+
+    def finish(self):
+        """End the attempt and show results"""
+        self.show_results = True
+
+    # Scoring
+
+    def score(self, scope=None) -> Dict:
+        """Overall score; questions outside ``scope`` are ignored"""
+        mask = scope.mask if scope is not None else None
+        total_questions = len(scope) if scope is not None else len(self.bank)
+        answered = self.answers.count_answered(mask)
+        correct_answers = self.answers.count_correct(mask)
+
+        score_percentage = (correct_answers / total_questions) * 100 if total_questions > 0 else 0
+        return {
+            'total': total_questions,
+            'correct': correct_answers,
+            'incorrect': answered - correct_answers,
+            'unanswered': total_questions - answered,
+            'percentage': score_percentage,
+            'passed': score_percentage >= PASS_PERCENTAGE
+        }
+
+    def category_stats(self, scope=None) -> Dict[str, Dict]:
+        """Per-category totals, correct and answered counts"""
+        category_stats = {}
+        for category_name, indices in self.bank.category_index.items():
+            mask = self.bank.category_masks[category_name]
+            if scope is not None:
+                mask &= scope.mask
+            stats = {
+                'total': scope.seats[category_name] if scope is not None else len(indices),
+                'correct': self.answers.count_correct(mask),
+                'answered': self.answers.count_answered(mask)
+            }
+            stats['percentage'] = int((stats['correct'] / stats['total']) * 100) if stats['total'] > 0 else 0
+            category_stats[category_name] = stats
+        return category_stats
@@ -0,0 +1,123 @@
+"""
+Append-only log of answer events, written off the request path
+
+``EventLog.emit`` puts an event on a bounded in-memory queue and returns
+immediately; if the queue is full the event is dropped and counted rather
+than blocking the submit. A daemon thread drains the queue in batches,
+appends them to a JSON-lines file and fsyncs at most every FSYNC_INTERVAL
+seconds. Each line is one answer:
+
+    {"ts": 1760000000.123, "session": "…", "question_id": 12, "choice": 1,
+     "correct": true, "latency_ms": 5400, "seed": 1234567}
+
+``choice`` is null for a submit with nothing selected and ``latency_ms`` is
+null when the time the question was shown is unknown. ``seed`` is the
+session's shuffle seed, so a reported session can be replayed in the same
+question order; it is null in logs written before it was added. Every submit is logged,
+so a session can answer the same question more than once. The format is what
+``dmvquizzer.adaptive`` calibrates from.
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from typing import Iterator, NamedTuple, Optional
+
+# Where app.py logs answers unless DMV_EVENT_LOG says otherwise
+DEFAULT_EVENT_LOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                      'answer_events.jsonl')
+
+# Events held in memory before new ones are dropped
+QUEUE_SIZE = 65536
+# Most events written per batch
+BATCH_SIZE = 1024
+# Seconds between fsyncs while events keep arriving
+FSYNC_INTERVAL = 1.0
+
+_STOP = object()
+
+
+class AnswerEvent(NamedTuple):
+    """One submitted answer"""
+    ts: float
+    session: str
+    question_id: int
+    choice: Optional[int]
+    correct: bool
+    latency_ms: Optional[int]
+    seed: Optional[int] = None
+
+
+def encode_event(event: AnswerEvent) -> str:
+    return json.dumps(event._asdict(), separators=(',', ':')) + '\n'
+
+
+def read_events(path: str) -> Iterator[AnswerEvent]:
+    """Stream the events in a log file, one line at a time"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield AnswerEvent(**json.loads(line))
+
+
+class EventLog:
+    """Process-wide answer log with a background writer thread"""
+
+    def __init__(self, path: str, queue_size: int = QUEUE_SIZE):
+        self.path = path
+        self.dropped = 0
+        self.written = 0
+        self._queue: 'queue.Queue' = queue.Queue(maxsize=queue_size)
+        self._file = open(path, 'a', encoding='utf-8')
+        self._writer = threading.Thread(target=self._run, name='dmvquizzer-event-log', daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def emit(self, event: AnswerEvent):
+        """Queue an event for writing; never blocks"""
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        last_sync = time.monotonic()
+        unsynced = False
+        while True:
+            try:
+                # Wake up now and then so a quiet log still gets its fsync
+                first = self._queue.get(timeout=FSYNC_INTERVAL)
+            except queue.Empty:
+                first = None
+            batch = [] if first is None else [first]
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = any(event is _STOP for event in batch)
+            events = [event for event in batch if event is not _STOP]
+            if events:
+                self._file.write(''.join(encode_event(event) for event in events))
+                self._file.flush()
+                self.written += len(events)
+                unsynced = True
+            if unsynced and (stopping or time.monotonic() - last_sync >= FSYNC_INTERVAL):
+                os.fsync(self._file.fileno())
+                last_sync = time.monotonic()
+                unsynced = False
+            if stopping:
+                self._file.close()
+                return
+
+    def close(self):
+        """Write out everything queued so far and stop the writer"""
+        if not self._writer.is_alive():
+            return
+        # Blocking is fine here: close runs at shutdown, not on a submit
+        self._queue.put(_STOP)
+        self._writer.join()
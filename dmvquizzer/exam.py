@@ -0,0 +1,101 @@
+"""
+Fixed-length exam simulation drawn as a stratified sample of the bank
+
+Like the real knowledge test, an exam is a short sample of EXAM_LENGTH
+questions scored against the usual pass mark. Seats are shared out between
+categories in proportion to their weights (largest remainder), each category's
+questions are drawn with Floyd's algorithm, and the result is shuffled, so
+building an exam costs O(length + categories) whatever the bank size.
+"""
+
+import random
+from array import array
+from typing import Dict, Mapping, Optional
+
+from .bank import QuestionBank
+
+# Questions on the New Jersey knowledge test
+EXAM_LENGTH = 50
+
+
+def allocate_seats(sizes: Mapping[str, int], weights: Mapping[str, float], length: int) -> Dict[str, int]:
+    """Share ``length`` questions between categories in proportion to ``weights``
+
+    Uses the largest remainder method, and never gives a category more seats
+    than it has questions.
+    """
+    seats = {category: 0 for category in sizes}
+    remaining = min(length, sum(sizes.values()))
+    while remaining:
+        open_categories = [c for c in sizes if seats[c] < sizes[c] and weights.get(c, 0) > 0]
+        if not open_categories:
+            break
+        total = sum(weights[c] for c in open_categories)
+        quotas = {c: remaining * weights[c] / total for c in open_categories}
+        granted = 0
+        for c in open_categories:
+            extra = min(int(quotas[c]), sizes[c] - seats[c])
+            seats[c] += extra
+            granted += extra
+        by_remainder = sorted(open_categories, key=lambda c: quotas[c] - int(quotas[c]), reverse=True)
+        for c in by_remainder:
+            if granted == remaining:
+                break
+            if seats[c] < sizes[c]:
+                seats[c] += 1
+                granted += 1
+        remaining -= granted
+    return seats
+
+
+class ExamSimulation:
+    """One fixed-length exam: the drawn questions, asked in order
+
+    Implements the app's practice-mode interface (next_question, record,
+    status). ``mask`` has a bit set for every question on the exam, so an
+    AnswerSheet can score just this exam.
+    """
+
+    __slots__ = ('order', 'mask', 'seats', 'position')
+
+    done_message = "🏁 Exam finished!"
+
+    def __init__(self, bank: QuestionBank, seed: int, length: int = EXAM_LENGTH,
+                 weights: Optional[Mapping[str, float]] = None):
+        sizes = {category: len(indices) for category, indices in bank.category_index.items()}
+        # By default every question in the bank is equally likely to appear
+        self.seats = allocate_seats(sizes, weights or sizes, length)
+
+        rng = random.Random(seed)
+        order = []
+        for category, count in self.seats.items():
+            indices = bank.category_index[category]
+            # Floyd's algorithm: ``count`` distinct positions in O(count)
+            chosen = set()
+            for j in range(len(indices) - count, len(indices)):
+                t = rng.randint(0, j)
+                chosen.add(j if t in chosen else t)
+            order.extend(indices[position] for position in chosen)
+        rng.shuffle(order)
+
+        self.order = array('I', order)
+        self.mask = 0
+        for q_idx in order:
+            self.mask |= 1 << q_idx
+        self.position = 0
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def next_question(self, now: float) -> Optional[int]:
+        """The next unanswered exam question, or None once all are answered"""
+        return self.order[self.position] if self.position < len(self.order) else None
+
+    def record(self, q_idx: int, correct: bool, now: float):
+        """Move past the question just answered"""
+        if self.position < len(self.order) and self.order[self.position] == q_idx:
+            self.position += 1
+
+    def status(self, now: float) -> str:
+        """One-line summary for the sidebar"""
+        return f"{self.position} of {len(self.order)} questions answered"
@@ -0,0 +1,108 @@
+"""
+Offline batch grading of many quiz attempts with NumPy
+
+Attempts are a matrix with one row per attempt and one column per bank
+question, holding the chosen option index, ``UNANSWERED`` or ``BLANK`` for a
+question submitted with nothing selected, which counts as answered and
+incorrect. ``AnswerSheet.choices`` stores blank submits as ``UNANSWERED`` and
+tells them apart only through its ``answered`` bitset, so live sessions go
+through ``stack_answer_sheets``, which marks them ``BLANK``.
+"""
+
+from typing import Dict
+
+from .bank import QuestionBank
+from .scoring import PASS_PERCENTAGE, UNANSWERED
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional for the app, required here
+    np = None
+
+# A blank submit in an attempts matrix; never a valid option index
+BLANK = 0xFE
+
+# Rows graded per step; bounds temporary memory for very large attempt sets
+DEFAULT_CHUNK_ROWS = 65536
+
+
+def grade_attempts(bank: QuestionBank, attempts, answer_key=None,
+                   chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Dict:
+    """Grade an attempts x questions matrix against the bank's answer key
+
+    ``attempts`` may be any 2-D array-like, including an ``np.memmap`` of an
+    exported attempt set; it is graded ``chunk_rows`` rows at a time. Pass
+    ``answer_key`` to regrade against a corrected key instead of
+    ``bank.correct``.
+
+    Returns a dict shaped like ``calculate_score()`` in app.py, with one
+    entry per attempt in each array, plus per-category matrices whose columns
+    follow ``bank.categories``.
+    """
+    if np is None:
+        raise ImportError("NumPy is required for batch grading")
+
+    attempts = np.asarray(attempts)
+    total_questions = len(bank)
+    if attempts.ndim != 2 or attempts.shape[1] != total_questions:
+        raise ValueError(
+            f"attempts must have shape (n_attempts, {total_questions}), got {attempts.shape}"
+        )
+
+    key = bank.as_numpy('correct') if answer_key is None else np.asarray(answer_key, dtype=np.uint8)
+    if key.shape != (total_questions,):
+        raise ValueError(f"answer_key must have {total_questions} entries, got {key.shape}")
+
+    # One-hot question -> category matrix; a matmul then sums per category
+    codes = bank.as_numpy('category_codes')
+    membership = np.zeros((total_questions, len(bank.categories)), dtype=np.int32)
+    membership[np.arange(total_questions), codes] = 1
+
+    n_attempts = attempts.shape[0]
+    correct = np.empty(n_attempts, dtype=np.int32)
+    answered = np.empty(n_attempts, dtype=np.int32)
+    category_correct = np.empty((n_attempts, len(bank.categories)), dtype=np.int32)
+    category_answered = np.empty_like(category_correct)
+
+    for start in range(0, n_attempts, chunk_rows):
+        stop = min(start + chunk_rows, n_attempts)
+        chunk = attempts[start:stop]
+        chunk_answered = (chunk != UNANSWERED).astype(np.int32)
+        chunk_correct = (chunk == key).astype(np.int32)
+        correct[start:stop] = chunk_correct.sum(axis=1)
+        answered[start:stop] = chunk_answered.sum(axis=1)
+        category_correct[start:stop] = chunk_correct @ membership
+        category_answered[start:stop] = chunk_answered @ membership
+
+    percentage = correct * (100.0 / total_questions) if total_questions > 0 else np.zeros(n_attempts)
+    return {
+        'total': total_questions,
+        'correct': correct,
+        'incorrect': answered - correct,
+        'unanswered': total_questions - answered,
+        'percentage': percentage,
+        'passed': percentage >= PASS_PERCENTAGE,
+        'categories': bank.categories,
+        'category_total': membership.sum(axis=0),
+        'category_correct': category_correct,
+        'category_answered': category_answered
+    }
+
+
+def stack_answer_sheets(sheets):
+    """Stack AnswerSheet objects into an attempts matrix for grade_attempts
+
+    Questions in a sheet's ``answered`` bitset without a stored choice are
+    marked ``BLANK``.
+    """
+    if np is None:
+        raise ImportError("NumPy is required for batch grading")
+    rows = []
+    for sheet in sheets:
+        row = np.frombuffer(sheet.choices, dtype=np.uint8).copy()
+        width = (len(row) + 7) // 8
+        answered = np.unpackbits(np.frombuffer(sheet.answered.to_bytes(width, 'little'), dtype=np.uint8),
+                                 bitorder='little')[:len(row)].astype(bool)
+        row[answered & (row == UNANSWERED)] = BLANK
+        rows.append(row)
+    return np.vstack(rows)
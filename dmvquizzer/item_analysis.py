@@ -0,0 +1,222 @@
+"""
+Streaming item analysis over answer-event logs
+
+Usage:
+    python -m dmvquizzer.item_analysis LOG [LOG ...] [-o REPORT.jsonl]
+
+Reads logs written by dmvquizzer.event_log one event at a time and reports,
+per question id: the p-value (share answered correctly), the point-biserial
+correlation between getting the question right and the learner's score on
+the rest of the session, and how often each option was picked. With the bank
+loaded, questions that look too easy, too hard, non-discriminating or
+mis-keyed are flagged.
+
+A session's rest scores are only known once it ends, so sessions are held
+open while they are active and folded into the per-question statistics after
+SESSION_TIMEOUT seconds without an answer (by log time). Memory is bounded by
+the number of concurrently active sessions and the number of questions, not
+by the length of the log. Only a session's first answer to a question counts.
+"""
+
+import argparse
+import json
+import math
+import sys
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .bank import QuestionBank, load_question_bank
+from .event_log import AnswerEvent, read_events
+
+# Seconds of log time without an answer after which a session is complete
+SESSION_TIMEOUT = 6 * 60 * 60
+
+# Flag thresholds
+TOO_EASY = 0.95
+TOO_HARD = 0.25
+LOW_DISCRIMINATION = 0.1
+MIN_RESPONSES = 30
+
+
+class ItemStatistics:
+    """Single-pass statistics for one question"""
+
+    __slots__ = ('responses', 'correct', 'picks', 'blank',
+                 'paired', 'mean_rest', 'mean_correct', 'rest_m2', 'correct_m2', 'comoment')
+
+    def __init__(self):
+        self.responses = 0
+        self.correct = 0
+        self.picks: List[int] = []
+        self.blank = 0
+        # Welford-style running moments of (rest score, correct) pairs
+        self.paired = 0
+        self.mean_rest = 0.0
+        self.mean_correct = 0.0
+        self.rest_m2 = 0.0
+        self.correct_m2 = 0.0
+        self.comoment = 0.0
+
+    def add_response(self, choice: Optional[int], correct: bool):
+        self.responses += 1
+        self.correct += correct
+        if choice is None:
+            self.blank += 1
+            return
+        if choice >= len(self.picks):
+            self.picks.extend([0] * (choice + 1 - len(self.picks)))
+        self.picks[choice] += 1
+
+    def add_pair(self, rest: float, correct: bool):
+        self.paired += 1
+        y = float(correct)
+        d_rest = rest - self.mean_rest
+        d_correct = y - self.mean_correct
+        self.mean_rest += d_rest / self.paired
+        self.mean_correct += d_correct / self.paired
+        self.rest_m2 += d_rest * (rest - self.mean_rest)
+        self.correct_m2 += d_correct * (y - self.mean_correct)
+        self.comoment += d_rest * (y - self.mean_correct)
+
+    @property
+    def p_value(self) -> Optional[float]:
+        return self.correct / self.responses if self.responses else None
+
+    @property
+    def point_biserial(self) -> Optional[float]:
+        if self.rest_m2 <= 0 or self.correct_m2 <= 0:
+            return None
+        return self.comoment / math.sqrt(self.rest_m2 * self.correct_m2)
+
+
+class ItemAnalyzer:
+    """Folds a time-ordered stream of answer events into ItemStatistics"""
+
+    def __init__(self, session_timeout: float = SESSION_TIMEOUT):
+        self.session_timeout = session_timeout
+        self.items: Dict[int, ItemStatistics] = {}
+        self.events = 0
+        self.sessions = 0
+        # session -> (last event time, {question id: correct}), least recently active first
+        self._open: 'OrderedDict[str, list]' = OrderedDict()
+
+    def feed(self, event: AnswerEvent):
+        self.events += 1
+        self._close_idle(event.ts)
+        session = self._open.get(event.session)
+        if session is None:
+            session = self._open[event.session] = [event.ts, {}]
+        else:
+            self._open.move_to_end(event.session)
+            session[0] = event.ts
+        answers = session[1]
+        if event.question_id in answers:
+            return
+        answers[event.question_id] = event.correct
+        item = self.items.get(event.question_id)
+        if item is None:
+            item = self.items[event.question_id] = ItemStatistics()
+        item.add_response(event.choice, event.correct)
+
+    def feed_all(self, events: Iterable[AnswerEvent]) -> 'ItemAnalyzer':
+        for event in events:
+            self.feed(event)
+        return self
+
+    def _close_idle(self, now: float):
+        while self._open:
+            session, (last, answers) = next(iter(self._open.items()))
+            if now - last < self.session_timeout:
+                return
+            del self._open[session]
+            self._close(answers)
+
+    def _close(self, answers: Dict[int, bool]):
+        self.sessions += 1
+        n = len(answers)
+        if n < 2:
+            return
+        total = sum(answers.values())
+        for question_id, correct in answers.items():
+            self.items[question_id].add_pair((total - correct) / (n - 1), correct)
+
+    def finish(self) -> 'ItemAnalyzer':
+        """Close every session still open, e.g. at the end of the log"""
+        while self._open:
+            self._close(self._open.popitem(last=False)[1][1])
+        return self
+
+    def report(self, bank: Optional[QuestionBank] = None,
+               min_responses: int = MIN_RESPONSES) -> Iterator[Dict]:
+        """One row per question id, in id order"""
+        positions = {question_id: idx for idx, question_id in enumerate(bank.ids)} if bank else {}
+        for question_id in sorted(self.items):
+            item = self.items[question_id]
+            row = {
+                'question_id': question_id,
+                'responses': item.responses,
+                'p_value': _rounded(item.p_value),
+                'point_biserial': _rounded(item.point_biserial),
+                'pick_rates': [_rounded(count / item.responses) for count in item.picks],
+                'blank_rate': _rounded(item.blank / item.responses),
+            }
+            idx = positions.get(question_id)
+            if idx is not None:
+                row['flags'] = _flags(item, bank.correct[idx], min_responses)
+            yield row
+
+
+def _rounded(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 4)
+
+
+def _flags(item: ItemStatistics, key: int, min_responses: int) -> List[str]:
+    if item.responses < min_responses:
+        return ['few-responses']
+    flags = []
+    if item.p_value >= TOO_EASY:
+        flags.append('too-easy')
+    elif item.p_value <= TOO_HARD:
+        flags.append('too-hard')
+    r = item.point_biserial
+    if r is not None and r < LOW_DISCRIMINATION:
+        flags.append('negative-discrimination' if r < 0 else 'low-discrimination')
+    # A distractor outdrawing the key on a question that stronger learners do
+    # no better on usually means the key is wrong
+    picks = item.picks + [0] * max(0, key + 1 - len(item.picks))
+    if max(picks) > picks[key] and (r is None or r < LOW_DISCRIMINATION):
+        flags.append('possibly-mis-keyed')
+    return flags
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Per-question statistics from answer-event logs")
+    parser.add_argument('logs', nargs='+', help="JSON-lines answer logs, oldest first")
+    parser.add_argument('-o', '--output', help="report to write (default: stdout)")
+    parser.add_argument('--bank', help="compiled bank to flag against (default: the embedded bank)")
+    parser.add_argument('--session-timeout', type=float, default=SESSION_TIMEOUT,
+                        help="seconds without an answer that end a session")
+    parser.add_argument('--min-responses', type=int, default=MIN_RESPONSES,
+                        help="do not flag questions with fewer responses than this")
+    args = parser.parse_args(argv)
+
+    analyzer = ItemAnalyzer(args.session_timeout)
+    for path in args.logs:
+        analyzer.feed_all(read_events(path))
+    analyzer.finish()
+
+    bank = load_question_bank(args.bank)
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for row in analyzer.report(bank, args.min_responses):
+            out.write(json.dumps(row) + '\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"{analyzer.events} events, {analyzer.sessions} sessions, {len(analyzer.items)} questions",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
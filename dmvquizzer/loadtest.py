@@ -0,0 +1,352 @@
+"""
+Concurrent-session load generator for a local Streamlit server
+
+Usage:
+    python -m dmvquizzer.loadtest [--sessions 1,10,50,100] [--duration 30]
+                                  [--think 2.0] [-o results.json]
+
+Starts ``streamlit run app.py`` on a free local port (or uses ``--url``) and,
+for every level in ``--sessions``, keeps that many simulated learners
+connected over Streamlit's own websocket protocol for ``--duration`` seconds.
+Each learner opens a session, starts the full test and answers questions,
+pausing an exponentially distributed think time with mean ``--think`` before
+every click; when a test ends it retakes it. A rerun's latency is the time
+from sending the click to the server reporting the script run finished.
+
+For each level the report gives reruns per second, p50/p95/p99 latency,
+errors, the server's CPU use and peak RSS (read from /proc, so Linux only)
+and the load generator's own CPU use, which should stay well below 100% for
+the numbers to mean anything.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import websockets
+except ImportError:  # installed with Streamlit's own server dependencies
+    websockets = None
+
+from .benchmark import APP_PATH, summarize
+
+# Simulated learners per level, and seconds each level is measured
+DEFAULT_SESSIONS = (1, 10, 50, 100)
+DEFAULT_DURATION = 30.0
+# Mean seconds a learner waits before each click
+DEFAULT_THINK = 2.0
+# Seconds a rerun may take before it counts as an error
+RERUN_TIMEOUT = 30.0
+# Seconds between server CPU/RSS samples
+SAMPLE_INTERVAL = 0.5
+# Seconds to wait for a launched server to report healthy
+STARTUP_TIMEOUT = 60.0
+
+# ForwardMsg.script_finished values
+_FINISHED_EARLY_FOR_RERUN = 2
+_FINISHED_FRAGMENT_RUN = 3
+
+
+class AppError(Exception):
+    """Raised when app.py shows an exception or the page lacks an expected widget"""
+
+
+class StreamlitSession:
+    """One browser tab's websocket session, keeping the widgets on its page"""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip('/').replace('http', 'ws', 1) + '/_stcore/stream'
+        self.socket = None
+        # delta path -> (element kind, element proto, fragment id)
+        self.page: Dict[Tuple[int, ...], Tuple[str, object, str]] = {}
+
+    async def connect(self) -> float:
+        self.socket = await websockets.connect(self.url, subprotocols=['streamlit'], max_size=None)
+        return await self.rerun()
+
+    async def close(self):
+        if self.socket is not None:
+            await self.socket.close()
+
+    async def rerun(self, widgets: Sequence = (), fragment_id: str = '') -> float:
+        """Send a rerun and wait for it to finish; return its latency in ms"""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        message = BackMsg()
+        message.rerun_script.query_string = ''
+        message.rerun_script.fragment_id = fragment_id
+        message.rerun_script.widget_states.widgets.extend(widgets)
+        started = time.perf_counter()
+        await self.socket.send(message.SerializeToString())
+
+        elements = {}
+        while True:
+            reply = ForwardMsg()
+            reply.ParseFromString(await asyncio.wait_for(self.socket.recv(), RERUN_TIMEOUT))
+            kind = reply.WhichOneof('type')
+            if kind == 'delta' and reply.delta.WhichOneof('type') == 'new_element':
+                element = reply.delta.new_element
+                element_kind = element.WhichOneof('type')
+                if element_kind == 'exception':
+                    raise AppError(element.exception.message)
+                elements[tuple(reply.metadata.delta_path)] = (element_kind, getattr(element, element_kind),
+                                                              reply.delta.fragment_id)
+            elif kind == 'script_finished':
+                if reply.script_finished == _FINISHED_EARLY_FOR_RERUN:
+                    # st.rerun(): the next run replaces what this one drew
+                    elements = {}
+                    continue
+                if reply.script_finished == _FINISHED_FRAGMENT_RUN and fragment_id:
+                    kept = {path: item for path, item in self.page.items() if item[2] != fragment_id}
+                    kept.update(elements)
+                    elements = kept
+                self.page = elements
+                return 1000 * (time.perf_counter() - started)
+
+    def widget(self, kind: str, prefix: str = ''):
+        """First element of a kind whose label starts with prefix, or None"""
+        for element_kind, proto, fragment_id in self.page.values():
+            if element_kind == kind and proto.label.startswith(prefix):
+                return proto, fragment_id
+        return None
+
+    async def click(self, prefix: str, values: Sequence = ()) -> float:
+        """Click a button, sending any other widget states along with it"""
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        found = self.widget('button', prefix)
+        if found is None:
+            raise AppError(f"no {prefix!r} button on the page")
+        button, fragment_id = found
+        trigger = WidgetState(id=button.id, trigger_value=True)
+        return await self.rerun(list(values) + [trigger], fragment_id)
+
+
+class Learner:
+    """Simulated learner taking full tests over and over"""
+
+    def __init__(self, url: str, think: float, seed: int):
+        self.session = StreamlitSession(url)
+        self.think = think
+        self.rng = random.Random(seed)
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.tests_finished = 0
+
+    async def _pause(self):
+        if self.think > 0:
+            await asyncio.sleep(self.rng.expovariate(1 / self.think))
+
+    async def _step(self):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        session = self.session
+        await self._pause()
+        if session.widget('button', "Submit Answer"):
+            found = session.widget('radio', "Select your answer")
+            if found is None:
+                raise AppError("question without answer options")
+            radio = found[0]
+            choice = WidgetState(id=radio.id, string_value=self.rng.choice(radio.options))
+            self.latencies.append(await session.click("Submit Answer", [choice]))
+        elif session.widget('button', "🔄 Retake Test"):
+            self.tests_finished += 1
+            self.latencies.append(await session.click("🔄 Retake Test"))
+        else:
+            for prefix in ("Continue to Next", "View Final Results", "🚀 Start Full Practice Test"):
+                if session.widget('button', prefix):
+                    self.latencies.append(await session.click(prefix))
+                    return
+            raise AppError("no button to continue with")
+
+    async def run(self, stop_at: float):
+        """Take tests until ``stop_at``, reconnecting after errors"""
+        while time.monotonic() < stop_at:
+            try:
+                self.latencies.append(await self.session.connect())
+                while time.monotonic() < stop_at:
+                    await self._step()
+            except (AppError, asyncio.TimeoutError, OSError, websockets.exceptions.WebSocketException):
+                self.errors += 1
+            finally:
+                await self.session.close()
+
+
+class ProcessMonitor:
+    """Samples a process's CPU time and RSS from /proc"""
+
+    def __init__(self, pid: Optional[int]):
+        self.pid = pid
+        self.peak_rss = 0
+
+    def cpu_seconds(self) -> Optional[float]:
+        if self.pid is None:
+            return None
+        with open(f'/proc/{self.pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        # utime and stime, fields 14 and 15 of stat
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+    def rss(self) -> Optional[int]:
+        if self.pid is None:
+            return None
+        with open(f'/proc/{self.pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+        return None
+
+    async def sample(self, stop: asyncio.Event):
+        while not stop.is_set():
+            rss = self.rss()
+            if rss is not None:
+                self.peak_rss = max(self.peak_rss, rss)
+            try:
+                await asyncio.wait_for(stop.wait(), SAMPLE_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def run_level(url: str, sessions: int, duration: float, think: float,
+                    monitor: ProcessMonitor, seed: int = 0) -> Dict:
+    """Hold ``sessions`` learners for ``duration`` seconds and summarize"""
+    monitor.peak_rss = 0
+    stop = asyncio.Event()
+    sampler = asyncio.ensure_future(monitor.sample(stop))
+    learners = [Learner(url, think, seed * 100003 + i) for i in range(sessions)]
+
+    server_cpu = monitor.cpu_seconds()
+    client_cpu = time.process_time()
+    started = time.monotonic()
+    await asyncio.gather(*(learner.run(started + duration) for learner in learners))
+    elapsed = time.monotonic() - started
+    client_cpu = time.process_time() - client_cpu
+    if server_cpu is not None:
+        server_cpu = monitor.cpu_seconds() - server_cpu
+    stop.set()
+    await sampler
+
+    latencies = [ms for learner in learners for ms in learner.latencies]
+    result = {
+        'sessions': sessions,
+        'seconds': round(elapsed, 3),
+        'throughput': round(len(latencies) / elapsed, 3),
+        'latency': summarize(latencies),
+        'errors': sum(learner.errors for learner in learners),
+        'tests_finished': sum(learner.tests_finished for learner in learners),
+        'client_cpu_percent': round(100 * client_cpu / elapsed, 1),
+    }
+    if server_cpu is not None:
+        result['server_cpu_percent'] = round(100 * server_cpu / elapsed, 1)
+        result['server_peak_rss_bytes'] = monitor.peak_rss
+    return result
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def launch_server(port: int, workdir: str) -> subprocess.Popen:
+    """Start ``streamlit run app.py`` and wait until it reports healthy"""
+    env = dict(os.environ,
+               DMV_EVENT_LOG=os.path.join(workdir, 'answer_events.jsonl'),
+               DMV_PROGRESS_DB=os.path.join(workdir, 'progress.sqlite3'))
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', APP_PATH,
+         '--server.headless', 'true', '--server.address', '127.0.0.1', '--server.port', str(port),
+         '--server.enableXsrfProtection', 'false', '--server.fileWatcherType', 'none',
+         '--browser.gatherUsageStats', 'false'],
+        env=env, stdout=subprocess.DEVNULL, stderr=open(os.path.join(workdir, 'server.log'), 'w'),
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"streamlit exited with status {server.returncode}; see {workdir}/server.log")
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=1) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            pass
+        time.sleep(0.25)
+    server.terminate()
+    raise RuntimeError(f"streamlit did not become healthy within {STARTUP_TIMEOUT:.0f} s")
+
+
+def _print_table(results: Dict):
+    print(f"{'sessions':>8} {'reruns/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7} "
+          f"{'srv CPU%':>9} {'srv RSS MiB':>12} {'gen CPU%':>9}")
+    for level in results['levels']:
+        latency = level['latency']
+        rss = level.get('server_peak_rss_bytes')
+        print(f"{level['sessions']:8d} {level['throughput']:9.1f} {latency.get('p50_ms', 0):9.1f} "
+              f"{latency.get('p95_ms', 0):9.1f} {latency.get('p99_ms', 0):9.1f} {level['errors']:7d} "
+              f"{level.get('server_cpu_percent', float('nan')):9.1f} "
+              f"{rss / 2 ** 20 if rss else float('nan'):12.1f} {level['client_cpu_percent']:9.1f}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test app.py with concurrent websocket sessions")
+    parser.add_argument('--sessions', default=','.join(map(str, DEFAULT_SESSIONS)),
+                        help="comma-separated concurrent learner counts to run in turn (default: %(default)s)")
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION,
+                        help="seconds to hold each level (default: %(default)s)")
+    parser.add_argument('--think', type=float, default=DEFAULT_THINK,
+                        help="mean seconds a learner waits before each click; 0 clicks "
+                             "as fast as the server answers (default: %(default)s)")
+    parser.add_argument('--url', help="test an already running server instead of launching one")
+    parser.add_argument('--server-pid', type=int, help="process to sample CPU and RSS from with --url")
+    parser.add_argument('--seed', type=int, default=0, help="seed for think times and answers")
+    parser.add_argument('-o', '--output', help="write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    if websockets is None:
+        print("error: the websockets package is required", file=sys.stderr)
+        return 1
+    try:
+        levels = [int(level) for level in args.sessions.split(',') if level.strip()]
+    except ValueError:
+        parser.error(f"invalid --sessions {args.sessions!r}")
+
+    with tempfile.TemporaryDirectory(prefix='dmvquizzer-loadtest-') as workdir:
+        server = None
+        url, pid = args.url, args.server_pid
+        if url is None:
+            port = _free_port()
+            server = launch_server(port, workdir)
+            url, pid = f'http://127.0.0.1:{port}', server.pid
+        monitor = ProcessMonitor(pid if sys.platform.startswith('linux') else None)
+        try:
+            results = {'url': url, 'duration': args.duration, 'think': args.think, 'levels': []}
+            for sessions in levels:
+                print(f"{sessions} concurrent sessions for {args.duration:.0f} s...", file=sys.stderr)
+                results['levels'].append(asyncio.run(
+                    run_level(url, sessions, args.duration, args.think, monitor, args.seed)
+                ))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+    _print_table(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"wrote {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
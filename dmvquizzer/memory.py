@@ -0,0 +1,149 @@
+"""
+Per-session memory accounting by size walking
+
+``retained_size`` adds up ``sys.getsizeof`` over every object reachable from
+a root through ``gc.get_referents``, counting each object once and skipping
+objects reachable from the shared roots (the question bank and other
+per-process caches) as well as code: classes, modules and functions. What is
+left is what one learner's session keeps alive on its own.
+
+A session is broken down by session-state key. Keys that differ only by
+numbers, such as the ``question_{idx}`` radio keys, are grouped as
+``question_*``. An object reachable from several keys of a session is counted
+under the first key in alphabetical order. ``(streamlit)`` is the rest of the
+session's SessionState: widget metadata, key mappings and values kept from
+the previous run.
+
+tracemalloc would need to be on from process start and attributes
+allocations to source lines rather than sessions, so it is not used here.
+"""
+
+import gc
+import re
+import sys
+import types
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Objects that belong to the program rather than to any one session
+_CODE_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+               types.MethodType, types.CodeType, types.FrameType)
+
+_NUMBERED = re.compile(r'_\d.*$')
+
+
+def key_group(key: str) -> str:
+    """Group name for a session-state key, e.g. ``question_12`` -> ``question_*``"""
+    return _NUMBERED.sub('_*', key)
+
+
+def retained_size(root: object, seen: Set[int], shared: Optional[Set[int]] = None) -> int:
+    """Bytes reachable from root and not yet in ``seen`` or ``shared``
+
+    Every object counted is added to ``seen``, so walking several roots with
+    the same set counts objects they share only once.
+    """
+    size = 0
+    stack = [root]
+    while stack:
+        obj = stack.pop()
+        obj_id = id(obj)
+        if obj_id in seen or (shared is not None and obj_id in shared) or isinstance(obj, _CODE_TYPES):
+            continue
+        seen.add(obj_id)
+        size += sys.getsizeof(obj)
+        stack.extend(gc.get_referents(obj))
+    return size
+
+
+class SessionMemory(NamedTuple):
+    """Memory retained by one session"""
+    session: str
+    total: int
+    # key group -> (number of keys, bytes)
+    groups: Dict[str, Tuple[int, int]]
+
+
+def measure_session(session: str, state: object, shared: Set[int]) -> SessionMemory:
+    """Measure one Streamlit SessionState, key by key"""
+    seen: Set[int] = set()
+    groups: Dict[str, Tuple[int, int]] = {}
+    for key, value in sorted(state.filtered_state.items()):
+        group = key_group(key)
+        count, size = groups.get(group, (0, 0))
+        groups[group] = (count + 1, size + retained_size(value, seen, shared))
+    keyed = sum(size for _, size in groups.values())
+    rest = retained_size(state, seen, shared)
+    groups['(streamlit)'] = (0, rest)
+    return SessionMemory(session, keyed + rest, groups)
+
+
+def live_sessions() -> List[Tuple[str, object]]:
+    """``(session id, SessionState)`` of every session this process holds
+
+    Uses the Streamlit runtime's session manager, which is not public API;
+    without a runtime (e.g. under AppTest) only the current session is found.
+    """
+    try:
+        from streamlit.runtime import Runtime
+        if Runtime.exists():
+            manager = getattr(Runtime.instance(), '_session_mgr', None)
+            if manager is not None:
+                return [(info.session.id, info.session.session_state) for info in manager.list_sessions()]
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return []
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return []
+    return [(ctx.session_id, getattr(ctx.session_state, '_state', ctx.session_state))]
+
+
+class MemoryReport(NamedTuple):
+    """Per-session measurements and totals across them"""
+    shared: int
+    sessions: List[SessionMemory]
+    # Bytes of all sessions together, counting objects they share once
+    unique_total: int
+    # Sessions whose state changed while being walked, and were left out
+    skipped: int
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        """Per key group: sessions using it, keys, total, mean and max bytes"""
+        totals: Dict[str, Dict[str, float]] = {}
+        for session in self.sessions:
+            for group, (count, size) in session.groups.items():
+                row = totals.setdefault(group, {'sessions': 0, 'keys': 0, 'bytes': 0, 'max': 0})
+                row['sessions'] += 1
+                row['keys'] += count
+                row['bytes'] += size
+                row['max'] = max(row['max'], size)
+        for row in totals.values():
+            row['mean'] = row['bytes'] / row['sessions']
+        return totals
+
+
+def memory_report(shared_roots: Iterable[object],
+                  sessions: Optional[List[Tuple[str, object]]] = None) -> MemoryReport:
+    """Measure every live session against the given shared roots
+
+    Walks every object of every session while holding the GIL, so it pauses
+    other sessions for the duration; meant for an admin page, not a hot path.
+    """
+    if sessions is None:
+        sessions = live_sessions()
+    shared = set()
+    shared_size = sum(retained_size(root, shared) for root in shared_roots)
+
+    measured = []
+    skipped = 0
+    everything: Set[int] = set()
+    unique_total = 0
+    for session, state in sessions:
+        try:
+            measured.append(measure_session(session, state, shared))
+            unique_total += retained_size(state, everything, shared)
+        except RuntimeError:
+            # A dict changed size under us because the session is running
+            skipped += 1
+    measured.sort(key=lambda session: -session.total)
+    return MemoryReport(shared_size, measured, unique_total, skipped)
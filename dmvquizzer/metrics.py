@@ -0,0 +1,323 @@
+"""
+Opt-in timing of script runs, for finding where a slow rerun spends its time
+
+app.py splits every script run into consecutive phases (setup, session
+restore, header, sidebar, main content, footer) that add up to the whole run,
+times hot spots such as scoring and category stats inside them, and counts
+reruns per session. Each phase feeds a histogram
+with fixed buckets that keeps both all-time totals and a rolling window of
+the last WINDOW_SECONDS, so percentiles reflect current load rather than the
+whole life of the process.
+
+The numbers are shown on an admin page in the app and rendered in the
+Prometheus text format by ``Metrics.render_text``; ``serve_metrics`` serves
+that text on a local port for scraping.
+
+When instrumentation is off app.py uses DISABLED, whose methods do nothing:
+``phase`` returns a shared no-op context manager and ``timed`` returns the
+function unchanged, so the cost is one method call per phase.
+"""
+
+import bisect
+import contextlib
+import functools
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Histogram bucket upper bounds in seconds, plus an implicit +Inf bucket
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Rolling window: WINDOW_SLOTS slots of SLOT_SECONDS each
+SLOT_SECONDS = 10
+WINDOW_SLOTS = 30
+WINDOW_SECONDS = SLOT_SECONDS * WINDOW_SLOTS
+# Sessions whose rerun counts are kept before the least recently seen are dropped
+MAX_SESSIONS = 10000
+# Bucket upper bounds for the reruns-per-session distribution
+RERUN_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class RollingHistogram:
+    """Bucketed latency histogram with all-time totals and a rolling window
+
+    Not thread-safe on its own; Metrics serializes access.
+    """
+
+    __slots__ = ('counts', 'total', 'count', '_slot_ids', '_slot_counts', '_slot_totals')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self._slot_ids = [-1] * WINDOW_SLOTS
+        self._slot_counts = [[0] * (len(BUCKETS) + 1) for _ in range(WINDOW_SLOTS)]
+        self._slot_totals = [0.0] * WINDOW_SLOTS
+
+    def observe(self, seconds: float, now: float):
+        bucket = bisect.bisect_left(BUCKETS, seconds)
+        self.counts[bucket] += 1
+        self.total += seconds
+        self.count += 1
+
+        slot_id = int(now // SLOT_SECONDS)
+        slot = slot_id % WINDOW_SLOTS
+        if self._slot_ids[slot] != slot_id:
+            # The slot last held data from a previous lap of the ring
+            self._slot_ids[slot] = slot_id
+            self._slot_counts[slot] = [0] * (len(BUCKETS) + 1)
+            self._slot_totals[slot] = 0.0
+        self._slot_counts[slot][bucket] += 1
+        self._slot_totals[slot] += seconds
+
+    def window(self, now: float) -> Tuple[List[int], float]:
+        """Bucket counts and total seconds over the last WINDOW_SECONDS"""
+        oldest = int(now // SLOT_SECONDS) - WINDOW_SLOTS
+        counts = [0] * (len(BUCKETS) + 1)
+        total = 0.0
+        for slot_id, slot_counts, slot_total in zip(self._slot_ids, self._slot_counts, self._slot_totals):
+            if slot_id > oldest:
+                counts = [a + b for a, b in zip(counts, slot_counts)]
+                total += slot_total
+        return counts, total
+
+
+def quantile(counts: Sequence[int], q: float) -> Optional[float]:
+    """Estimate a quantile from bucket counts, interpolating within the bucket"""
+    observed = sum(counts)
+    if not observed:
+        return None
+    rank = q * observed
+    seen = 0
+    for bucket, count in enumerate(counts):
+        if count and seen + count >= rank:
+            if bucket == len(BUCKETS):
+                # Beyond the last bound nothing better than the bound is known
+                return BUCKETS[-1]
+            lower = BUCKETS[bucket - 1] if bucket else 0.0
+            return lower + (BUCKETS[bucket] - lower) * (rank - seen) / count
+        seen += count
+    return BUCKETS[-1]
+
+
+class _RunTimer:
+    """Times one script run; ``lap`` closes the phase since the previous lap"""
+
+    __slots__ = ('metrics', 'started', 'last')
+
+    def __init__(self, metrics: 'Metrics'):
+        self.metrics = metrics
+        self.started = self.last = time.perf_counter()
+
+    def lap(self, name: str):
+        now = time.perf_counter()
+        self.metrics.observe(name, now - self.last)
+        self.last = now
+
+    def finish(self):
+        """Record the whole run; runs cut short by st.rerun never get here"""
+        self.metrics.observe('script', time.perf_counter() - self.started, completed=True)
+
+
+class Metrics:
+    """Process-wide phase histograms and rerun counters"""
+
+    enabled = True
+
+    def __init__(self):
+        self.started = time.time()
+        self.runs_started = 0
+        self.runs_completed = 0
+        self._histograms: Dict[str, RollingHistogram] = {}
+        self._session_reruns: 'OrderedDict[str, int]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float, completed: bool = False):
+        """Add one timing of a phase"""
+        now = time.time()
+        with self._lock:
+            if completed:
+                self.runs_completed += 1
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = RollingHistogram()
+            histogram.observe(seconds, now)
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Time a block; the timing is kept even if st.rerun() leaves it early"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def timed(self, name: str) -> Callable:
+        """Decorator timing every call of a function as a phase"""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.phase(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def start_run(self) -> _RunTimer:
+        """Start timing a script run from the top of app.py"""
+        with self._lock:
+            self.runs_started += 1
+        return _RunTimer(self)
+
+    def count_rerun(self, session_id: str):
+        """Count a full script run for a session"""
+        with self._lock:
+            self._session_reruns[session_id] = self._session_reruns.get(session_id, 0) + 1
+            self._session_reruns.move_to_end(session_id)
+            while len(self._session_reruns) > MAX_SESSIONS:
+                self._session_reruns.popitem(last=False)
+
+    def phases(self) -> List[Dict]:
+        """Per-phase totals and rolling-window percentiles in seconds"""
+        now = time.time()
+        rows = []
+        with self._lock:
+            histograms = {name: (h.count, h.total, h.window(now)) for name, h in self._histograms.items()}
+        for name, (count, total, (window_counts, window_total)) in sorted(histograms.items()):
+            window_count = sum(window_counts)
+            row = {
+                'phase': name,
+                'count': count,
+                'mean': total / count if count else None,
+                'window_count': window_count,
+                'window_mean': window_total / window_count if window_count else None,
+            }
+            for q in QUANTILES:
+                row[f'p{int(q * 100)}'] = quantile(window_counts, q)
+            rows.append(row)
+        return rows
+
+    def session_reruns(self) -> List[Tuple[str, int]]:
+        """``(session id, full reruns)`` of tracked sessions, most reruns first"""
+        with self._lock:
+            return sorted(self._session_reruns.items(), key=lambda item: -item[1])
+
+    def render_text(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        now = time.time()
+        with self._lock:
+            histograms = [(name, list(h.counts), h.total, h.count, h.window(now)[0])
+                          for name, h in sorted(self._histograms.items())]
+            reruns = list(self._session_reruns.values())
+
+        lines = [
+            '# HELP dmvquizzer_phase_seconds Time spent in named phases of script runs',
+            '# TYPE dmvquizzer_phase_seconds histogram',
+        ]
+        for name, counts, total, count, _ in histograms:
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'dmvquizzer_phase_seconds_bucket{{phase="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'dmvquizzer_phase_seconds_sum{{phase="{name}"}} {total!r}')
+            lines.append(f'dmvquizzer_phase_seconds_count{{phase="{name}"}} {count}')
+
+        lines += [
+            f'# HELP dmvquizzer_phase_window_seconds Phase time quantiles over the last {WINDOW_SECONDS} s',
+            '# TYPE dmvquizzer_phase_window_seconds gauge',
+        ]
+        for name, _, _, _, window_counts in histograms:
+            for q in QUANTILES:
+                value = quantile(window_counts, q)
+                if value is not None:
+                    lines.append(f'dmvquizzer_phase_window_seconds{{phase="{name}",quantile="{q}"}} {value!r}')
+
+        lines += [
+            '# HELP dmvquizzer_runs_started_total Full script runs started',
+            '# TYPE dmvquizzer_runs_started_total counter',
+            f'dmvquizzer_runs_started_total {self.runs_started}',
+            '# HELP dmvquizzer_runs_completed_total Full script runs that reached the end of app.py',
+            '# TYPE dmvquizzer_runs_completed_total counter',
+            f'dmvquizzer_runs_completed_total {self.runs_completed}',
+            '# HELP dmvquizzer_sessions Sessions with a tracked rerun count',
+            '# TYPE dmvquizzer_sessions gauge',
+            f'dmvquizzer_sessions {len(reruns)}',
+            '# HELP dmvquizzer_session_reruns Full reruns per tracked session',
+            '# TYPE dmvquizzer_session_reruns histogram',
+        ]
+        for bound in RERUN_BUCKETS:
+            lines.append(f'dmvquizzer_session_reruns_bucket{{le="{bound}"}} {sum(1 for n in reruns if n <= bound)}')
+        lines += [
+            f'dmvquizzer_session_reruns_bucket{{le="+Inf"}} {len(reruns)}',
+            f'dmvquizzer_session_reruns_sum {sum(reruns)}',
+            f'dmvquizzer_session_reruns_count {len(reruns)}',
+            '# HELP dmvquizzer_uptime_seconds Seconds since metrics collection started',
+            '# TYPE dmvquizzer_uptime_seconds gauge',
+            f'dmvquizzer_uptime_seconds {now - self.started:.3f}',
+        ]
+        return '\n'.join(lines) + '\n'
+
+
+class _NullRunTimer:
+    __slots__ = ()
+
+    def lap(self, name: str):
+        pass
+
+    def finish(self):
+        pass
+
+
+class _DisabledMetrics:
+    """Stand-in with Metrics' recording methods, all doing nothing"""
+
+    enabled = False
+    _run = _NullRunTimer()
+    _phase = contextlib.nullcontext()
+
+    def observe(self, name: str, seconds: float, completed: bool = False):
+        pass
+
+    def phase(self, name: str):
+        return self._phase
+
+    def timed(self, name: str) -> Callable:
+        return lambda func: func
+
+    def start_run(self) -> _NullRunTimer:
+        return self._run
+
+    def count_rerun(self, session_id: str):
+        pass
+
+
+DISABLED = _DisabledMetrics()
+
+
+def serve_metrics(metrics: Metrics, port: int, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """Serve ``render_text`` at http://host:port/metrics from a daemon thread"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = metrics.render_text().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Scrapes every few seconds would otherwise flood the server log
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='dmvquizzer-metrics', daemon=True).start()
+    return server
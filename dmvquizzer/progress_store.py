@@ -0,0 +1,192 @@
+"""
+Server-side store of in-progress tests, so a learner can resume after a
+refresh, a redeploy or a dropped connection
+
+Progress is saved under a random resume token. ``ProgressStore.save`` only
+replaces the token's pending snapshot in memory; a background thread writes
+all pending snapshots every FLUSH_INTERVAL seconds in one SQLite transaction,
+so a burst of answers becomes a single write per token and the submit path
+never touches disk. The database runs in WAL mode, so resuming (a read) does
+not wait for the writer.
+
+Spaced-repetition schedules are kept the same way under their own review
+token, in a separate table, since a learner's schedule outlives any one test.
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from .scoring import AnswerSheet
+
+# Where app.py keeps progress unless DMV_PROGRESS_DB says otherwise
+DEFAULT_PROGRESS_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                        'progress.sqlite3')
+
+# Seconds between batched writes
+FLUSH_INTERVAL = 0.5
+# Progress untouched for this many seconds is deleted
+RETENTION = 30 * 24 * 60 * 60
+# Review schedules are kept longer, since their intervals grow past a month
+SCHEDULE_RETENTION = 365 * 24 * 60 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress (
+    token TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL,
+    position TEXT NOT NULL,
+    answers BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS progress_updated_at ON progress (updated_at);
+CREATE TABLE IF NOT EXISTS review_schedules (
+    token TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL,
+    seed INTEGER NOT NULL,
+    schedule BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS review_schedules_updated_at ON review_schedules (updated_at);
+"""
+
+
+class Progress(NamedTuple):
+    """Everything needed to put a learner back where they were"""
+    answers: AnswerSheet
+    current_category: int
+    current_question: int
+    selected_section: Optional[str]
+    shuffle_seed: int
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(path)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+    return connection
+
+
+class ProgressStore:
+    """Process-wide progress store with a coalescing background writer"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.flushes = 0
+        self.rows_written = 0
+        with _connect(path) as connection:
+            connection.executescript(_SCHEMA)
+        connection.close()
+        # token -> encoded row, or None to delete the token
+        self._pending: Dict[str, Optional[tuple]] = {}
+        # review token -> (seed, serialized schedule)
+        self._pending_schedules: Dict[str, Tuple[int, bytes]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._writer = threading.Thread(target=self._run, name='dmvquizzer-progress', daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def save(self, token: str, progress: Progress):
+        """Replace the token's pending snapshot; written on the next flush"""
+        row = (
+            json.dumps([progress.current_category, progress.current_question,
+                        progress.selected_section, progress.shuffle_seed]),
+            progress.answers.to_bytes(),
+        )
+        with self._lock:
+            self._pending[token] = row
+
+    def delete(self, token: str):
+        with self._lock:
+            self._pending[token] = None
+
+    def load(self, token: str) -> Optional[Progress]:
+        """Read a token's progress, including a snapshot not yet flushed"""
+        with self._lock:
+            pending = self._pending.get(token, ())
+        if pending is None:
+            return None
+        if pending:
+            position, answers = pending
+        else:
+            connection = _connect(self.path)
+            try:
+                found = connection.execute(
+                    'SELECT position, answers FROM progress WHERE token = ?', (token,)
+                ).fetchone()
+            finally:
+                connection.close()
+            if found is None:
+                return None
+            position, answers = found
+        current_category, current_question, selected_section, shuffle_seed = json.loads(position)
+        return Progress(AnswerSheet.from_bytes(answers), current_category, current_question,
+                        selected_section, shuffle_seed)
+
+    def save_schedule(self, token: str, seed: int, schedule: bytes):
+        """Replace a review token's pending schedule; written on the next flush"""
+        with self._lock:
+            self._pending_schedules[token] = (seed, schedule)
+
+    def load_schedule(self, token: str) -> Optional[Tuple[int, bytes]]:
+        """``(seed, serialized schedule)`` saved under a review token, if any"""
+        with self._lock:
+            pending = self._pending_schedules.get(token)
+        if pending is not None:
+            return pending
+        connection = _connect(self.path)
+        try:
+            found = connection.execute(
+                'SELECT seed, schedule FROM review_schedules WHERE token = ?', (token,)
+            ).fetchone()
+        finally:
+            connection.close()
+        return None if found is None else (found[0], bytes(found[1]))
+
+    def _flush(self, connection: sqlite3.Connection):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            schedules, self._pending_schedules = self._pending_schedules, {}
+        if not pending and not schedules:
+            return
+        now = time.time()
+        with connection:
+            connection.executemany(
+                'INSERT OR REPLACE INTO review_schedules (token, updated_at, seed, schedule) VALUES (?, ?, ?, ?)',
+                [(token, now, seed, schedule) for token, (seed, schedule) in schedules.items()]
+            )
+            connection.executemany(
+                'INSERT OR REPLACE INTO progress (token, updated_at, position, answers) VALUES (?, ?, ?, ?)',
+                [(token, now) + row for token, row in pending.items() if row is not None]
+            )
+            connection.executemany(
+                'DELETE FROM progress WHERE token = ?',
+                [(token,) for token, row in pending.items() if row is None]
+            )
+        self.flushes += 1
+        self.rows_written += len(pending) + len(schedules)
+
+    def _run(self):
+        connection = _connect(self.path)
+        last_prune = 0.0
+        try:
+            while not self._stop.wait(FLUSH_INTERVAL):
+                self._flush(connection)
+                if time.time() - last_prune > 60 * 60:
+                    with connection:
+                        connection.execute('DELETE FROM progress WHERE updated_at < ?',
+                                           (time.time() - RETENTION,))
+                        connection.execute('DELETE FROM review_schedules WHERE updated_at < ?',
+                                           (time.time() - SCHEDULE_RETENTION,))
+                    last_prune = time.time()
+            self._flush(connection)
+        finally:
+            connection.close()
+
+    def close(self):
+        """Write out pending snapshots and stop the writer"""
+        if self._writer.is_alive():
+            self._stop.set()
+            self._writer.join()
@@ -0,0 +1,106 @@
+"""
+Compact answer storage and score bookkeeping for a quiz session
+"""
+
+import struct
+from typing import Iterator, Optional, Tuple
+
+# Stored in AnswerSheet.choices for questions that have not been answered
+UNANSWERED = 0xFF
+
+# Minimum percentage of the whole bank answered correctly to pass
+PASS_PERCENTAGE = 80
+
+# Serialized sheet: question count, then choices and both bitsets
+_SIZE = struct.Struct('<I')
+
+try:
+    _popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def _popcount(value: int) -> int:
+        return bin(value).count('1')
+
+
+class AnswerSheet:
+    """A session's answers as a byte per question plus two bitsets
+
+    ``choices`` holds the chosen option index (or ``UNANSWERED``) for every
+    question in the bank, and bit ``i`` of ``answered``/``correct`` is set once
+    question ``i`` has been answered/answered correctly. Counts for any subset
+    of the bank are a masked popcount, e.g. against ``bank.category_masks``.
+
+    Supports the read-only dict operations the app used on the old
+    ``user_answers`` dict: ``in``, ``[]``, ``get``, ``len`` and ``items``.
+    A question submitted without a choice counts as answered and incorrect,
+    and reads back as ``None``.
+    """
+
+    __slots__ = ('choices', 'answered', 'correct')
+
+    def __init__(self, size: int):
+        self.choices = bytearray([UNANSWERED]) * size
+        self.answered = 0
+        self.correct = 0
+
+    def record(self, idx: int, answer: Optional[int], is_correct: bool):
+        """Store the chosen option for a question"""
+        bit = 1 << idx
+        self.choices[idx] = UNANSWERED if answer is None else answer
+        self.answered |= bit
+        if is_correct:
+            self.correct |= bit
+        else:
+            self.correct &= ~bit
+
+    def to_bytes(self) -> bytes:
+        """Serialize the sheet compactly, e.g. for a progress store"""
+        size = len(self.choices)
+        width = (size + 7) // 8
+        return (_SIZE.pack(size) + bytes(self.choices)
+                + self.answered.to_bytes(width, 'little') + self.correct.to_bytes(width, 'little'))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'AnswerSheet':
+        """Rebuild a sheet serialized with ``to_bytes``"""
+        (size,) = _SIZE.unpack_from(data)
+        width = (size + 7) // 8
+        start = _SIZE.size
+        if len(data) != start + size + 2 * width:
+            raise ValueError("answer sheet data has the wrong length")
+        sheet = cls(0)
+        sheet.choices = bytearray(data[start:start + size])
+        sheet.answered = int.from_bytes(data[start + size:start + size + width], 'little')
+        sheet.correct = int.from_bytes(data[start + size + width:], 'little')
+        return sheet
+
+    def count_answered(self, mask: Optional[int] = None) -> int:
+        """Number of answered questions, optionally restricted to a mask"""
+        return _popcount(self.answered if mask is None else self.answered & mask)
+
+    def count_correct(self, mask: Optional[int] = None) -> int:
+        """Number of correctly answered questions, optionally restricted to a mask"""
+        return _popcount(self.correct if mask is None else self.correct & mask)
+
+    def __contains__(self, idx: int) -> bool:
+        return bool(self.answered >> idx & 1)
+
+    def __getitem__(self, idx: int) -> Optional[int]:
+        if idx not in self:
+            raise KeyError(idx)
+        choice = self.choices[idx]
+        return None if choice == UNANSWERED else choice
+
+    def get(self, idx: int, default: Optional[int] = None) -> Optional[int]:
+        return self[idx] if idx in self else default
+
+    def __len__(self) -> int:
+        return _popcount(self.answered)
+
+    def items(self) -> Iterator[Tuple[int, Optional[int]]]:
+        """Yield ``(question index, chosen option)`` pairs in bank order"""
+        bits = self.answered
+        while bits:
+            low = bits & -bits
+            idx = low.bit_length() - 1
+            yield idx, self[idx]
+            bits ^= low
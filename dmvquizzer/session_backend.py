@@ -0,0 +1,269 @@
+"""
+Quiz state kept in an external key-value store, so any worker process can
+serve any request for a learner without sticky sessions
+
+A backend stores opaque bytes under a key together with a version number
+that goes up by one on every write; version 0 means "no value". Writes are
+compare-and-set on the version, so two workers acting on stale copies of the
+same state cannot silently overwrite each other: the loser gets
+VersionConflict, reloads and merges. SessionStore adds serialization and a
+per-process read-through cache on top, so serving a request normally costs one
+version lookup rather than a full read.
+
+Backends are chosen by URL:
+
+    sqlite:///path/to/sessions.sqlite3
+    redis://localhost:6379/0        (needs the optional ``redis`` package)
+"""
+
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+
+try:
+    import redis
+except ImportError:  # only needed for redis:// backends
+    redis = None
+
+from .scoring import AnswerSheet
+
+# States cached per process before the least recently used are dropped
+CACHE_SIZE = 10000
+# Seconds a session's state is kept after its last write
+SESSION_TTL = 7 * 24 * 60 * 60
+# Seconds between sweeps of expired sessions on backends without native expiry
+PRUNE_INTERVAL = 60 * 60
+
+
+class VersionConflict(Exception):
+    """Raised when a write's expected version is no longer current"""
+
+
+class QuizState(NamedTuple):
+    """The part of a learner's session that has to follow them across workers"""
+    answers: AnswerSheet
+    current_category: int
+    current_question: int
+    selected_section: Optional[str]
+    shuffle_seed: int
+    test_started: bool
+    show_results: bool
+
+    def merge(self, newer: 'QuizState') -> 'QuizState':
+        """Combine with a state written concurrently elsewhere
+
+        Answers are never changed once given, so both sides' answers are
+        kept (``self`` wins on a clash); the position comes from ``self``.
+        """
+        answers = AnswerSheet.from_bytes(newer.answers.to_bytes())
+        for idx, choice in self.answers.items():
+            answers.record(idx, choice, bool(self.answers.correct >> idx & 1))
+        return self._replace(answers=answers)
+
+
+def encode_state(state: QuizState) -> bytes:
+    header = json.dumps([state.current_category, state.current_question, state.selected_section,
+                         state.shuffle_seed, state.test_started, state.show_results])
+    return header.encode('utf-8') + b'\n' + state.answers.to_bytes()
+
+
+def decode_state(data: bytes) -> QuizState:
+    header, answers = data.split(b'\n', 1)
+    return QuizState(AnswerSheet.from_bytes(answers), *json.loads(header))
+
+
+class SessionBackend(ABC):
+    """Versioned key-value storage; subclasses implement the three methods"""
+
+    @abstractmethod
+    def version(self, key: str) -> int:
+        """Current version of a key, 0 if it has no value"""
+
+    @abstractmethod
+    def get(self, key: str) -> Tuple[int, Optional[bytes]]:
+        """Current ``(version, value)`` of a key"""
+
+    @abstractmethod
+    def compare_and_set(self, key: str, expected_version: int, value: bytes) -> int:
+        """Write if the key is still at ``expected_version``; return the new version"""
+
+
+class SQLiteBackend(SessionBackend):
+    """Backend on a shared SQLite database in WAL mode, e.g. for one host
+
+    Rows record when they were last written; a write deletes rows older than
+    SESSION_TTL at most once every PRUNE_INTERVAL seconds per process.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._last_prune = 0.0
+        self._prune_lock = threading.Lock()
+        with self._connection() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS sessions (key TEXT PRIMARY KEY, version INTEGER NOT NULL, '
+                'value BLOB NOT NULL, updated_at REAL NOT NULL DEFAULT 0)'
+            )
+            columns = [row[1] for row in connection.execute('PRAGMA table_info(sessions)')]
+            if 'updated_at' not in columns:
+                # Databases created before expiry; their rows go on the first sweep
+                connection.execute('ALTER TABLE sessions ADD COLUMN updated_at REAL NOT NULL DEFAULT 0')
+            connection.execute('CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at)')
+
+    def _connection(self) -> sqlite3.Connection:
+        # Streamlit runs sessions on several threads; give each its own connection
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def version(self, key: str) -> int:
+        found = self._connection().execute('SELECT version FROM sessions WHERE key = ?', (key,)).fetchone()
+        return found[0] if found else 0
+
+    def get(self, key: str) -> Tuple[int, Optional[bytes]]:
+        found = self._connection().execute('SELECT version, value FROM sessions WHERE key = ?', (key,)).fetchone()
+        return (found[0], found[1]) if found else (0, None)
+
+    def compare_and_set(self, key: str, expected_version: int, value: bytes) -> int:
+        now = time.time()
+        with self._connection() as connection:
+            if expected_version == 0:
+                cursor = connection.execute(
+                    'INSERT OR IGNORE INTO sessions (key, version, value, updated_at) VALUES (?, 1, ?, ?)',
+                    (key, value, now)
+                )
+            else:
+                cursor = connection.execute(
+                    'UPDATE sessions SET version = version + 1, value = ?, updated_at = ? '
+                    'WHERE key = ? AND version = ?',
+                    (value, now, key, expected_version)
+                )
+        if cursor.rowcount != 1:
+            raise VersionConflict(key)
+        self._prune(now)
+        return expected_version + 1
+
+    def _prune(self, now: float):
+        """Delete sessions not written for SESSION_TTL, once per PRUNE_INTERVAL"""
+        with self._prune_lock:
+            if now - self._last_prune < PRUNE_INTERVAL:
+                return
+            self._last_prune = now
+        with self._connection() as connection:
+            connection.execute('DELETE FROM sessions WHERE updated_at < ?', (now - SESSION_TTL,))
+
+
+# Atomic compare-and-set on a hash holding version and value
+_REDIS_CAS = """
+local current = tonumber(redis.call('HGET', KEYS[1], 'version') or '0')
+if current ~= tonumber(ARGV[1]) then return -1 end
+redis.call('HSET', KEYS[1], 'version', current + 1, 'value', ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return current + 1
+"""
+
+
+class RedisBackend(SessionBackend):
+    """Backend on a Redis-protocol server shared by every worker"""
+
+    def __init__(self, url: str, prefix: str = 'dmvquizzer:session:'):
+        if redis is None:
+            raise ImportError("the redis package is required for redis:// session backends")
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._cas = self.client.register_script(_REDIS_CAS)
+
+    def version(self, key: str) -> int:
+        return int(self.client.hget(self.prefix + key, 'version') or 0)
+
+    def get(self, key: str) -> Tuple[int, Optional[bytes]]:
+        version, value = self.client.hmget(self.prefix + key, 'version', 'value')
+        return int(version or 0), value
+
+    def compare_and_set(self, key: str, expected_version: int, value: bytes) -> int:
+        version = self._cas(keys=[self.prefix + key], args=[expected_version, value, SESSION_TTL])
+        if version < 0:
+            raise VersionConflict(key)
+        return version
+
+
+def open_backend(url: str) -> SessionBackend:
+    """Create the backend for a ``sqlite:///…`` or ``redis://…`` URL"""
+    scheme = urlparse(url).scheme
+    if scheme == 'sqlite':
+        return SQLiteBackend(url[len('sqlite:///'):])
+    if scheme in ('redis', 'rediss', 'unix'):
+        return RedisBackend(url)
+    raise ValueError(f"unsupported session backend {url!r}")
+
+
+class SessionStore:
+    """QuizState over a backend, with a read-through cache of decoded states"""
+
+    def __init__(self, backend: SessionBackend, cache_size: int = CACHE_SIZE):
+        self.backend = backend
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self.conflicts = 0
+        self._cache: 'OrderedDict[str, Tuple[int, QuizState]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, key: str, version: int, state: QuizState):
+        with self._lock:
+            self._cache[key] = (version, state)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def load(self, key: str) -> Tuple[int, Optional[QuizState]]:
+        """Current ``(version, state)``; decoded only if another worker changed it
+
+        The returned state is shared with the cache and must not be mutated.
+        """
+        version = self.backend.version(key)
+        if version == 0:
+            return 0, None
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None and cached[0] == version:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        version, data = self.backend.get(key)
+        if data is None:
+            return 0, None
+        state = decode_state(data)
+        self._remember(key, version, state)
+        return version, state
+
+    def save(self, key: str, expected_version: int, state: QuizState) -> Tuple[int, QuizState]:
+        """Write a state; on a conflict merge with the stored one and retry
+
+        Returns the new version and a copy of the state actually stored,
+        which is shared with the cache and must not be mutated.
+        """
+        while True:
+            data = encode_state(state)
+            try:
+                version = self.backend.compare_and_set(key, expected_version, data)
+            except VersionConflict:
+                self.conflicts += 1
+                expected_version, stored = self.load(key)
+                if stored is not None:
+                    state = state.merge(stored)
+                continue
+            # Cache a private copy: the caller keeps mutating its AnswerSheet
+            stored = decode_state(data)
+            self._remember(key, version, stored)
+            return version, stored
@@ -0,0 +1,196 @@
+"""
+SM-2 style spaced-repetition scheduling over the question bank
+
+Each question in scope carries an ease factor, a review interval, a run of
+consecutive correct reviews and a due time, stored in compact arrays. Due
+items sit in a binary heap keyed by due time, so picking the next question and
+rescheduling one after a review both cost O(log n). Rescheduling pushes a new
+heap entry rather than searching for the old one; stale entries are skipped
+when they reach the top.
+
+Intervals run to days, so a schedule has to outlive the browser session:
+``to_bytes``/``from_bytes`` serialize the per-question arrays for the progress
+store, and the heap is rebuilt from the due times on load.
+"""
+
+import heapq
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import List, Optional, Sequence, Tuple
+
+# SM-2 parameters
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+# Answers are only right or wrong, so map them onto SM-2's 0-5 quality scale
+CORRECT_QUALITY = 4
+LAPSE_QUALITY = 1
+
+# Seconds until a question comes back after the first, second and failed review
+FIRST_INTERVAL = 24 * 60 * 60
+SECOND_INTERVAL = 6 * 24 * 60 * 60
+LAPSE_DELAY = 60
+
+# Serialized schedule: question count and reviews, then the per-question arrays
+_HEADER = struct.Struct('<II')
+_ARRAYS = ('ease', 'interval', 'repetitions', 'due')
+
+
+class SpacedRepetitionScheduler:
+    """Review queue for a set of bank questions
+
+    ``indices`` must be the bank indices in scope in ascending order, e.g.
+    ``bank.category_index[name]`` or ``range(len(bank))``; it is referenced,
+    not copied. ``new_order`` gives the order in which never-seen questions
+    are introduced. ``reviews`` counts reviews over the schedule's whole life,
+    ``session_reviews`` and ``session_correct`` only those since it was created
+    or loaded.
+    """
+
+    __slots__ = ('indices', 'ease', 'interval', 'repetitions', 'due', 'reviews',
+                 'session_reviews', 'session_correct', '_entry', '_heap', '_counter')
+
+    done_message = "🎉 You're all caught up for now!"
+
+    def __init__(self, indices: Sequence[int], new_order: Sequence[int], now: float):
+        size = len(indices)
+        self.indices = indices
+        self.ease = array('f', [DEFAULT_EASE]) * size
+        self.interval = array('f', [0.0]) * size
+        self.repetitions = array('H', [0]) * size
+        self.due = array('d', [now]) * size
+        self.reviews = 0
+        self.session_reviews = 0
+        self.session_correct = 0
+        self._build_heap(new_order)
+
+    def _build_heap(self, new_order: Sequence[int]):
+        """Queue every question at its due time, ties in ``new_order``"""
+        # Counter value of each question's live heap entry
+        self._entry = array('I', [0]) * len(self.indices)
+        self._heap: List[Tuple[float, int, int]] = []
+        for rank, q_idx in enumerate(new_order):
+            pos = self._position(q_idx)
+            self._entry[pos] = rank
+            self._heap.append((self.due[pos], rank, pos))
+        heapq.heapify(self._heap)
+        self._counter = len(self._heap)
+
+    def to_bytes(self) -> bytes:
+        """Serialize the schedule, e.g. for a progress store"""
+        parts = [_HEADER.pack(len(self.indices), self.reviews)]
+        for name in _ARRAYS:
+            values = getattr(self, name)
+            if sys.byteorder != 'little':
+                values = array(values.typecode, values)
+                values.byteswap()
+            parts.append(values.tobytes())
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, indices: Sequence[int], new_order: Sequence[int]) -> 'SpacedRepetitionScheduler':
+        """Rebuild a schedule serialized with ``to_bytes`` over the same ``indices``"""
+        size, reviews = _HEADER.unpack_from(data)
+        if size != len(indices):
+            raise ValueError("schedule was saved for a different set of questions")
+        scheduler = cls.__new__(cls)
+        scheduler.indices = indices
+        scheduler.reviews = reviews
+        scheduler.session_reviews = 0
+        scheduler.session_correct = 0
+        start = _HEADER.size
+        for name, typecode in zip(_ARRAYS, 'ffHd'):
+            values = array(typecode)
+            end = start + values.itemsize * size
+            if end > len(data):
+                raise ValueError("schedule data is too short")
+            values.frombytes(data[start:end])
+            if sys.byteorder != 'little':
+                values.byteswap()
+            setattr(scheduler, name, values)
+            start = end
+        if start != len(data):
+            raise ValueError("schedule data has the wrong length")
+        scheduler._build_heap(new_order)
+        return scheduler
+
+    def _position(self, q_idx: int) -> int:
+        pos = bisect_left(self.indices, q_idx)
+        if pos == len(self.indices) or self.indices[pos] != q_idx:
+            raise KeyError(q_idx)
+        return pos
+
+    def _top(self) -> Optional[Tuple[float, int, int]]:
+        """Drop stale heap entries and return the live entry due first"""
+        heap = self._heap
+        while heap:
+            due, counter, pos = heap[0]
+            if self._entry[pos] == counter:
+                return heap[0]
+            heapq.heappop(heap)
+        return None
+
+    def next_question(self, now: float) -> Optional[int]:
+        """Bank index of the question due first, or None if nothing is due yet"""
+        top = self._top()
+        if top is None or top[0] > now:
+            return None
+        return self.indices[top[2]]
+
+    def next_due_time(self) -> Optional[float]:
+        """When the next question comes due, or None if the scope is empty"""
+        top = self._top()
+        return None if top is None else top[0]
+
+    def record(self, q_idx: int, correct: bool, now: float):
+        """Apply an SM-2 update for a review and reschedule the question"""
+        pos = self._position(q_idx)
+        quality = CORRECT_QUALITY if correct else LAPSE_QUALITY
+        if correct:
+            self.repetitions[pos] += 1
+            if self.repetitions[pos] == 1:
+                interval = FIRST_INTERVAL
+            elif self.repetitions[pos] == 2:
+                interval = SECOND_INTERVAL
+            else:
+                interval = self.interval[pos] * self.ease[pos]
+        else:
+            self.repetitions[pos] = 0
+            interval = LAPSE_DELAY
+        penalty = 5 - quality
+        self.ease[pos] = max(MIN_EASE, self.ease[pos] + 0.1 - penalty * (0.08 + penalty * 0.02))
+        self.interval[pos] = interval
+        self.due[pos] = now + interval
+        self.reviews += 1
+        self.session_reviews += 1
+        self.session_correct += correct
+
+        counter = self._counter
+        self._counter += 1
+        self._entry[pos] = counter
+        heapq.heappush(self._heap, (self.due[pos], counter, pos))
+        # Every review leaves one stale entry behind; rebuild once they dominate
+        if len(self._heap) > 2 * len(self.indices) + 64:
+            self._heap = [entry for entry in self._heap if self._entry[entry[2]] == entry[1]]
+            heapq.heapify(self._heap)
+
+    def learned(self) -> int:
+        """Questions whose last review was correct"""
+        return len(self.repetitions) - self.repetitions.count(0)
+
+    def status(self, now: float) -> str:
+        """One-line summary for the sidebar"""
+        due = self.next_due_time()
+        if due is None or due <= now:
+            return f"{self.reviews} reviews done"
+        return f"{self.reviews} reviews done, next due in {format_delay(due - now)}"
+
+
+def format_delay(seconds: float) -> str:
+    """Human-readable wait, e.g. ``5 min``, ``3 h`` or ``6 days``"""
+    if seconds < 60 * 60:
+        return f"{max(1, round(seconds / 60))} min"
+    if seconds < 24 * 60 * 60:
+        return f"{round(seconds / 3600)} h"
+    return f"{round(seconds / 86400)} days"